@@ -1,6 +1,6 @@
 # app/api/v1/routers.py
 from fastapi import APIRouter
-from api.v1.endpoints import user, audio, transcription, auth
+from api.v1.endpoints import user, audio, transcription, auth, live, uploads, playback, metrics
 
 # Create main v1 router
 api_router = APIRouter()
@@ -18,14 +18,38 @@ api_router.include_router(
     tags=["audio"]
 )
 
+api_router.include_router(
+    playback.router,
+    prefix="/playback",
+    tags=["playback"]
+)
+
+api_router.include_router(
+    uploads.router,
+    prefix="/uploads",
+    tags=["uploads"]
+)
+
 api_router.include_router(
     transcription.router,
     prefix="/transcriptions",  # Note: plural form
     tags=["transcriptions"]
 )
 
+api_router.include_router(
+    live.router,
+    prefix="/live",
+    tags=["live"]
+)
+
 api_router.include_router(
     auth.router,
     prefix="/auth",
     tags=["auth"]
-)
\ No newline at end of file
+)
+
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["metrics"]
+)
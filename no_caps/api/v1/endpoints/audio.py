@@ -1,12 +1,18 @@
 # app/api/endpoints/audio.py
 # Defines routes for uploading audio, fetching transcriptions, and playback
 
-from fastapi import APIRouter, UploadFile, Depends
+from typing import Optional
+from fastapi import APIRouter, UploadFile, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.session import get_db
+from starlette.concurrency import run_in_threadpool
+from db.session import get_async_db, get_db
 from services import audio_service
-from core.auth import get_current_user
+from core.auth import get_current_user, get_current_user_sync
+from db.crud.audio import get_audio_or_404_async
+from services import peaks
 from db.models import User
+from db.schemas import AudioPage
 
 router = APIRouter()
 
@@ -15,11 +21,60 @@ router = APIRouter()
 async def upload_audio(
     file: UploadFile,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_sync)
 ):
     return await audio_service.process_audio_upload(file, db, current_user)
 
 
-@router.get("/{user_id}/")
-async def get_audio(user_id: int, db: Session = Depends(get_db)):
-    return await audio_service.get_audio_files(user_id=user_id, db=db)
+@router.get("/{user_id}/", response_model=AudioPage)
+async def get_audio(
+    user_id: int,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """A page of the user's library, newest first.
+
+    Pass next_cursor back as ?cursor= for the following page; it is null
+    on the last one. Users can only list their own library.
+    """
+    if user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return await audio_service.get_audio_files(
+        user_id=user_id, db=db, limit=limit, cursor=cursor
+    )
+
+
+@router.get("/{audio_id}/peaks")
+async def get_audio_peaks(
+    audio_id: int,
+    level: Optional[int] = Query(None, ge=0),
+    width: Optional[int] = Query(None, gt=0),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Waveform peaks as raw int8 (min, max) pairs for one zoom level.
+
+    Pick the level by index (0 is finest) or by ?width=<pixels>, which
+    returns the coarsest level with at least one peak per pixel. Scale and
+    resolution come back in X-Peaks-* headers.
+    """
+    audio = await get_audio_or_404_async(db, audio_id, current_user.id)
+    # Normally precomputed after upload; computed here if that has not run
+    path = await run_in_threadpool(peaks.ensure_peaks, audio.id, audio.file_path)
+    levels = await run_in_threadpool(peaks.read_peak_levels, path)
+    chosen = peaks.pick_level(levels, level=level, width=width)
+    data = await run_in_threadpool(peaks.read_peaks, path, chosen)
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={
+            "x-peaks-level": str(levels.index(chosen)),
+            "x-peaks-levels": str(len(levels)),
+            "x-peaks-samples-per-peak": str(chosen.samples_per_peak),
+            "x-peaks-sample-rate": str(peaks.SAMPLE_RATE),
+            "x-peaks-length": str(chosen.length),
+            "cache-control": "private, max-age=86400",
+        },
+    )
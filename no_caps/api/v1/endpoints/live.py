@@ -0,0 +1,163 @@
+# app/api/v1/endpoints/live.py
+# Live microphone transcription over WebSocket
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket
+from fastapi import WebSocketDisconnect, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from core.auth import authenticate_token
+from core.config import settings
+from core.logging import logger
+from db.crud import audio as audio_crud
+from db.crud.transcription import TranscriptionCRUD
+from db.session import SessionLocal, get_db
+from services.live_transcription import (
+    SUPPORTED_FORMATS,
+    LiveTranscriptionSession,
+    make_decoder,
+)
+from utils.file_handling import StoredUpload
+
+router = APIRouter()
+
+# One inference thread per live session would oversubscribe the CPU;
+# sessions share a small pool instead
+live_executor = ThreadPoolExecutor(
+    max_workers=settings.LIVE_MAX_CONCURRENT_DECODES,
+    thread_name_prefix="live-decode",
+)
+
+
+@router.websocket("/ws")
+async def live_transcription(
+    websocket: WebSocket,
+    token: str = Query(...),
+    audio_format: str = Query("pcm16", alias="format"),
+    filename: str = Query("live-recording.wav"),
+    language: str = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Stream audio in, get partial and final segments back.
+
+    Protocol:
+    - Connect with ?token=<JWT>&format=pcm16|opus
+    - Send binary frames: 16 kHz mono s16le for pcm16, an Ogg/Opus stream
+      for opus
+    - Receive {"type": "partial"} and {"type": "final"} messages
+    - Send the text frame "stop" (or close) to end; the server replies with
+      {"type": "saved", "audio_id": ..., "transcription_id": ...}
+    """
+    try:
+        user = await run_in_threadpool(authenticate_token, token, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        # Hand the connection back now rather than when the recording
+        # ends; saving it opens a session of its own
+        db.close()
+    if audio_format not in SUPPORTED_FORMATS:
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
+
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    session = LiveTranscriptionSession(language=language)
+    decoder = make_decoder(audio_format)
+    decode_task = None
+    client_gone = False
+
+    async def run_step():
+        nonlocal client_gone
+        finals, partial = await loop.run_in_executor(live_executor, session.step)
+        if client_gone:
+            return
+        # The session keeps the finals either way; a client that dropped
+        # mid-step only misses the echo, and the recording is still saved
+        try:
+            for segment in finals:
+                await websocket.send_json({"type": "final", "segment": segment})
+            if partial:
+                await websocket.send_json({"type": "partial", **partial})
+        except (WebSocketDisconnect, RuntimeError):
+            client_gone = True
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                client_gone = True
+                break
+            if message.get("text") == "stop":
+                break
+            if message.get("bytes"):
+                session.feed(await decoder.decode(message["bytes"]))
+                # At most one decode in flight; new audio waits for the next
+                if (
+                    (decode_task is None or decode_task.done())
+                    and session.undecoded_seconds >= settings.LIVE_STEP_SECONDS
+                ):
+                    decode_task = asyncio.create_task(run_step())
+    except WebSocketDisconnect:
+        client_gone = True
+
+    try:
+        session.feed(await decoder.close())
+        if decode_task:
+            await decode_task
+        finals, stored = await loop.run_in_executor(live_executor, session.finish)
+    except Exception as e:
+        logger.error(f"Live session for user {user.id} failed: {str(e)}")
+        session.discard()
+        if not client_gone:
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+
+    audio_id, transcription_id = await run_in_threadpool(
+        _save_recording, user.id, filename, language, stored,
+        session.duration, session.final_segments,
+    )
+
+    if not client_gone:
+        for segment in finals:
+            await websocket.send_json({"type": "final", "segment": segment})
+        await websocket.send_json({
+            "type": "saved",
+            "audio_id": audio_id,
+            "transcription_id": transcription_id,
+        })
+        await websocket.close()
+
+
+def _save_recording(
+    user_id: int,
+    filename: str,
+    language: str,
+    stored: StoredUpload,
+    duration: float,
+    segments: list,
+) -> tuple:
+    """Persist a finished session as an ordinary Audio + Transcription pair."""
+    db = SessionLocal()
+    try:
+        audio = audio_crud.create_audio(
+            db,
+            filename=filename,
+            file_path=stored.file_path,
+            duration=duration,
+            user_id=user_id,
+            content_hash=stored.content_hash,
+        )
+        transcription = TranscriptionCRUD.create_transcription(
+            db, audio_id=audio.id, language=language or "en")
+        TranscriptionCRUD.update_transcription_content(
+            db,
+            transcription.id,
+            content=segments,
+            word_count=sum(len(s["text"].split()) for s in segments),
+            duration=duration,
+        )
+        return audio.id, transcription.id
+    finally:
+        db.close()
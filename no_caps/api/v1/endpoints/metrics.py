@@ -0,0 +1,20 @@
+# app/api/v1/endpoints/metrics.py
+from typing import Dict
+from fastapi import APIRouter, Depends
+from core.auth import get_current_user
+from db.models import User
+from db.session import pool_status
+
+router = APIRouter()
+
+
+@router.get("/db")
+async def get_db_pool_metrics(
+    current_user: User = Depends(get_current_user),
+) -> Dict:
+    """Connection pool occupancy and checkout waits for this process.
+
+    A growing avg/max wait with in_use at size + overflow means requests
+    are queueing for connections: raise DB_POOL_SIZE or find the holder.
+    """
+    return pool_status()
@@ -1 +1,151 @@
-#TODO
\ No newline at end of file
+# app/api/v1/endpoints/playback.py
+# Authenticated audio playback with Range support for scrubbing
+
+import os
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from core.auth import get_current_user_or_query_token
+from core.config import settings
+from db.crud.audio import get_audio_or_404_async
+from db.crud.transcription import TranscriptionCRUD
+from db.models.transcription import TranscriptionStatus
+from db.models import User
+from db.session import get_async_db
+from services.renditions import (
+    PLAYLIST_NAME,
+    SEGMENT_NAME,
+    VERSION_NAME,
+    ensure_rendition,
+    rendition_dir_for,
+)
+from utils.file_handling import UPLOAD_DIR
+from utils.range_response import RangeFileResponse, etag_matches, parse_range
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".m4a": "audio/mp4",
+    ".flac": "audio/flac",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+}
+
+
+@router.api_route("/{audio_id}", methods=["GET", "HEAD"])
+async def play_audio(
+    audio_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_or_query_token),
+):
+    """Stream an audio file, honouring Range, If-Range and If-None-Match.
+
+    Blobs are content-addressed and never change, so the content hash
+    is a strong ETag and a matching If-None-Match is answered with 304.
+    """
+    audio = await get_audio_or_404_async(db, audio_id, current_user.id)
+    path = Path(audio.file_path).resolve()
+    if UPLOAD_DIR.resolve() not in path.parents:
+        raise HTTPException(status_code=404, detail="Audio file not available")
+    try:
+        stat = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio file not available")
+
+    validator = audio.content_hash or f"{stat.st_size:x}-{int(stat.st_mtime):x}"
+    etag = f'"{validator}"'
+    headers = {
+        "etag": etag,
+        "cache-control": "private, max-age=86400",
+        "content-disposition": f"inline; filename*=utf-8''{quote(audio.filename or path.name)}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if settings.PLAYBACK_ACCEL_REDIRECT_PREFIX:
+        # nginx serves the file itself (sendfile, Range and all)
+        relative = path.relative_to(UPLOAD_DIR.resolve())
+        headers["x-accel-redirect"] = settings.PLAYBACK_ACCEL_REDIRECT_PREFIX + quote(str(relative))
+        return Response(headers=headers, media_type=MEDIA_TYPES.get(path.suffix))
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == etag:
+        byte_range = parse_range(request.headers.get("range"), stat.st_size)
+
+    return RangeFileResponse(
+        str(path),
+        file_size=stat.st_size,
+        byte_range=byte_range,
+        media_type=MEDIA_TYPES.get(path.suffix, "application/octet-stream"),
+        headers=headers,
+        chunk_size=settings.PLAYBACK_CHUNK_SIZE,
+    )
+
+
+@router.get("/{audio_id}/hls/index.m3u8")
+async def get_hls_playlist(
+    audio_id: int,
+    access_token: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_or_query_token),
+):
+    """HLS playlist for the recording, building the rendition on first use.
+
+    Segments are cut on speaker changes when a finished transcript exists.
+    A token passed as ?access_token= is carried over to the segment URLs.
+    """
+    audio = await get_audio_or_404_async(db, audio_id, current_user.id)
+    transcription = await TranscriptionCRUD.get_transcription_by_audio_id_async(db, audio.id)
+    segments = None
+    if transcription and transcription.status == TranscriptionStatus.COMPLETED:
+        segments = transcription.content
+    rendition = await run_in_threadpool(
+        ensure_rendition, audio.id, audio.file_path, segments
+    )
+    playlist = await run_in_threadpool((rendition / PLAYLIST_NAME).read_text)
+    if access_token:
+        suffix = f"?access_token={quote(access_token)}"
+        playlist = "\n".join(
+            line + suffix if line and not line.startswith("#") else line
+            for line in playlist.splitlines()
+        ) + "\n"
+    return Response(
+        content=playlist,
+        media_type="application/vnd.apple.mpegurl",
+        headers={"cache-control": "private, no-cache"},
+    )
+
+
+@router.get("/{audio_id}/hls/{version}/{segment_name}")
+async def get_hls_segment(
+    audio_id: int,
+    version: str,
+    segment_name: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_or_query_token),
+):
+    if not (VERSION_NAME.fullmatch(version) and SEGMENT_NAME.fullmatch(segment_name)):
+        raise HTTPException(status_code=404, detail="Segment not found")
+    audio = await get_audio_or_404_async(db, audio_id, current_user.id)
+    path = rendition_dir_for(audio.file_path) / version / segment_name
+    try:
+        stat = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Segment not found")
+    return RangeFileResponse(
+        str(path),
+        file_size=stat.st_size,
+        byte_range=parse_range(request.headers.get("range"), stat.st_size),
+        media_type="video/mp2t",
+        headers={"cache-control": "private, max-age=3600"},
+        chunk_size=settings.PLAYBACK_CHUNK_SIZE,
+    )
+
@@ -1,26 +1,45 @@
 # app/api/v1/endpoints/transcription.py
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict, Any
-from db.session import get_db
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Any, List, Optional
+from core.config import settings
+from db.session import get_async_db, get_db
 from services.transcription_service import TranscriptionService
 from db.models.transcription import TranscriptionStatus
 from db.crud.transcription import TranscriptionCRUD
-from db.crud.audio import get_audio_or_404
+from db.crud.audio import get_audio_or_404, get_audio_or_404_async
 from db.models.user import User
-from db.schemas import TranscriptionResponse
-from core.auth import get_current_user
+from db.crud.transcript_segment import (
+    list_transcript_segments_async,
+    segment_dicts,
+)
+from db.schemas import TranscriptionResponse, TranscriptSegmentPage
+from core.auth import get_current_user, get_current_user_or_query_token, get_current_user_sync
+from utils.pagination import decode_cursor, encode_cursor
+from services.clip_cache import CLIP_FORMATS, CLIP_MEDIA_TYPES, clip_cache
+from services.event_bus import TERMINAL_STATUSES, event_bus
+from utils.range_response import RangeFileResponse, etag_matches, parse_range
+from workers.tasks import process_transcription_task
 
 router = APIRouter()
 transcription_service = TranscriptionService()
 
+# Segments of a running job returned by a status poll; the rest are paged
+# from /segments with segments_next_cursor
+STATUS_SEGMENTS_LIMIT = 100
+
 
 @router.post("/transcribe/{audio_id}", response_model=TranscriptionResponse)
 async def create_transcription(
     audio_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    current_user: User = Depends(get_current_user_sync),
 ) -> Any:
     """Create a transcription job for the given audio file.
 
@@ -46,37 +65,40 @@ async def create_transcription(
             language="en"
         )
 
-    # Add to background tasks
-    background_tasks.add_task(
-        transcription_service.process_transcription,
-        db,
-        transcription.id,
-        audio.file_path
-    )
+    # Identical audio was already transcribed: reuse it instead of rerunning
+    if transcription_service.reuse_completed_transcription(
+            db, transcription, audio):
+        return TranscriptionResponse.model_validate(transcription)
+
+    # Hand off to the worker pool; the worker opens its own DB session
+    process_transcription_task.delay(transcription.id, audio.file_path)
 
     # Return the response model
     return TranscriptionResponse.model_validate(transcription)
 
 
-@router.get("/transcription/{transcription_id}")
-async def get_transcription_status(
-    transcription_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> Dict:
-    """Get transcription status and results."""
-    transcription = TranscriptionCRUD.get_transcription(db, transcription_id)
-    if not transcription:
+async def _get_accessible_transcription(
+    db: AsyncSession, transcription_id: int, user_id: int
+):
+    """Load a transcription, raising 404/403 if missing or not the user's.
+
+    content is deferred; load_content_async fetches it where it is needed.
+    """
+    found = await TranscriptionCRUD.get_transcription_status_async(
+        db, transcription_id)
+    if not found:
         raise HTTPException(status_code=404, detail="Transcription not found")
+    transcription, owner_id = found
+    if owner_id != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return transcription
 
-    # Check user has access to this transcription
-    if not transcription_service.has_access_to_transcription(
-            db=db,
-            transcription=transcription,
-            user_id=current_user.id):
 
-        raise HTTPException(status_code=403, detail="Not authorized")
+def _status_response(transcription, segments: Optional[List] = None) -> Dict:
+    """Status payload shared by the polling and streaming endpoints.
 
+    segments are the rows a running job has flushed so far.
+    """
     response = {
         "id": transcription.id,
         "status": transcription.status,
@@ -91,6 +113,13 @@ async def get_transcription_status(
             "confidence_score": transcription.confidence_score,
             "completed_at": transcription.completed_at
         })
+    # Include segments finished so far while the job is running
+    elif transcription.status == TranscriptionStatus.IN_PROGRESS:
+        response.update({
+            "progress": transcription.progress,
+            "processed_seconds": transcription.processed_seconds,
+            "segments": segment_dicts(segments or []),
+        })
     # Include error if failed
     elif transcription.status == TranscriptionStatus.FAILED:
         response["error"] = transcription.error_message
@@ -98,12 +127,225 @@ async def get_transcription_status(
     return response
 
 
+@router.get("/transcription/{transcription_id}")
+async def get_transcription_status(
+    transcription_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+) -> Dict:
+    """Get transcription status and results.
+
+    Clients poll this: one query answers both whether the transcription
+    exists and whose it is, and the transcript itself is only read once
+    there is something in it to return.
+    """
+    found = await TranscriptionCRUD.get_transcription_status_async(
+        db, transcription_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Transcription not found")
+    transcription, owner_id = found
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    segments = None
+    next_cursor = None
+    if transcription.status == TranscriptionStatus.COMPLETED:
+        await TranscriptionCRUD.load_content_async(db, transcription)
+    elif transcription.status == TranscriptionStatus.IN_PROGRESS:
+        # Polls are frequent: return the first page, the rest via /segments
+        segments = await list_transcript_segments_async(
+            db, transcription_id, limit=STATUS_SEGMENTS_LIMIT + 1)
+        if len(segments) > STATUS_SEGMENTS_LIMIT:
+            segments = segments[:STATUS_SEGMENTS_LIMIT]
+            next_cursor = encode_cursor(segments[-1].position)
+    response = _status_response(transcription, segments)
+    if transcription.status == TranscriptionStatus.IN_PROGRESS:
+        response["segments_next_cursor"] = next_cursor
+    return response
+
+
+@router.get(
+    "/transcription/{transcription_id}/segments",
+    response_model=TranscriptSegmentPage,
+)
+async def get_transcription_segments(
+    transcription_id: int,
+    start: Optional[float] = Query(None, ge=0),
+    end: Optional[float] = Query(None, gt=0),
+    speaker: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """A page of a transcript's segments, in order.
+
+    While the job runs these are the segments it has flushed so far.
+
+    ?start=&end= (seconds) keeps segments overlapping that range and
+    ?speaker= one speaker's turns; pass next_cursor back as ?cursor= for
+    the following page. Segments read from an index, never from the
+    transcript document.
+    """
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    found = await TranscriptionCRUD.get_transcription_status_async(
+        db, transcription_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Transcription not found")
+    _, owner_id = found
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    after = decode_cursor(cursor, int)
+    # One extra row tells whether another page follows
+    segments = await list_transcript_segments_async(
+        db,
+        transcription_id,
+        limit=limit + 1,
+        start=start,
+        end=end,
+        speaker=speaker,
+        after_position=after[0] if after else None,
+    )
+    next_cursor = None
+    if len(segments) > limit:
+        segments = segments[:limit]
+        next_cursor = encode_cursor(segments[-1].position)
+    return {"items": segments, "next_cursor": next_cursor}
+
+
+def _sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+@router.get("/transcription/{transcription_id}/events")
+async def stream_transcription_events(
+    transcription_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """Server-Sent Events stream of status changes and finished segments.
+
+    The first event is a snapshot of the current state; after that only
+    changes are pushed, and the stream ends once the job completes or fails.
+    """
+    transcription = await _get_accessible_transcription(
+        db, transcription_id, current_user.id)
+
+    # Subscribe before taking the snapshot so nothing falls in between
+    queue = event_bus.subscribe(transcription_id)
+    segments = None
+    if transcription.status == TranscriptionStatus.COMPLETED:
+        await TranscriptionCRUD.load_content_async(db, transcription)
+    elif transcription.status == TranscriptionStatus.IN_PROGRESS:
+        segments = await list_transcript_segments_async(
+            db, transcription_id, limit=None)
+    snapshot = _status_response(transcription, segments)
+    snapshot_seconds = transcription.processed_seconds or 0
+    await db.close()
+
+    async def events():
+        try:
+            yield _sse("status", snapshot)
+            if transcription.status.value in TERMINAL_STATUSES:
+                return
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+
+                data = message["data"]
+                # Segments already included in the snapshot
+                if (message["event"] == "segments"
+                        and data["processed_seconds"] <= snapshot_seconds):
+                    continue
+                yield _sse(message["event"], data)
+                if (message["event"] == "status"
+                        and data["status"] in TERMINAL_STATUSES):
+                    return
+        finally:
+            event_bus.unsubscribe(transcription_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/transcription/{transcription_id}/clip")
+async def get_transcription_clip(
+    transcription_id: int,
+    request: Request,
+    segment: Optional[int] = Query(None, ge=0),
+    start: Optional[float] = Query(None, ge=0),
+    end: Optional[float] = Query(None, gt=0),
+    audio_format: str = Query("mp3", alias="format"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_or_query_token),
+):
+    """Play one speaker turn (?segment=<index>) or any ?start=&end= range.
+
+    Clips are cut from the decoded audio and encoded once; repeat plays
+    are served from the clip cache.
+    """
+    transcription = await _get_accessible_transcription(
+        db, transcription_id, current_user.id)
+    if audio_format not in CLIP_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported clip format. Supported: {sorted(CLIP_FORMATS)}",
+        )
+
+    if segment is not None:
+        await TranscriptionCRUD.load_content_async(db, transcription)
+        segments = transcription.content or []
+        if segment >= len(segments):
+            raise HTTPException(status_code=404, detail="Segment not found")
+        start = segments[segment]["start_time"]
+        end = segments[segment]["end_time"]
+    elif start is None or end is None:
+        raise HTTPException(
+            status_code=400, detail="Pass either segment or both start and end")
+    if end <= start or end - start > settings.CLIP_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Clip must be between 0 and {settings.CLIP_MAX_SECONDS} seconds long",
+        )
+
+    audio = await get_audio_or_404_async(db, transcription.audio_id, current_user.id)
+    try:
+        path = await run_in_threadpool(clip_cache.get, audio, start, end, audio_format)
+    except ValueError as e:
+        raise HTTPException(status_code=416, detail=str(e))
+
+    size = path.stat().st_size
+    etag = f'"{path.stem}"'
+    headers = {"etag": etag, "cache-control": "private, max-age=86400"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return RangeFileResponse(
+        str(path),
+        file_size=size,
+        byte_range=parse_range(request.headers.get("range"), size),
+        media_type=CLIP_MEDIA_TYPES[audio_format],
+        headers=headers,
+    )
+
+
 @router.put("/transcription/{transcription_id}")
 async def update_transcription(
     transcription_id: int,
     transcription_update: Dict,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_sync)
 ) -> Dict:
     """Update a transcription."""
 
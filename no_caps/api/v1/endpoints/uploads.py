@@ -0,0 +1,81 @@
+# app/api/v1/endpoints/uploads.py
+# Resumable uploads: create a session, PUT chunks at offsets, finalize
+
+from fastapi import APIRouter, Depends, Header, Request, Response, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from db.session import get_db
+from db.crud.upload_session import get_upload_session_or_404
+from db.models import User
+from db.schemas import AudioResponse, UploadSessionCreate, UploadSessionResponse
+from services import upload_service
+from core.auth import get_current_user_sync
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_upload(
+    upload_in: UploadSessionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_sync),
+):
+    return await upload_service.create_upload(
+        db, upload_in.filename, upload_in.size, current_user
+    )
+
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+def get_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_sync),
+):
+    """Where to resume: received_bytes is the next offset to send."""
+    return get_upload_session_or_404(db, upload_id, current_user.id)
+
+
+@router.put("/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_sync),
+):
+    """Append the raw request body at Upload-Offset."""
+    upload = await run_in_threadpool(
+        get_upload_session_or_404, db, upload_id, current_user.id
+    )
+    return await upload_service.write_chunk(
+        db, upload, upload_offset, request.stream()
+    )
+
+
+@router.post("/{upload_id}/finalize", response_model=AudioResponse)
+async def finalize_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_sync),
+):
+    upload = await run_in_threadpool(
+        get_upload_session_or_404, db, upload_id, current_user.id
+    )
+    return await upload_service.finalize_upload(db, upload, current_user)
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_sync),
+):
+    upload = await run_in_threadpool(
+        get_upload_session_or_404, db, upload_id, current_user.id
+    )
+    await upload_service.abort_upload(db, upload)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,10 +1,12 @@
 # app/api/v1/endpoints/user.py
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.session import get_db
+from db.session import get_async_db, get_db
 from db.crud import user as user_crud
 from db.schemas import UserCreate, UserResponse, UserUpdate, UserList
-from db.models.user import User  # Import SQLAlchemy model instead of Pydantic model
+from utils.pagination import decode_cursor, encode_cursor
 
 router = APIRouter()
 
@@ -18,19 +20,22 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=UserList)
-def list_users(
-    skip: int = Query(0, ge=0),
+async def list_users(
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    users = db.query(User).offset(skip).limit(limit).all()  # Use SQLAlchemy User model
-    total = db.query(User).count()
-    return {"items": users, "total": total}
+    after = decode_cursor(cursor, int)
+    users = await user_crud.list_users_async(
+        db, limit=limit + 1, after_id=after[0] if after else None
+    )
+    next_cursor = encode_cursor(users[limit - 1].id) if len(users) > limit else None
+    return {"items": users[:limit], "next_cursor": next_cursor}
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = user_crud.get_user(db, user_id=user_id)
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    user = await user_crud.get_user_async(db, user_id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -0,0 +1,90 @@
+# benchmarks/bench_alignment.py
+"""
+Micro-benchmark for merging diarization turns with Whisper output.
+
+Builds a synthetic 3-hour meeting and times the sweep-line merge against
+the previous nested-loop implementation.
+
+Usage (from no_caps/):
+    python -m benchmarks.bench_alignment
+"""
+import random
+import time
+
+from utils.alignment import merge_speaker_turns, timed_items
+
+DURATION_SECONDS = 3 * 60 * 60
+
+
+def synthetic_meeting(duration: float, seed: int = 0):
+    """Random speaker turns plus Whisper-like segments with word stamps."""
+    rng = random.Random(seed)
+
+    turns, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(1.0, 8.0)
+        turns.append((t, min(t + length, duration), f"SPEAKER_{rng.randint(0, 3):02d}"))
+        t += length + rng.uniform(0.0, 0.5)
+
+    segments, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(2.0, 6.0)
+        words, w = [], t
+        while w < t + length:
+            word_len = rng.uniform(0.15, 0.5)
+            words.append({"start": w, "end": w + word_len, "word": " word"})
+            w += word_len
+        segments.append({
+            "start": t,
+            "end": w,
+            "text": " " + " ".join("word" for _ in words),
+            "words": words,
+        })
+        t = w
+    return turns, {"segments": segments}
+
+
+def nested_loop_merge(turns, transcription_result):
+    """The original O(turns x segments) implementation, for comparison."""
+    speaker_segments = []
+    for start_time, end_time, speaker in turns:
+        segment_text = ""
+        for item in transcription_result["segments"]:
+            if item["start"] <= end_time and item["end"] >= start_time:
+                segment_text += item["text"] + " "
+        speaker_segments.append({
+            "speaker": speaker,
+            "start_time": start_time,
+            "end_time": end_time,
+            "text": segment_text.strip(),
+        })
+    return speaker_segments
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1000:10.1f} ms")
+    return elapsed
+
+
+def main():
+    turns, result = synthetic_meeting(DURATION_SECONDS)
+    segments = [
+        {k: v for k, v in seg.items() if k != "words"} for seg in result["segments"]
+    ]
+    words = timed_items(result)
+    print(
+        f"{DURATION_SECONDS / 3600:.0f}h synthetic meeting: {len(turns)} turns, "
+        f"{len(segments)} segments, {len(words)} words"
+    )
+
+    baseline = timed("nested loop (segments)", nested_loop_merge, turns, result)
+    sweep = timed("sweep-line (segments)", merge_speaker_turns, turns, segments)
+    timed("sweep-line (words)", merge_speaker_turns, turns, words)
+    print(f"speedup on segments: {baseline / sweep:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_peaks.py
+"""
+Waveform peaks for a 2-hour recording: build time, stored size, and the
+time to serve one zoom level (what GET /audio/{id}/peaks does).
+
+Usage (from no_caps/):
+    python -m benchmarks.bench_peaks
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from services.pcm_cache import SAMPLE_RATE
+from services.peaks import (
+    BASE_SAMPLES_PER_PEAK,
+    compute_peaks,
+    pick_level,
+    read_peak_levels,
+    read_peaks,
+    write_peaks,
+)
+
+DURATION_SECONDS = 2 * 60 * 60
+SERVE_RUNS = 20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Memory-mapped, like the PCM cache the peaks stage reads from
+        pcm_path = Path(tmp) / "signal.f32"
+        rng = np.random.default_rng(0)
+        pcm = np.lib.format.open_memmap(
+            pcm_path, mode="w+", dtype=np.float32,
+            shape=(DURATION_SECONDS * SAMPLE_RATE,),
+        )
+        for start in range(0, len(pcm), 60 * SAMPLE_RATE):
+            block = pcm[start:start + 60 * SAMPLE_RATE]
+            block[:] = rng.uniform(-0.5, 0.5, len(block))
+
+        start = time.perf_counter()
+        levels = compute_peaks(pcm)
+        path = Path(tmp) / "signal.peaks"
+        write_peaks(path, levels, BASE_SAMPLES_PER_PEAK)
+        build = time.perf_counter() - start
+        print(
+            f"{DURATION_SECONDS / 3600:.0f}h at {SAMPLE_RATE} Hz: built "
+            f"{len(levels)} levels in {build:.2f}s, "
+            f"{path.stat().st_size / 1024:.0f} KiB on disk"
+        )
+
+        for width in (1000, 4000, None):
+            best = float("inf")
+            for _ in range(SERVE_RUNS):
+                t0 = time.perf_counter()
+                stored = read_peak_levels(path)
+                level = pick_level(stored, width=width)
+                data = read_peaks(path, level)
+                best = min(best, time.perf_counter() - t0)
+            label = f"width={width}" if width else "finest level"
+            print(
+                f"serve {label:<14} {len(data) / 1024:8.0f} KiB "
+                f"{best * 1000:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/bench_transcode.py
+"""
+Storage and decode cost of transcode-on-ingest.
+
+Encodes one recording in the formats uploads typically arrive in, then
+transcodes each to every canonical ingest format and reports the size on
+disk and the time to decode to model-ready 16 kHz mono float32 (what
+PCMCache does before every first transcription of an upload), for the
+upload as received and for its canonical form. Speedup above 1x means
+the canonical form decodes faster.
+
+Needs ffmpeg with libmp3lame and libopus on PATH.
+
+Usage (from no_caps/):
+    python -m benchmarks.bench_transcode [recording] [--seconds N]
+
+Without a recording, a synthetic speech-like signal is used; real speech
+gives a more honest size ratio for the lossy formats.
+"""
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from services.ingest_service import (
+    CANONICAL_FORMATS,
+    canonical_extension,
+    transcode_command,
+)
+from services.pcm_cache import SAMPLE_RATE
+
+SOURCE_FORMATS = {
+    "wav 44.1k stereo": (".wav", ["-ar", "44100", "-ac", "2", "-c:a", "pcm_s16le"]),
+    "mp3 320k": (".mp3", ["-ar", "44100", "-ac", "2", "-c:a", "libmp3lame", "-b:a", "320k"]),
+    "mp3 128k": (".mp3", ["-ar", "44100", "-ac", "2", "-c:a", "libmp3lame", "-b:a", "128k"]),
+    "flac": (".flac", ["-ar", "44100", "-ac", "2", "-c:a", "flac"]),
+}
+DECODE_RUNS = 3
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """Voiced bursts with a wandering pitch, separated by short pauses."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = (np.sin(2 * np.pi * 1.7 * t) > -0.3).astype(np.float32)
+    noise = rng.normal(0, 0.02, len(t))
+    return (0.3 * voiced * envelope + noise).astype(np.float32)
+
+
+def ffmpeg(*args: str) -> None:
+    subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def decode_seconds(path: Path, out_dir: Path) -> float:
+    """Best-of-N wall time for the PCMCache decode of one file."""
+    best = float("inf")
+    for _ in range(DECODE_RUNS):
+        start = time.perf_counter()
+        ffmpeg(
+            "-threads", "0", "-i", str(path),
+            "-f", "f32le", "-acodec", "pcm_f32le",
+            "-ac", "1", "-ar", str(SAMPLE_RATE), str(out_dir / "decoded.f32"),
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recording", nargs="?")
+    parser.add_argument("--seconds", type=float, default=600)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        if args.recording:
+            source = Path(args.recording)
+        else:
+            source = tmp_dir / "source.f32"
+            synthetic_speech(args.seconds).tofile(source)
+        source_args = (
+            ["-i", str(source)] if args.recording
+            else ["-f", "f32le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", str(source)]
+        )
+
+        print(
+            f"{'format':<20} {'canonical':<10} {'stored':>8} {'canon':>8} "
+            f"{'saved':>6} {'decode':>8} {'canon dec':>9} {'speedup':>8}"
+        )
+        for label, (extension, codec_args) in SOURCE_FORMATS.items():
+            original = tmp_dir / f"original{extension}"
+            ffmpeg(*source_args, *codec_args, str(original))
+            original_size = original.stat().st_size
+            original_decode = decode_seconds(original, tmp_dir)
+            for codec in CANONICAL_FORMATS:
+                canonical = tmp_dir / f"canonical{canonical_extension(codec)}"
+                subprocess.run(
+                    transcode_command(str(original), str(canonical), codec),
+                    check=True,
+                    capture_output=True,
+                )
+                canonical_size = canonical.stat().st_size
+                canonical_decode = decode_seconds(canonical, tmp_dir)
+                print(
+                    f"{label:<20} {codec:<10} {original_size / 2 ** 20:7.1f}M "
+                    f"{canonical_size / 2 ** 20:7.1f}M "
+                    f"{1 - canonical_size / original_size:6.0%} "
+                    f"{original_decode * 1000:6.0f}ms {canonical_decode * 1000:7.0f}ms "
+                    f"{original_decode / canonical_decode:7.1f}x"
+                )
+
+if __name__ == "__main__":
+    main()
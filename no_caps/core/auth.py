@@ -1,15 +1,16 @@
 # app/core/auth.py
 from datetime import datetime, timedelta
 from typing import Optional, Union
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core.config import settings
-from db.session import get_db
-from db.crud.user import get_user_by_email
+from db.session import get_async_db, get_db
+from db.crud.user import get_user_by_email, get_user_by_email_async
 
 # Token configuration
 ALGORITHM = "HS256"
@@ -17,6 +18,9 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="api/v1/auth/login", auto_error=False
+)
 
 
 class Token(BaseModel):
@@ -62,7 +66,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
 ) -> UserInDB:
     """
     Validate the access token and return the current user.
@@ -77,12 +81,83 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    credentials_exception = HTTPException(
+    return await authenticate_token_async(token, db)
+
+
+async def get_current_user_or_query_token(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserInDB:
+    """
+    Like get_current_user, but also accepts ?access_token=<JWT>.
+
+    For URLs the browser fetches itself (e.g. an <audio> element's src),
+    which cannot carry an Authorization header.
+    """
+    return await authenticate_token_async(_header_or_query_token(token, access_token), db)
+
+
+# Routes that work on a sync Session authenticate on that same session:
+# FastAPI resolves get_db once per request, so they hold one connection
+# rather than one from each engine's pool.
+def get_current_user_sync(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> UserInDB:
+    """get_current_user for routes that depend on get_db."""
+    return authenticate_token(token, db)
+
+
+def get_current_user_or_query_token_sync(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+) -> UserInDB:
+    """get_current_user_or_query_token for routes that depend on get_db."""
+    return authenticate_token(_header_or_query_token(token, access_token), db)
+
+
+def authenticate_token(token: str, db: Session) -> UserInDB:
+    """
+    Resolve a JWT to an active user.
+
+    Used by WebSocket routes, which receive the token as a query parameter,
+    and by the request dependencies of routes that hold a sync session.
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    user = get_user_by_email(db, email=_token_email(token))
+    return _active_user(user)
+
+
+async def authenticate_token_async(token: str, db: AsyncSession) -> UserInDB:
+    """authenticate_token on an async session."""
+    user = await get_user_by_email_async(db, email=_token_email(token))
+    return _active_user(user)
+
+
+def _header_or_query_token(token: Optional[str], access_token: Optional[str]) -> str:
+    token = token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _token_email(token: str) -> str:
+    """The subject (email) of a valid JWT."""
     try:
         # Decode JWT token
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[ALGORITHM])
@@ -90,19 +165,21 @@ async def get_current_user(
         # Extract email from token
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise _credentials_exception()
 
         token_data = TokenData(email=email)
 
     except JWTError:
 
-        raise credentials_exception
+        raise _credentials_exception()
+
+    return token_data.email
+
 
-    # Get user from database
-    user = get_user_by_email(db, email=token_data.email)
+def _active_user(user) -> UserInDB:
     if user is None:
         print("core/auth.py: get_current_user - User not found")
-        raise credentials_exception
+        raise _credentials_exception()
 
     # Check if user is active
     if not user.is_active:
@@ -7,9 +7,151 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
     SQLALCHEMY_DATABASE_URI: str = "postgresql://user:password@db:5432/audio_db"
+    # Request handlers use asyncpg; empty derives it from the URI above
+    ASYNC_SQLALCHEMY_DATABASE_URI: str = ""
+    # Connection pool, per engine and per process. Pre-ping drops
+    # connections the server closed while idle; recycle bounds their age.
+    # An API process has both engines (async routes on one, sync routes
+    # and auth for them on the other, one connection per request either
+    # way), so it may open up to 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW);
+    # budget max_connections for that times the number of processes
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Prepared statements cached per asyncpg connection (0 disables, e.g.
+    # behind pgbouncer in transaction mode)
+    DB_STATEMENT_CACHE_SIZE: int = 100
     JWT_SECRET: str = "your-secret-key"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     WHISPER_MODEL_SIZE: str = "tiny"
+    # Word timestamps let speaker changes inside a segment be attributed
+    WHISPER_WORD_TIMESTAMPS: bool = True
+
+    # Uploads larger than this are rejected while streaming
+    MAX_UPLOAD_BYTES: int = 1024 * 1024 * 1024
+    # Resumable uploads untouched this long are dropped with their partial
+    # files by the periodic cleanup task
+    UPLOAD_SESSION_TTL_HOURS: int = 24
+    # Optionally re-encode uploads to TRANSCODE_SAMPLE_RATE mono, on a
+    # worker after the upload is recorded; the original is deleted once the
+    # transcode is in place unless KEEP_ORIGINAL_UPLOAD is set. "flac" is
+    # lossless and decodes 2-3x faster than compressed uploads (about as
+    # fast as WAV), though it outgrows low-bitrate MP3; "opus" (at
+    # TRANSCODE_BITRATE_KBPS) is about 8x smaller than FLAC but decodes
+    # slower than the upload did (see benchmarks/bench_transcode.py)
+    TRANSCODE_ON_INGEST: bool = False
+    TRANSCODE_CODEC: str = "flac"
+    TRANSCODE_BITRATE_KBPS: int = 24
+    TRANSCODE_SAMPLE_RATE: int = 16000
+    KEEP_ORIGINAL_UPLOAD: bool = False
+
+    # Behind nginx, set to an internal location aliasing UPLOAD_DIR (e.g.
+    # "/protected-uploads/") to hand playback bodies to nginx's sendfile
+    PLAYBACK_ACCEL_REDIRECT_PREFIX: str = ""
+    PLAYBACK_CHUNK_SIZE: int = 256 * 1024
+
+    # Models are loaded lazily from local artifacts, never pulled at runtime:
+    #   {MODEL_ARTIFACT_DIR}/whisper/{size}.pt
+    #   {MODEL_ARTIFACT_DIR}/pyannote/config.yaml
+    MODEL_ARTIFACT_DIR: str = "/no_caps/models"
+    MODEL_MEMORY_BUDGET_MB: int = 4096
+    MODEL_WARMUP_ON_START: bool = True
+    # Diarization and transcription run concurrently, each on its own
+    # executor with its own torch intra-op thread count
+    DIARIZATION_TORCH_THREADS: int = 2
+    TRANSCRIPTION_TORCH_THREADS: int = 2
+
+    # How often a running job writes finished segments and progress
+    PROGRESS_FLUSH_INTERVAL_SECONDS: float = 2.0
+
+    # Transcription events for SSE clients. Workers append to per-job logs
+    # under EVENTS_DIR, the local stand-in for a cross-process broker
+    EVENTS_DIR: str = "/no_caps/.events"
+    EVENTS_POLL_INTERVAL_SECONDS: float = 0.25
+    # A finished job's log is deleted by the cleanup task after this long
+    EVENTS_LOG_TTL_SECONDS: float = 3600.0
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+
+    # Live transcription over WebSocket: the uncommitted tail is re-decoded
+    # every LIVE_STEP_SECONDS; segments older than the lag are committed
+    LIVE_WHISPER_MODEL_SIZE: str = "tiny"
+    LIVE_WINDOW_SECONDS: float = 15.0
+    LIVE_STEP_SECONDS: float = 0.5
+    LIVE_FINALIZE_LAG_SECONDS: float = 2.0
+    LIVE_MAX_CONCURRENT_DECODES: int = 2
+
+    # Recordings at least this long are split at silences and transcribed
+    # as overlapping chunks, one task each on LONG_AUDIO_QUEUE. The worker
+    # consuming that queue runs as many chunks at once as its --concurrency,
+    # each process holding its own WHISPER_MODEL_SIZE model (e.g. "small"
+    # is ~1 GB a copy), so size its concurrency to the host's memory. It
+    # must share PCM_CACHE_DIR and LONG_AUDIO_RESULTS_DIR with the workers
+    LONG_AUDIO_THRESHOLD_SECONDS: float = 600.0
+    LONG_AUDIO_CHUNK_SECONDS: float = 120.0
+    LONG_AUDIO_CHUNK_OVERLAP_SECONDS: float = 2.0
+    LONG_AUDIO_SILENCE_SEARCH_SECONDS: float = 10.0
+    LONG_AUDIO_QUEUE: str = "long-audio"
+    LONG_AUDIO_RESULTS_DIR: str = "/no_caps/cache/chunks"
+    # A job fails if no further chunk finishes for this long
+    LONG_AUDIO_CHUNK_TIMEOUT_SECONDS: float = 1800.0
+    LONG_AUDIO_TORCH_THREADS: int = 1
+
+    # Shorter recordings at least this long are transcribed chunk by chunk
+    # in the job's own process, so segments show up while it runs; below
+    # it, one Whisper call finishes soon enough
+    PARTIAL_RESULTS_THRESHOLD_SECONDS: float = 120.0
+
+    # Short clips from concurrent jobs share batched Whisper forward passes.
+    # Only effective when a worker runs several jobs at once (celery -P threads)
+    WHISPER_BATCHING_ENABLED: bool = False
+    WHISPER_BATCH_SIZE: int = 8
+    WHISPER_BATCH_MAX_WAIT_MS: int = 200
+    WHISPER_BATCH_MAX_CLIP_SECONDS: float = 90.0
+
+    # Decoded 16 kHz mono float32 audio, shared by both models and retries
+    PCM_CACHE_DIR: str = "/no_caps/cache/pcm"
+    PCM_CACHE_MAX_BYTES: int = 20 * 1024 ** 3
+
+    # Encoded speaker-turn clips, cut from the PCM cache and kept LRU
+    CLIP_CACHE_DIR: str = "/no_caps/cache/clips"
+    CLIP_CACHE_MAX_BYTES: int = 2 * 1024 ** 3
+    CLIP_MAX_SECONDS: float = 600.0
+
+    # HLS renditions for remote playback, built lazily on first request and
+    # kept next to the file. Cuts land on speaker turns within HLS_SNAP_SECONDS
+    # of the nominal boundary; HLS_PREBUILD builds once a transcript exists,
+    # and a rendition built before that is rebuilt on its turns either way
+    HLS_SEGMENT_SECONDS: float = 6.0
+    HLS_SNAP_SECONDS: float = 2.0
+    HLS_BITRATE_KBPS: int = 48
+    HLS_PREBUILD: bool = False
+
+    # Durable storage for uploads. "local" keeps them in the uploads volume;
+    # "s3" also has a worker push new blobs to an S3-compatible bucket
+    # (S3_ENDPOINT_URL points at MinIO or similar locally); hosts without
+    # the uploads volume read them through a size-bounded local cache
+    STORAGE_BACKEND: str = "local"
+    S3_BUCKET: str = "no-caps-audio"
+    S3_ENDPOINT_URL: str = ""
+    AWS_REGION: str = "us-east-1"
+    AWS_ACCESS_KEY_ID: str = ""
+    AWS_SECRET_ACCESS_KEY: str = ""
+    S3_MULTIPART_THRESHOLD_MB: int = 16
+    S3_MULTIPART_CHUNK_MB: int = 16
+    S3_MAX_CONCURRENCY: int = 8
+    STORAGE_CACHE_DIR: str = "/no_caps/cache/storage"
+    STORAGE_CACHE_MAX_BYTES: int = 10 * 1024 ** 3
+
+    # Job queue. The filesystem transport is the local broker stand-in; point
+    # this at redis:// or amqp:// in production without touching the code.
+    CELERY_BROKER_URL: str = "filesystem://"
+    CELERY_BROKER_DIR: str = "/no_caps/.broker"
+    TRANSCRIPTION_WORKER_CONCURRENCY: int = 2
+    # Housekeeping tasks (expired uploads, event logs) run this often on
+    # celery beat
+    CLEANUP_INTERVAL_SECONDS: float = 900.0
 
 
 settings = Settings()
@@ -1,18 +1,34 @@
 # app/db/crud/audio.py
+from datetime import datetime
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from db.models.audio import Audio
-from typing import List
+from db.models.transcription import Transcription
+from typing import Dict, List, Optional, Tuple
 
 
 def create_audio(
-    db: Session, filename: str, file_path: str, duration: int, user_id: int
+    db: Session,
+    filename: str,
+    file_path: str,
+    duration: int,
+    user_id: int,
+    content_hash: Optional[str] = None,
+    original_size_bytes: Optional[int] = None,
+    stored_size_bytes: Optional[int] = None,
+    original_file_path: Optional[str] = None,
 ):
     db_audio = Audio(
         filename=filename,
         file_path=file_path,
         duration=duration,
         user_id=user_id,
+        content_hash=content_hash,
+        original_size_bytes=original_size_bytes,
+        stored_size_bytes=stored_size_bytes,
+        original_file_path=original_file_path,
     )
     db.add(db_audio)
     db.commit()
@@ -20,10 +36,87 @@ def create_audio(
     return db_audio
 
 
+def get_audio(db: Session, audio_id: int) -> Optional[Audio]:
+    return db.query(Audio).filter(Audio.id == audio_id).first()
+
+
+def replace_stored_file(
+    db: Session,
+    file_path: str,
+    new_file_path: str,
+    stored_size_bytes: int,
+    original_file_path: Optional[str] = None,
+) -> int:
+    """
+    Point every row stored at file_path to new_file_path instead.
+
+    Re-uploads share their earlier row's file, so an ingested blob can
+    back several rows; all of them move together.
+
+    Returns:
+        int: Number of rows updated
+    """
+    count = (
+        db.query(Audio)
+        .filter(Audio.file_path == file_path)
+        .update(
+            {
+                Audio.file_path: new_file_path,
+                Audio.stored_size_bytes: stored_size_bytes,
+                Audio.original_file_path: original_file_path,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return count
+
+
+def get_audio_by_hash(db: Session, content_hash: str) -> Optional[Audio]:
+    """Return any earlier upload with the same content, if one exists."""
+    return db.query(Audio).filter(Audio.content_hash == content_hash).first()
+
+
 def get_user_audio_files(user_id: int, db: Session) -> List[Audio]:
     return db.query(Audio).filter(Audio.user_id == user_id).all()
 
 
+async def list_user_audio_page_async(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> List[Dict]:
+    """
+    One page of a user's files, newest first, after the (created_at, id)
+    key of the previous page's last row.
+
+    A single query over the (user_id, created_at, id) index, outer-joined
+    to each file's transcription for its status and word count; only the
+    listed columns are read, never transcript content.
+    """
+    query = (
+        select(
+            Audio.id,
+            Audio.filename,
+            Audio.duration,
+            Audio.stored_size_bytes,
+            Audio.created_at,
+            Transcription.id.label("transcription_id"),
+            Transcription.status.label("transcription_status"),
+            Transcription.word_count,
+        )
+        .outerjoin(Transcription, Transcription.audio_id == Audio.id)
+        .where(Audio.user_id == user_id)
+        .order_by(Audio.created_at.desc(), Audio.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        query = query.where(tuple_(Audio.created_at, Audio.id) < tuple_(*after))
+    result = await db.execute(query)
+    return [dict(row) for row in result.mappings()]
+
+
 def get_audio_or_404(db: Session, audio_id: int, user_id: int) -> Audio:
     """
     Retrieve an audio file by its ID and user ID. If the audio does not exist
@@ -43,7 +136,18 @@ def get_audio_or_404(db: Session, audio_id: int, user_id: int) -> Audio:
     """
     # Query the database for the audio file
     audio = db.query(Audio).filter(Audio.id == audio_id).first()
+    return _owned_or_404(audio, audio_id, user_id)
+
+
+async def get_audio_or_404_async(
+    db: AsyncSession, audio_id: int, user_id: int
+) -> Audio:
+    """get_audio_or_404 on an async session, for handlers on the event loop."""
+    audio = await db.get(Audio, audio_id)
+    return _owned_or_404(audio, audio_id, user_id)
+
 
+def _owned_or_404(audio: Optional[Audio], audio_id: int, user_id: int) -> Audio:
     # Check if the audio exists and belongs to the specified user
     if not audio:
         raise HTTPException(
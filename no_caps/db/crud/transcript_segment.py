@@ -0,0 +1,133 @@
+# app/db/crud/transcript_segment.py
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from db.models.transcript_segment import TranscriptSegment
+
+
+def transcript_segment_rows(transcription_id: int, content: Any) -> List[Dict]:
+    """
+    Rows for the segments of a transcript document.
+
+    content is the list of speaker turns the worker and live sessions
+    store; a {"segments": [...]} document is accepted too. Items without
+    timestamps cannot be placed on the timeline and are skipped.
+    """
+    if isinstance(content, dict):
+        content = content.get("segments") or []
+    rows = []
+    for position, segment in enumerate(content or []):
+        if not isinstance(segment, dict):
+            continue
+        start = segment.get("start_time", segment.get("start"))
+        end = segment.get("end_time", segment.get("end"))
+        if start is None or end is None:
+            continue
+        rows.append({
+            "transcription_id": transcription_id,
+            "position": position,
+            "start_time": float(start),
+            "end_time": float(end),
+            "speaker": segment.get("speaker"),
+            "text": segment.get("text") or "",
+        })
+    return rows
+
+
+def replace_transcript_segments(
+    db: Session, transcription_id: int, content: Any
+) -> int:
+    """
+    Replace a transcription's segment rows with those of content.
+
+    One DELETE and one multi-row INSERT; the caller commits, so the rows
+    change together with the document they mirror.
+    """
+    db.execute(
+        delete(TranscriptSegment)
+        .where(TranscriptSegment.transcription_id == transcription_id)
+    )
+    rows = transcript_segment_rows(transcription_id, content)
+    if rows:
+        db.execute(insert(TranscriptSegment), rows)
+    return len(rows)
+
+
+def append_transcript_segments(
+    db: Session, transcription_id: int, segments: List[Dict]
+) -> int:
+    """
+    Add segments after a transcription's last stored one.
+
+    Running jobs flush what they have finished this way, so each flush
+    writes only its new rows; the final replace_transcript_segments swaps
+    them for the merged, speaker-labelled transcript. The caller commits.
+    """
+    last = db.scalar(
+        select(func.max(TranscriptSegment.position))
+        .where(TranscriptSegment.transcription_id == transcription_id)
+    )
+    offset = 0 if last is None else last + 1
+    rows = transcript_segment_rows(transcription_id, segments)
+    for row in rows:
+        row["position"] += offset
+    if rows:
+        db.execute(insert(TranscriptSegment), rows)
+    return len(rows)
+
+
+def list_transcript_segments(
+    db: Session, transcription_id: int
+) -> List[TranscriptSegment]:
+    """All of a transcription's segments, in transcript order."""
+    return list(db.scalars(
+        select(TranscriptSegment)
+        .where(TranscriptSegment.transcription_id == transcription_id)
+        .order_by(TranscriptSegment.position)
+    ))
+
+
+def segment_dicts(rows: List[TranscriptSegment]) -> List[Dict]:
+    """Segment rows in the shape of transcript content items."""
+    return [
+        {
+            "speaker": row.speaker,
+            "start_time": row.start_time,
+            "end_time": row.end_time,
+            "text": row.text,
+        }
+        for row in rows
+    ]
+
+
+async def list_transcript_segments_async(
+    db: AsyncSession,
+    transcription_id: int,
+    limit: Optional[int],
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    speaker: Optional[str] = None,
+    after_position: Optional[int] = None,
+) -> List[TranscriptSegment]:
+    """
+    Segments in transcript order, optionally only those overlapping
+    [start, end) and/or spoken by one speaker, after a previous page's
+    last position. A limit of None returns them all.
+    """
+    query = (
+        select(TranscriptSegment)
+        .where(TranscriptSegment.transcription_id == transcription_id)
+        .order_by(TranscriptSegment.position)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    if end is not None:
+        query = query.where(TranscriptSegment.start_time < end)
+    if start is not None:
+        query = query.where(TranscriptSegment.end_time > start)
+    if speaker is not None:
+        query = query.where(TranscriptSegment.speaker == speaker)
+    if after_position is not None:
+        query = query.where(TranscriptSegment.position > after_position)
+    return list(await db.scalars(query))
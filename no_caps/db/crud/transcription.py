@@ -1,7 +1,14 @@
 # app/db/crud/transcription.py
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer
 from db.models.transcription import Transcription, TranscriptionStatus
+from db.models.audio import Audio
+from db.crud.transcript_segment import (
+    append_transcript_segments,
+    replace_transcript_segments,
+)
 from datetime import datetime
 from fastapi import HTTPException, status
 import logging
@@ -45,6 +52,44 @@ class TranscriptionCRUD:
             Transcription.id == transcription_id
         ).first()
 
+    @staticmethod
+    async def get_transcription_status_async(
+        db: AsyncSession,
+        transcription_id: int
+    ) -> Optional[Tuple[Transcription, int]]:
+        """
+        A transcription without its content, and the id of the user who
+        owns its audio, in one query.
+
+        content can run to megabytes and polling clients mostly see
+        PENDING; load_content_async fetches it when it is needed.
+        """
+        row = (await db.execute(
+            select(Transcription, Audio.user_id)
+            .join(Audio, Transcription.audio_id == Audio.id)
+            .options(defer(Transcription.content))
+            .where(Transcription.id == transcription_id)
+        )).first()
+        return tuple(row) if row else None
+
+    @staticmethod
+    async def load_content_async(
+        db: AsyncSession,
+        transcription: Transcription
+    ) -> None:
+        """Load the deferred content of a transcription."""
+        await db.refresh(transcription, ["content"])
+
+    @staticmethod
+    async def get_transcription_by_audio_id_async(
+        db: AsyncSession,
+        audio_id: int
+    ) -> Optional[Transcription]:
+        """Retrieve a transcription by audio ID on an async session."""
+        return (await db.execute(
+            select(Transcription).where(Transcription.audio_id == audio_id)
+        )).scalars().first()
+
     @staticmethod
     def get_transcription_by_id(
         db: Session,
@@ -73,6 +118,25 @@ class TranscriptionCRUD:
                 detail="Error retrieving transcription"
             ) from e
 
+    @staticmethod
+    def get_completed_transcription_by_hash(
+        db: Session,
+        content_hash: str,
+        user_id: int,
+    ) -> Optional[Transcription]:
+        """Retrieve a finished transcription of one user's audio with this content.
+
+        Scoped to the owner: transcripts can be edited, so another user's
+        copy could carry text (or corrections) that is not theirs to see.
+        """
+        return db.query(Transcription).join(
+            Audio, Transcription.audio_id == Audio.id
+        ).filter(
+            Audio.content_hash == content_hash,
+            Audio.user_id == user_id,
+            Transcription.status == TranscriptionStatus.COMPLETED,
+        ).first()
+
     @staticmethod
     def update_transcription_content(
         db: Session,
@@ -89,6 +153,8 @@ class TranscriptionCRUD:
         if transcription:
             if content is not None:
                 transcription.content = content
+                # Indexed copy for time-range and paged reads
+                replace_transcript_segments(db, transcription_id, content)
             if word_count is not None:
                 transcription.word_count = word_count
             if confidence_score is not None:
@@ -99,11 +165,62 @@ class TranscriptionCRUD:
                 transcription.language = language
             transcription.status = TranscriptionStatus.COMPLETED
             transcription.completed_at = datetime.now()
+            transcription.progress = 100.0
 
             db.commit()
             db.refresh(transcription)
         return transcription
 
+    @staticmethod
+    def append_transcription_segments(
+        db: Session,
+        transcription_id: int,
+        segments: List[Dict[str, Any]],
+        processed_seconds: float,
+        total_seconds: float,
+    ) -> Optional[Transcription]:
+        """
+        Append finished segments to an in-progress transcription.
+
+        They go to the segment rows only: each flush inserts just its new
+        segments instead of rewriting the document, which is written once
+        the job completes.
+        """
+        transcription = TranscriptionCRUD.get_transcription(
+            db, transcription_id)
+        if transcription:
+            append_transcript_segments(db, transcription_id, segments)
+            transcription.processed_seconds = processed_seconds
+            if total_seconds:
+                # 100% is reserved for COMPLETED; merging still has to run
+                transcription.progress = min(
+                    99.0, 100.0 * processed_seconds / total_seconds)
+            db.commit()
+        return transcription
+
+    @staticmethod
+    def start_transcription(
+        db: Session, transcription_id: int
+    ) -> Optional[Transcription]:
+        """
+        Mark a job IN_PROGRESS with nothing transcribed yet.
+
+        A job redelivered after its worker died starts over, so the partial
+        segments and progress of the dead attempt are dropped in the same
+        commit; otherwise polls would show them ahead of the new ones.
+        """
+        transcription = TranscriptionCRUD.get_transcription(
+            db, transcription_id)
+        if transcription:
+            transcription.status = TranscriptionStatus.IN_PROGRESS
+            transcription.error_message = None
+            transcription.progress = 0.0
+            transcription.processed_seconds = None
+            replace_transcript_segments(db, transcription_id, None)
+            db.commit()
+            db.refresh(transcription)
+        return transcription
+
     @staticmethod
     def update_transcription_status(
         db: Session,
@@ -0,0 +1,74 @@
+# app/db/crud/upload_session.py
+import uuid
+from datetime import datetime
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from db.models.upload_session import UploadSession
+from typing import List, Optional
+
+
+def create_upload_session(
+    db: Session,
+    filename: str,
+    total_bytes: int,
+    tmp_path: str,
+    user_id: int,
+    upload_id: Optional[str] = None,
+) -> UploadSession:
+    db_upload = UploadSession(
+        id=upload_id or str(uuid.uuid4()),
+        filename=filename,
+        total_bytes=total_bytes,
+        received_bytes=0,
+        tmp_path=tmp_path,
+        user_id=user_id,
+    )
+    db.add(db_upload)
+    db.commit()
+    db.refresh(db_upload)
+    return db_upload
+
+
+def get_upload_session_or_404(
+    db: Session, upload_id: str, user_id: int
+) -> UploadSession:
+    """Retrieve an upload session owned by the user, or raise 404."""
+    upload = db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+    if not upload or upload.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Upload {upload_id} not found."
+        )
+    return upload
+
+
+def advance_upload_offset(
+    db: Session, upload_id: str, expected_offset: int, new_offset: int
+) -> bool:
+    """
+    Move received_bytes forward, but only from the offset the chunk was
+    written at. Returns False if another request advanced it first.
+    """
+    updated = (
+        db.query(UploadSession)
+        .filter(
+            UploadSession.id == upload_id,
+            UploadSession.received_bytes == expected_offset,
+        )
+        .update(
+            {"received_bytes": new_offset, "updated_at": datetime.now()},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return updated == 1
+
+
+def delete_upload_session(db: Session, upload: UploadSession) -> None:
+    db.delete(upload)
+    db.commit()
+
+
+def list_stale_upload_sessions(db: Session, before: datetime) -> List[UploadSession]:
+    """Uploads last written to before the given time."""
+    return db.query(UploadSession).filter(UploadSession.updated_at < before).all()
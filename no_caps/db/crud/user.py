@@ -1,6 +1,8 @@
 # app/db/crud/user.py
-from typing import Optional
+from typing import List, Optional
 from db.schemas import UserCreate
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
@@ -17,6 +19,24 @@ def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
 
+async def get_user_async(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.scalar(select(User).where(User.id == user_id))
+
+
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    return await db.scalar(select(User).where(User.email == email))
+
+
+async def list_users_async(
+    db: AsyncSession, limit: int = 10, after_id: Optional[int] = None
+) -> List[User]:
+    """A page of users in id order, after the previous page's last id."""
+    query = select(User).order_by(User.id).limit(limit)
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    return list(await db.scalars(query))
+
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -2,6 +2,8 @@
 from db.models.user import User
 from db.models.audio import Audio
 from db.models.transcription import Transcription
+from db.models.upload_session import UploadSession
+from db.models.transcript_segment import TranscriptSegment
 
 # Make all models available at the package level
-__all__ = ['User', 'Audio', 'Transcription']
+__all__ = ['User', 'Audio', 'Transcription', 'UploadSession', 'TranscriptSegment']
@@ -1,5 +1,5 @@
 # app/db/models/audio.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, BigInteger, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from db.session import Base
@@ -7,12 +7,23 @@ from db.session import Base
 
 class Audio(Base):
     __tablename__ = "audio_files"
+    # Library pages are keyset scans over a user's files, newest first
+    __table_args__ = (
+        Index("ix_audio_files_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String)
     file_path = Column(String)
     duration = Column(Integer)
-    created_at = Column(DateTime, default=datetime.now())
+    # SHA-256 of the uploaded bytes; identical uploads share one blob
+    content_hash = Column(String(64), index=True, nullable=True)
+    # Sizes as uploaded and as stored; they differ when ingest transcodes.
+    # original_file_path is set only if the upload was kept alongside
+    original_size_bytes = Column(BigInteger, nullable=True)
+    stored_size_bytes = Column(BigInteger, nullable=True)
+    original_file_path = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     # relationships
     owner = relationship("User", back_populates="audio_files")
@@ -0,0 +1,34 @@
+# app/db/models/transcript_segment.py
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, Index, UniqueConstraint
+from db.session import Base
+
+
+class TranscriptSegment(Base):
+    """One speaker turn of a finished transcript.
+
+    Transcription.content keeps the whole document for the existing
+    responses; these rows are what time-range, speaker and paged reads
+    query, so they never deserialize the document. While a job runs they
+    hold the speaker-less segments finished so far, and content is empty.
+    """
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        # Time-range reads: start_time < range end, per transcript
+        Index("ix_transcript_segments_transcription_id_start_time",
+              "transcription_id", "start_time"),
+        # Paged reads walk segments in transcript order
+        UniqueConstraint("transcription_id", "position",
+                         name="uq_transcript_segments_transcription_id_position"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    transcription_id = Column(
+        Integer,
+        ForeignKey("transcriptions.id", ondelete="CASCADE"),
+        nullable=False)
+    # Index of the segment within Transcription.content (or flush order)
+    position = Column(Integer, nullable=False)
+    start_time = Column(Float, nullable=False)
+    end_time = Column(Float, nullable=False)
+    speaker = Column(String, nullable=True)
+    text = Column(Text, nullable=False, default="")
@@ -1,5 +1,5 @@
 # app/db/models/transcription.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, JSON, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, JSON, Float, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -22,17 +22,29 @@ class Transcription(Base):
     - Define basic data validation rules
     """
     __tablename__ = "transcriptions"
+    # Unfinished jobs only, so it stays small as completed ones pile up
+    __table_args__ = (
+        Index(
+            "ix_transcriptions_active_created_at",
+            "created_at",
+            postgresql_where=text("status IN ('PENDING', 'IN_PROGRESS')"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(JSON, nullable=True)  # bc transcription mayb pending
     status = Column(
         Enum(TranscriptionStatus),
-        default=TranscriptionStatus.PENDING)
+        default=TranscriptionStatus.PENDING,
+        index=True)
     language = Column(String, default="en")
     duration = Column(Integer, nullable=True)  # Duration in seconds
-    created_at = Column(DateTime, default=datetime.now())
+    created_at = Column(DateTime, default=datetime.now, index=True)
     completed_at = Column(DateTime, nullable=True)
     error_message = Column(String, nullable=True)
+    # While IN_PROGRESS, content holds the segments finished so far
+    progress = Column(Float, default=0.0)  # Percent of audio processed
+    processed_seconds = Column(Float, nullable=True)
 
     # Foreign keys and relationships
     audio_id = Column(
@@ -0,0 +1,26 @@
+# app/db/models/upload_session.py
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, BigInteger
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from db.session import Base
+
+
+class UploadSession(Base):
+    """A resumable upload in progress.
+
+    Chunks are written straight into a preallocated file at their offset;
+    received_bytes is how much of it is contiguous from the start, i.e.
+    where the client resumes after a dropped connection.
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(36), primary_key=True, index=True)  # uuid4
+    filename = Column(String)
+    total_bytes = Column(BigInteger)
+    received_bytes = Column(BigInteger, default=0)
+    tmp_path = Column(String)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    # relationships
+    owner = relationship("User")
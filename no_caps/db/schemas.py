@@ -38,6 +38,9 @@ class AudioBase(BaseModel):
     filename: str
     file_path: str
     duration: Optional[int] = None
+    content_hash: Optional[str] = None
+    original_size_bytes: Optional[int] = None
+    stored_size_bytes: Optional[int] = None
 
 
 class AudioCreate(AudioBase):
@@ -76,6 +79,7 @@ class Transcription(TranscriptionBase):
     audio_id: int
     word_count: Optional[int] = None
     confidence_score: Optional[float] = None
+    progress: Optional[float] = None
     audio_file: Audio
 
     model_config = ConfigDict(
@@ -124,6 +128,9 @@ class AudioResponse(BaseModel):
     filename: str
     file_path: str
     duration: Optional[int]
+    content_hash: Optional[str] = None
+    original_size_bytes: Optional[int] = None
+    stored_size_bytes: Optional[int] = None
     created_at: datetime
     user_id: int
 
@@ -133,6 +140,24 @@ class AudioResponse(BaseModel):
     )
 
 
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: str
+    total_bytes: int
+    received_bytes: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
 class TranscriptionResponse(BaseModel):
     id: int
     content: Optional[Dict[str, Any]]
@@ -145,6 +170,7 @@ class TranscriptionResponse(BaseModel):
     audio_id: int
     word_count: Optional[int]
     confidence_score: Optional[float]
+    progress: Optional[float] = None
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -155,7 +181,7 @@ class TranscriptionResponse(BaseModel):
 # List Response Models
 class UserList(BaseModel):
     items: List[UserResponse]
-    total: int
+    next_cursor: Optional[str] = None
 
 
 class AudioList(BaseModel):
@@ -163,6 +189,39 @@ class AudioList(BaseModel):
     total: int
 
 
+class AudioLibraryItem(BaseModel):
+    """One row of a user's library, with its transcription's state."""
+    id: int
+    filename: str
+    duration: Optional[int] = None
+    stored_size_bytes: Optional[int] = None
+    created_at: datetime
+    transcription_id: Optional[int] = None
+    transcription_status: Optional[TranscriptionStatus] = None
+    word_count: Optional[int] = None
+
+
+class AudioPage(BaseModel):
+    items: List[AudioLibraryItem]
+    next_cursor: Optional[str] = None
+
+
+class TranscriptSegmentResponse(BaseModel):
+    """A speaker turn, keyed as in Transcription.content, plus its index."""
+    position: int
+    speaker: Optional[str] = None
+    start_time: float
+    end_time: float
+    text: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TranscriptSegmentPage(BaseModel):
+    items: List[TranscriptSegmentResponse]
+    next_cursor: Optional[str] = None
+
+
 class TranscriptionList(BaseModel):
     items: List[TranscriptionResponse]
     total: int
@@ -1,12 +1,53 @@
 # app/db/session.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from core.config import settings
+from db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def async_database_url():
+    """The asyncpg URL, with its per-connection statement cache size."""
+    url = make_url(
+        settings.ASYNC_SQLALCHEMY_DATABASE_URI or settings.SQLALCHEMY_DATABASE_URI
+    )
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.update_query_dict(
+        {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+    )
+
+
+# Workers and the few remaining sync code paths
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    poolclass=InstrumentedQueuePool,
+    **_pool_options(),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request handlers: queries await instead of blocking the event loop
+async_engine = create_async_engine(
+    async_database_url(),
+    poolclass=InstrumentedAsyncQueuePool,
+    **_pool_options(),
+)
+# Objects stay readable after commit; lazy loads would need the loop
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -18,3 +59,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status() -> dict:
+    """Checkout wait and in-use counts for both engines' pools."""
+    return {
+        "sync": engine.pool.metrics.snapshot(engine.pool),
+        "async": async_engine.sync_engine.pool.metrics.snapshot(
+            async_engine.sync_engine.pool
+        ),
+    }
@@ -2,9 +2,9 @@
 from fastapi import FastAPI
 from api.routers import api_router
 from core.config import settings
-from db.session import engine, Base
 import logging
 from middleware.logging import debug_middleware
+from middleware.upload_limit import UploadLimitMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -19,11 +19,13 @@ app = FastAPI(
     version=settings.VERSION
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic (alembic -c migrations/alembic.ini
+# upgrade head), run once per deploy rather than on every process start
 
 # Add debug middleware
 app.middleware("http")(debug_middleware)
+# Registered last so it runs first and sees every body read
+app.add_middleware(UploadLimitMiddleware)
 
 # Include routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
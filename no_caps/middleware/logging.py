@@ -17,8 +17,10 @@ async def debug_middleware(request: Request, call_next: Callable):
     print(f"Path: {request.url.path}")
     print(f"Headers: {dict(request.headers)}")
 
-    # Log request body for POST/PUT requests
-    if request.method in ["POST", "PUT", "PATCH"]:
+    # Log request body for JSON POST/PUT requests; uploads are left
+    # unread so they can stream straight to disk
+    content_type = request.headers.get("content-type", "")
+    if request.method in ["POST", "PUT", "PATCH"] and content_type.startswith("application/json"):
         try:
             body = await request.body()
             if body:
@@ -33,7 +35,8 @@ async def debug_middleware(request: Request, call_next: Callable):
     # Log registered routes
     print("\nRegistered routes:")
     for route in request.app.routes:
-        print(f"{route.methods} {route.path}")
+        # WebSocket routes have no methods
+        print(f"{getattr(route, 'methods', 'WS')} {route.path}")
 
     # Get response
     response = await call_next(request)
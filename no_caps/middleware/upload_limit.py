@@ -0,0 +1,85 @@
+# middleware/upload_limit.py
+from typing import Optional
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.config import settings
+
+# Allowance for multipart boundaries and part headers on top of the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class BodyTooLarge(HTTPException):
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=413, detail=f"File exceeds the {max_bytes} byte limit"
+        )
+
+
+class UploadLimitMiddleware:
+    """Refuse request bodies over MAX_UPLOAD_BYTES (plus multipart overhead).
+
+    A request that declares too large a Content-Length is rejected before
+    any of its body is read. Bodies without one (chunked) or that run past
+    the declared length are counted as they stream in, and the read that
+    crosses the limit fails with a 413, so nothing past the cap is spooled.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: Optional[int] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.max_bytes or settings.MAX_UPLOAD_BYTES
+        limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                await JSONResponse(
+                    status_code=400, content={"detail": "Invalid Content-Length header"}
+                )(scope, receive, send)
+                return
+            if declared > limit:
+                await self._reject(max_bytes, scope, receive, send)
+                return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise BodyTooLarge(max_bytes)
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except BodyTooLarge:
+            # Handlers normally turn it into the 413 themselves; this covers
+            # reads outside them, e.g. in other middleware
+            if response_started:
+                raise
+            await self._reject(max_bytes, scope, receive, send)
+
+    @staticmethod
+    async def _reject(max_bytes: int, scope: Scope, receive: Receive, send: Send) -> None:
+        await JSONResponse(
+            status_code=413,
+            content={"detail": f"File exceeds the {max_bytes} byte limit"},
+        )(scope, receive, send)
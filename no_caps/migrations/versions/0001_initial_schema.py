@@ -0,0 +1,77 @@
+"""initial schema
+
+The tables as create_all built them before migrations existed. A database
+created that way is brought under Alembic with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+transcription_status = sa.Enum(
+    "PENDING", "IN_PROGRESS", "COMPLETED", "FAILED", name="transcriptionstatus"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "audio_files",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=True),
+        sa.Column("file_path", sa.String(), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_audio_files_id", "audio_files", ["id"])
+
+    op.create_table(
+        "transcriptions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.JSON(), nullable=True),
+        sa.Column("status", transcription_status, nullable=True),
+        sa.Column("language", sa.String(), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("audio_id", sa.Integer(), nullable=True),
+        sa.Column("word_count", sa.Integer(), nullable=True),
+        sa.Column("confidence_score", sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(["audio_id"], ["audio_files.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("audio_id"),
+    )
+    op.create_index("ix_transcriptions_id", "transcriptions", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transcriptions_id", table_name="transcriptions")
+    op.drop_table("transcriptions")
+    transcription_status.drop(op.get_bind(), checkfirst=True)
+    op.drop_index("ix_audio_files_id", table_name="audio_files")
+    op.drop_table("audio_files")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
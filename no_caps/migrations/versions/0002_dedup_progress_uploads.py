@@ -0,0 +1,56 @@
+"""content hashes, stored sizes, job progress and resumable uploads
+
+Columns and tables the models gained while create_all was still building
+the schema: content-addressed dedup and ingest sizes on audio_files,
+incremental progress on transcriptions, and upload_sessions.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("audio_files", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.add_column("audio_files", sa.Column("original_size_bytes", sa.BigInteger(), nullable=True))
+    op.add_column("audio_files", sa.Column("stored_size_bytes", sa.BigInteger(), nullable=True))
+    op.add_column("audio_files", sa.Column("original_file_path", sa.String(), nullable=True))
+    op.create_index("ix_audio_files_content_hash", "audio_files", ["content_hash"])
+
+    op.add_column("transcriptions", sa.Column("progress", sa.Float(), nullable=True))
+    op.add_column("transcriptions", sa.Column("processed_seconds", sa.Float(), nullable=True))
+
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("filename", sa.String(), nullable=True),
+        sa.Column("total_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("received_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("tmp_path", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_upload_sessions_id", "upload_sessions", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_upload_sessions_id", table_name="upload_sessions")
+    op.drop_table("upload_sessions")
+    op.drop_column("transcriptions", "processed_seconds")
+    op.drop_column("transcriptions", "progress")
+    op.drop_index("ix_audio_files_content_hash", table_name="audio_files")
+    op.drop_column("audio_files", "original_file_path")
+    op.drop_column("audio_files", "stored_size_bytes")
+    op.drop_column("audio_files", "original_size_bytes")
+    op.drop_column("audio_files", "content_hash")
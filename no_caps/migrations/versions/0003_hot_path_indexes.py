@@ -0,0 +1,41 @@
+"""indexes for library pages, status filters and the job queue
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset pages of a user's library; also serves user_id lookups and
+    # the cascade from users
+    op.create_index(
+        "ix_audio_files_user_id_created_at_id",
+        "audio_files",
+        ["user_id", "created_at", "id"],
+    )
+    op.create_index("ix_transcriptions_status", "transcriptions", ["status"])
+    op.create_index("ix_transcriptions_created_at", "transcriptions", ["created_at"])
+    # Only unfinished jobs, oldest first: stays small however many
+    # transcriptions have completed
+    op.create_index(
+        "ix_transcriptions_active_created_at",
+        "transcriptions",
+        ["created_at"],
+        postgresql_where=sa.text("status IN ('PENDING', 'IN_PROGRESS')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transcriptions_active_created_at", table_name="transcriptions")
+    op.drop_index("ix_transcriptions_created_at", table_name="transcriptions")
+    op.drop_index("ix_transcriptions_status", table_name="transcriptions")
+    op.drop_index("ix_audio_files_user_id_created_at_id", table_name="audio_files")
@@ -0,0 +1,71 @@
+"""transcript_segments: indexed speaker turns of finished transcripts
+
+Backfills rows from the content of every completed transcription.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transcript_segments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("transcription_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Float(), nullable=False),
+        sa.Column("end_time", sa.Float(), nullable=False),
+        sa.Column("speaker", sa.String(), nullable=True),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["transcription_id"], ["transcriptions.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "transcription_id",
+            "position",
+            name="uq_transcript_segments_transcription_id_position",
+        ),
+    )
+    op.create_index(
+        "ix_transcript_segments_transcription_id_start_time",
+        "transcript_segments",
+        ["transcription_id", "start_time"],
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            """
+            INSERT INTO transcript_segments
+                (transcription_id, position, start_time, end_time, speaker, text)
+            SELECT t.id,
+                   s.ordinality - 1,
+                   (s.value ->> 'start_time')::float,
+                   (s.value ->> 'end_time')::float,
+                   s.value ->> 'speaker',
+                   coalesce(s.value ->> 'text', '')
+            FROM transcriptions t
+            CROSS JOIN LATERAL json_array_elements(t.content) WITH ORDINALITY AS s
+            WHERE t.status = 'COMPLETED'
+              AND json_typeof(t.content) = 'array'
+              AND s.value ->> 'start_time' IS NOT NULL
+              AND s.value ->> 'end_time' IS NOT NULL
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_transcript_segments_transcription_id_start_time",
+        table_name="transcript_segments",
+    )
+    op.drop_table("transcript_segments")
@@ -1,12 +1,21 @@
 # app/services/audio_service.py
 from fastapi import UploadFile, HTTPException, Depends
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from db.crud import audio as audio_crud
-from utils.file_handling import save_upload_file
+from core.config import settings
+from services.ingest_service import as_received, reuse_ingested
+from utils.file_handling import StoredUpload, save_upload_file
 from utils.audio_processing import get_audio_duration
+from workers.tasks import compute_peaks_task, store_audio_task, transcode_audio_task
 from core.auth import get_current_user
 from db.models import User
+from utils.pagination import decode_cursor, encode_cursor
+from datetime import datetime
+from typing import Dict, Optional
 import logging
+import os
 logger = logging.getLogger(__name__)
 
 
@@ -16,27 +25,72 @@ async def process_audio_upload(
     current_user: User = Depends(get_current_user)
 ):
     if not file.content_type.startswith('audio/'):
-        print('FILE CONTENT TYPE:', file.content_type)
+        logger.info(f"Rejected upload with content type {file.content_type}")
         raise HTTPException(
             status_code=400,
             detail="File must be an audio file"
         )
-    file_path = await save_upload_file(file)
-    duration = get_audio_duration(file_path)
+    stored = await save_upload_file(file)
+    return await register_stored_audio(db, file.filename, stored, current_user)
 
-    logger.info(f"Saving file to: {file_path}")
-    print(f"Saving file to: {file_path}")
 
-    return audio_crud.create_audio(
+async def register_stored_audio(
+    db: Session, filename: str, stored: StoredUpload, current_user: User
+):
+    """
+    Probe, ingest and record an upload that is already in the blob store.
+
+    Identical content seen before shares the earlier row's duration and
+    stored file, so it is neither probed nor transcoded again. New content
+    is recorded as received; transcoding (TRANSCODE_ON_INGEST), the push to
+    the storage backend and waveform peaks all happen on a worker.
+    """
+    existing = await run_in_threadpool(
+        audio_crud.get_audio_by_hash, db, stored.content_hash
+    )
+    if existing and existing.duration is not None:
+        duration = existing.duration
+    else:
+        # Header parsing is blocking file I/O; keep it off the event loop
+        duration = await run_in_threadpool(
+            get_audio_duration, stored.file_path, stored.content_hash
+        )
+
+    # A blob that already existed is already in the storage backend
+    reused = bool(existing and os.path.exists(existing.file_path))
+    if reused:
+        ingested = await run_in_threadpool(reuse_ingested, existing, stored)
+    else:
+        ingested = as_received(stored)
+
+    logger.info(f"Saving file to: {ingested.file_path}")
+
+    audio = await run_in_threadpool(
+        audio_crud.create_audio,
         db,
-        filename=file.filename,
-        file_path=file_path,
+        filename=filename,
+        file_path=ingested.file_path,
         duration=duration,
-        user_id=current_user.id
+        user_id=current_user.id,
+        content_hash=stored.content_hash,
+        original_size_bytes=ingested.original_size_bytes,
+        stored_size_bytes=ingested.stored_size_bytes,
+        original_file_path=ingested.original_file_path,
     )
+    if reused:
+        compute_peaks_task.delay(audio.id, audio.file_path)
+    elif settings.TRANSCODE_ON_INGEST:
+        # Stores and computes peaks for the canonical blob once it exists
+        transcode_audio_task.delay(audio.id)
+    else:
+        store_audio_task.delay(audio.file_path)
+        compute_peaks_task.delay(audio.id, audio.file_path)
+    return audio
 
 
-async def get_audio_files(user_id: int, db: Session):
+async def get_audio_files(
+    user_id: int, db: AsyncSession, limit: int = 50, cursor: Optional[str] = None
+) -> Dict:
     # TODO JWT user_id extraction/verification
     # user_id = content extracted from JWT
     # else no audio return 404
@@ -45,4 +99,18 @@ async def get_audio_files(user_id: int, db: Session):
     #       (maybe request if a record existstied to user_id&audio_id)
     #   return audio_id
     # else return permission denied
-    return audio_crud.get_user_audio_files(db=db, user_id=user_id)
+    after = decode_cursor(cursor, datetime, int)
+    # One extra row tells whether another page follows
+    rows = await audio_crud.list_user_audio_page_async(
+        db=db, user_id=user_id, limit=limit + 1, after=after
+    )
+    items = rows[:limit]
+    for item in items:
+        status = item.get("transcription_status")
+        if status is not None:
+            item["transcription_status"] = getattr(status, "value", status)
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return {"items": items, "next_cursor": next_cursor}
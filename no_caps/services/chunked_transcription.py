@@ -0,0 +1,303 @@
+# app/services/chunked_transcription.py
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.config import settings
+from core.logging import logger
+from services.model_registry import model_registry
+from services.pcm_cache import PCM_DTYPE, SAMPLE_RATE
+from workers.celery_app import celery_app
+
+# Frame size for the silence search (25 ms)
+ENERGY_FRAME = SAMPLE_RATE // 40
+# How often a job looks for its next finished chunk
+RESULT_POLL_SECONDS = 0.5
+
+
+@dataclass
+class Chunk:
+    """A slice of the signal handed to one Whisper call, in samples.
+
+    [start, end) is what the model hears; [keep_start, keep_end) is the
+    part of its output that survives stitching. The difference is overlap
+    that only gives the model context at the edges.
+    """
+    start: int
+    end: int
+    keep_start: int
+    keep_end: int
+
+
+def find_chunks(
+    pcm: np.ndarray,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float,
+) -> List[Chunk]:
+    """
+    Split a signal into overlapping chunks cut at the quietest nearby point.
+
+    Each cut is placed at the lowest-energy 25 ms frame within
+    search_seconds before the nominal chunk end, so cuts land in pauses
+    rather than mid-word.
+
+    Args:
+        pcm (np.ndarray): Mono signal at SAMPLE_RATE
+        chunk_seconds (float): Nominal chunk length
+        overlap_seconds (float): Context added on both sides of each cut
+        search_seconds (float): How far back from the nominal end to look
+
+    Returns:
+        List[Chunk]: Chunks covering the whole signal, in order
+    """
+    total = len(pcm)
+    chunk_len = int(chunk_seconds * SAMPLE_RATE)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    search = int(search_seconds * SAMPLE_RATE)
+
+    cuts = [0]
+    while total - cuts[-1] > chunk_len:
+        target = cuts[-1] + chunk_len
+        cuts.append(_quietest_point(pcm, max(cuts[-1] + 1, target - search), target))
+    cuts.append(total)
+
+    return [
+        Chunk(
+            start=max(0, keep_start - overlap),
+            end=min(total, keep_end + overlap),
+            keep_start=keep_start,
+            keep_end=keep_end,
+        )
+        for keep_start, keep_end in zip(cuts, cuts[1:])
+    ]
+
+
+def _quietest_point(pcm: np.ndarray, lo: int, hi: int) -> int:
+    """Centre of the lowest-energy frame in pcm[lo:hi]."""
+    window = np.asarray(pcm[lo:hi], dtype=PCM_DTYPE)
+    n_frames = len(window) // ENERGY_FRAME
+    if n_frames == 0:
+        return hi
+    frames = window[: n_frames * ENERGY_FRAME].reshape(n_frames, ENERGY_FRAME)
+    energy = np.einsum("ij,ij->i", frames, frames)
+    return lo + int(np.argmin(energy)) * ENERGY_FRAME + ENERGY_FRAME // 2
+
+
+def stitch_chunk(result: dict, chunk: Chunk) -> List[Dict]:
+    """
+    Shift one chunk's Whisper output to absolute time and drop the overlap.
+
+    With word timestamps, words are kept by start time so a segment that
+    straddles the cut is trimmed rather than duplicated; otherwise whole
+    segments are kept by midpoint.
+    """
+    offset = chunk.start / SAMPLE_RATE
+    keep_start = chunk.keep_start / SAMPLE_RATE
+    keep_end = chunk.keep_end / SAMPLE_RATE
+
+    segments = []
+    for segment in result.get("segments", []):
+        words = segment.get("words")
+        if words:
+            kept = [
+                dict(word, start=word["start"] + offset, end=word["end"] + offset)
+                for word in words
+                if keep_start <= word["start"] + offset < keep_end
+            ]
+            if not kept:
+                continue
+            segments.append(dict(
+                segment,
+                start=kept[0]["start"],
+                end=kept[-1]["end"],
+                text="".join(word["word"] for word in kept),
+                words=kept,
+            ))
+        else:
+            start = segment["start"] + offset
+            end = segment["end"] + offset
+            if keep_start <= (start + end) / 2 < keep_end:
+                segments.append(dict(segment, start=start, end=end))
+    return segments
+
+
+# Set once per long-audio worker process, before its first chunk
+_torch_threads_set = False
+
+
+def _chunk_model():
+    global _torch_threads_set
+    if not _torch_threads_set:
+        import torch
+
+        torch.set_num_threads(settings.LONG_AUDIO_TORCH_THREADS)
+        _torch_threads_set = True
+    return model_registry.get_whisper(settings.WHISPER_MODEL_SIZE)
+
+
+def transcribe_chunk(
+    pcm_path: str, chunk: Chunk, word_timestamps: bool, result_path: str
+) -> None:
+    """
+    Transcribe one chunk and write the result where its job waits for it.
+
+    Runs on a LONG_AUDIO_QUEUE worker. Failures are written too, so the
+    job fails at once instead of timing out. A job that has given up has
+    removed its directory, and the result is dropped.
+    """
+    try:
+        # Every process maps the same cached file; slicing a memmap copies nothing
+        pcm = np.memmap(pcm_path, dtype=PCM_DTYPE, mode="c")
+        result = _chunk_model().transcribe(
+            pcm[chunk.start:chunk.end], word_timestamps=word_timestamps, fp16=False
+        )
+        payload = {"result": result}
+    except Exception as e:
+        logger.exception(f"Chunk {result_path} failed")
+        payload = {"error": str(e)}
+
+    path = Path(result_path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(payload, default=float))
+        os.replace(tmp_path, path)
+    except FileNotFoundError:
+        logger.info(f"Job of chunk {result_path} is gone; dropping its result")
+
+
+class ChunkedTranscriber:
+    """Transcribe long recordings as parallel chunks on long-audio workers.
+
+    Responsibilities:
+    - Split the decoded signal at silences into overlapping chunks
+    - Fan chunks out as tasks on LONG_AUDIO_QUEUE, whose worker processes
+      each keep their own Whisper model
+    - Stitch chunk outputs back into one timeline without duplicated words
+
+    Chunks go through the broker rather than a process pool of the job's
+    own: celery's prefork children are daemonic and cannot start
+    processes. Results come back as files in LONG_AUDIO_RESULTS_DIR, which
+    the job and the long-audio workers share (as they share the PCM cache).
+    """
+
+    def iter_transcribe(
+        self, pcm_path: str, pcm: np.ndarray
+    ) -> Iterator[Tuple[List[Dict], float, dict]]:
+        """
+        Yield stitched segments chunk by chunk, in timeline order.
+
+        Yields:
+            Tuple of (segments, seconds of audio covered so far, raw result)
+        """
+        chunks = self._chunks(pcm)
+        logger.info(
+            f"Transcribing {len(pcm) / SAMPLE_RATE:.0f}s of audio as "
+            f"{len(chunks)} chunks on queue {settings.LONG_AUDIO_QUEUE}"
+        )
+        job_dir = Path(settings.LONG_AUDIO_RESULTS_DIR) / uuid.uuid4().hex
+        job_dir.mkdir(parents=True)
+        try:
+            result_paths = [job_dir / f"{index}.json" for index in range(len(chunks))]
+            for chunk, result_path in zip(chunks, result_paths):
+                celery_app.send_task(
+                    "transcription.chunk",
+                    args=[
+                        pcm_path,
+                        asdict(chunk),
+                        settings.WHISPER_WORD_TIMESTAMPS,
+                        str(result_path),
+                    ],
+                    queue=settings.LONG_AUDIO_QUEUE,
+                )
+            results = (_wait_for_result(path) for path in result_paths)
+            yield from _stitched(chunks, results)
+        finally:
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+    def iter_transcribe_in_process(
+        self, model, pcm: np.ndarray
+    ) -> Iterator[Tuple[List[Dict], float, dict]]:
+        """iter_transcribe, one chunk after another on the caller's model."""
+        chunks = self._chunks(pcm)
+        logger.info(
+            f"Transcribing {len(pcm) / SAMPLE_RATE:.0f}s of audio as "
+            f"{len(chunks)} sequential chunks"
+        )
+        results = (
+            model.transcribe(
+                pcm[chunk.start:chunk.end],
+                word_timestamps=settings.WHISPER_WORD_TIMESTAMPS,
+            )
+            for chunk in chunks
+        )
+        yield from _stitched(chunks, results)
+
+    def transcribe(
+        self,
+        pcm_path: str,
+        pcm: np.ndarray,
+        on_segments: Optional[Callable[[List[Dict], float], None]] = None,
+        model=None,
+    ) -> dict:
+        """Transcribe a long recording; returns a Whisper-shaped result.
+
+        on_segments, if given, is called with each chunk's stitched segments
+        and the audio seconds covered so far, as soon as they are ready.
+        With a model, chunks run in order on it in this process rather than
+        on the long-audio workers.
+        """
+        if model is not None:
+            stitched = self.iter_transcribe_in_process(model, pcm)
+        else:
+            stitched = self.iter_transcribe(pcm_path, pcm)
+        segments: List[Dict] = []
+        language = None
+        for chunk_segments, covered, result in stitched:
+            segments.extend(chunk_segments)
+            if on_segments:
+                on_segments(chunk_segments, covered)
+            language = language or result.get("language")
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": language,
+        }
+
+    @staticmethod
+    def _chunks(pcm: np.ndarray) -> List[Chunk]:
+        return find_chunks(
+            pcm,
+            chunk_seconds=settings.LONG_AUDIO_CHUNK_SECONDS,
+            overlap_seconds=settings.LONG_AUDIO_CHUNK_OVERLAP_SECONDS,
+            search_seconds=settings.LONG_AUDIO_SILENCE_SEARCH_SECONDS,
+        )
+
+
+def _stitched(
+    chunks: List[Chunk], results: Iterable[dict]
+) -> Iterator[Tuple[List[Dict], float, dict]]:
+    for chunk, result in zip(chunks, results):
+        yield stitch_chunk(result, chunk), chunk.keep_end / SAMPLE_RATE, result
+
+
+def _wait_for_result(path: Path) -> dict:
+    """A chunk's Whisper result, once its worker has written it."""
+    # Chunks run in parallel, so after the first the next is usually done
+    deadline = time.monotonic() + settings.LONG_AUDIO_CHUNK_TIMEOUT_SECONDS
+    while not path.exists():
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Timed out waiting for chunk {path.name}")
+        time.sleep(RESULT_POLL_SECONDS)
+    payload = json.loads(path.read_text())
+    path.unlink()
+    if "error" in payload:
+        raise RuntimeError(f"Chunk {path.name} failed: {payload['error']}")
+    return payload["result"]
@@ -0,0 +1,102 @@
+# app/services/clip_cache.py
+import os
+import subprocess
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.config import settings
+from core.logging import logger
+from services.pcm_cache import SAMPLE_RATE, pcm_cache
+from utils.disk_cache import KeyedLocks, prune_lru, touch
+
+# Encoder arguments per clip format, for 16 kHz mono input
+CLIP_FORMATS: Dict[str, list] = {
+    "mp3": ["-c:a", "libmp3lame", "-b:a", "64k", "-f", "mp3"],
+    "opus": ["-c:a", "libopus", "-b:a", "24k", "-application", "voip", "-f", "ogg"],
+    "wav": ["-c:a", "pcm_s16le", "-f", "wav"],
+}
+CLIP_MEDIA_TYPES = {"mp3": "audio/mpeg", "opus": "audio/ogg", "wav": "audio/wav"}
+
+
+class ClipCache:
+    """Encode-once store of audio clips.
+
+    Responsibilities:
+    - Cut clips sample-accurately from the decoded PCM of an upload
+    - Encode each (content, start, end, format) exactly once, via ffmpeg
+    - Keep encoded clips on disk under a size budget, least recently
+      played evicted first
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or settings.CLIP_CACHE_DIR)
+        self.max_bytes = max_bytes or settings.CLIP_CACHE_MAX_BYTES
+        self._locks = KeyedLocks()
+
+    @staticmethod
+    def sample_range(start: float, end: float) -> tuple:
+        """Clip bounds in samples; the cache key, so equal cuts share a file."""
+        return round(start * SAMPLE_RATE), round(end * SAMPLE_RATE)
+
+    def path_for(self, key: str, start: float, end: float, audio_format: str) -> Path:
+        first, last = self.sample_range(start, end)
+        return self.cache_dir / f"{key}-{first}-{last}.{audio_format}"
+
+    def get(self, audio, start: float, end: float, audio_format: str) -> Path:
+        """
+        Return the encoded clip, rendering it on a miss. Blocking.
+
+        Args:
+            audio: Audio row the clip is cut from
+            start (float): Clip start in seconds
+            end (float): Clip end in seconds
+            audio_format (str): One of CLIP_FORMATS
+        """
+        # Keyed by content so identical uploads share clips
+        key = audio.content_hash or f"audio{audio.id}"
+        path = self.path_for(key, start, end, audio_format)
+        with self._locks.hold(path):
+            if path.exists():
+                touch(path)
+                return path
+            self._render(audio, start, end, audio_format, path)
+        prune_lru(self.cache_dir, self.max_bytes, "*-*-*.*", keep=path)
+        return path
+
+    def _render(self, audio, start: float, end: float, audio_format: str, path: Path) -> None:
+        pcm = pcm_cache.load(audio.id, audio.file_path)
+        first, last = self.sample_range(start, end)
+        samples = pcm[max(0, first):min(len(pcm), last)]
+        if not len(samples):
+            raise ValueError("Clip is outside the recording")
+
+        # Render outside the pruned directory so pruning never sees it
+        tmp_dir = self.cache_dir / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / f"{uuid.uuid4().hex}.{audio_format}"
+        cmd = [
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-f", "f32le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "pipe:0",
+            *CLIP_FORMATS[audio_format],
+            "-y", str(tmp_path),
+        ]
+        logger.info(f"Rendering clip {path.name} ({len(samples) / SAMPLE_RATE:.1f}s)")
+        try:
+            # The slice is a view on the memory-mapped cache; it is piped
+            # to ffmpeg as raw bytes without an intermediate copy
+            data = memoryview(np.ascontiguousarray(samples)).cast("B")
+            subprocess.run(cmd, input=data, check=True, capture_output=True)
+            os.replace(tmp_path, path)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(
+                f"Failed to encode clip: {e.stderr.decode(errors='ignore')}"
+            ) from e
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+
+clip_cache = ClipCache()
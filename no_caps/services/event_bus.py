@@ -0,0 +1,185 @@
+# app/services/event_bus.py
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from core.config import settings
+from core.logging import logger
+
+TERMINAL_STATUSES = {"completed", "failed"}
+# Logs of jobs that died without a terminal status are dropped after this
+ABANDONED_LOG_SECONDS = 24 * 3600
+# Status events are small; a longer last line is never one
+_TAIL_BYTES = 64 * 1024
+
+
+def _channel_path(transcription_id: int) -> Path:
+    return Path(settings.EVENTS_DIR) / f"transcription-{transcription_id}.jsonl"
+
+
+def reset_transcription_events(transcription_id: int) -> None:
+    """Start a fresh event log for a (re)started job."""
+    try:
+        _channel_path(transcription_id).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def publish_transcription_event(
+    transcription_id: int, event: str, data: Dict[str, Any]
+) -> None:
+    """
+    Publish an event for a transcription from any process.
+
+    Events are appended as JSON lines to a per-transcription log, which is
+    the local stand-in for a cross-process broker: API processes tail it
+    and fan each line out to their own subscribers. A single O_APPEND write
+    per event keeps concurrent writers from interleaving.
+    """
+    path = _channel_path(transcription_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps({"event": event, "data": data}, default=str) + "\n"
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+
+def expire_event_logs(max_age: Optional[float] = None) -> int:
+    """
+    Delete event logs nobody needs any more. Blocking.
+
+    A log whose last event is a terminal status is removed once it has
+    been quiet for max_age (EVENTS_LOG_TTL_SECONDS), which leaves every
+    API process's relay time to deliver it; by then SSE clients get the
+    final state from the snapshot instead. Logs quiet for a day are
+    removed whatever they end with.
+
+    Returns:
+        int: Number of logs deleted
+    """
+    max_age = max_age if max_age is not None else settings.EVENTS_LOG_TTL_SECONDS
+    now = time.time()
+    removed = 0
+    for path in Path(settings.EVENTS_DIR).glob("transcription-*.jsonl"):
+        try:
+            age = now - path.stat().st_mtime
+            if age < max_age:
+                continue
+            if age < ABANDONED_LOG_SECONDS and not _ends_terminal(path):
+                continue
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            continue
+    if removed:
+        logger.info(f"Removed {removed} finished transcription event logs")
+    return removed
+
+
+def _ends_terminal(path: Path) -> bool:
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - _TAIL_BYTES))
+        lines = f.read().rstrip(b"\n").split(b"\n")
+    try:
+        message = json.loads(lines[-1])
+    except ValueError:
+        return False
+    return (
+        message.get("event") == "status"
+        and message.get("data", {}).get("status") in TERMINAL_STATUSES
+    )
+
+
+class TranscriptionEventBus:
+    """In-process pub/sub for transcription events.
+
+    Responsibilities:
+    - Hand each SSE client its own queue of events
+    - Run one relay per watched transcription, however many clients watch it
+    - Stop relaying once the last client for a transcription goes away
+    """
+
+    def __init__(self, poll_interval: Optional[float] = None):
+        self.poll_interval = poll_interval or settings.EVENTS_POLL_INTERVAL_SECONDS
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._relays: Dict[int, asyncio.Task] = {}
+
+    def subscribe(self, transcription_id: int) -> asyncio.Queue:
+        """Register a subscriber; events published from now on are delivered."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[transcription_id].add(queue)
+        if transcription_id not in self._relays:
+            self._relays[transcription_id] = asyncio.create_task(
+                self._relay(transcription_id, self._log_size(transcription_id))
+            )
+        return queue
+
+    def unsubscribe(self, transcription_id: int, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(transcription_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[transcription_id]
+            relay = self._relays.pop(transcription_id, None)
+            if relay:
+                relay.cancel()
+
+    def publish_local(self, transcription_id: int, message: Dict[str, Any]) -> None:
+        """Deliver a message to this process's subscribers only."""
+        for queue in self._subscribers.get(transcription_id, ()):
+            queue.put_nowait(message)
+
+    @staticmethod
+    def _log_size(transcription_id: int) -> int:
+        try:
+            return _channel_path(transcription_id).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    async def _relay(self, transcription_id: int, offset: int) -> None:
+        """Tail the transcription's event log and fan new lines out locally."""
+        path = _channel_path(transcription_id)
+        pending = b""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                data, new_offset = await asyncio.to_thread(_read_from, path, offset)
+            except Exception as e:
+                logger.error(f"Event relay for transcription {transcription_id}: {e}")
+                continue
+            if new_offset < offset or new_offset == len(data):
+                # Log was reset for a retry; drop any half line from before
+                pending = b""
+            offset = new_offset
+            if not data:
+                continue
+            *lines, pending = (pending + data).split(b"\n")
+            for line in lines:
+                if line:
+                    self.publish_local(transcription_id, json.loads(line))
+
+
+def _read_from(path: Path, offset: int) -> Tuple[bytes, int]:
+    """Read whatever was appended since offset; restart if the log was reset."""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return b"", 0
+    if size < offset:
+        offset = 0
+    if size == offset:
+        return b"", offset
+    with path.open("rb") as f:
+        f.seek(offset)
+        return f.read(size - offset), size
+
+
+event_bus = TranscriptionEventBus()
@@ -0,0 +1,144 @@
+# app/services/ingest_service.py
+import os
+import subprocess
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from core.config import settings
+from core.logging import logger
+from utils.file_handling import INCOMING_DIR, blob_path, commit_blob
+
+# Canonical formats (TRANSCODE_CODEC): blob extension and encoder arguments.
+# The extensions keep canonical blobs apart from an uploaded .flac or .ogg
+# with the same hash
+CANONICAL_FORMATS = {
+    "flac": (".mono.flac", ["-c:a", "flac", "-sample_fmt", "s16", "-f", "flac"]),
+    "opus": (".opus", ["-c:a", "libopus", "-application", "voip", "-f", "ogg"]),
+}
+
+
+@dataclass
+class IngestedAudio:
+    """What an upload became after ingest, and what it cost on disk."""
+    file_path: str
+    stored_size_bytes: int
+    original_size_bytes: int
+    original_file_path: Optional[str] = None
+
+
+def ingest_upload(file_path: str, content_hash: str) -> IngestedAudio:
+    """
+    Bring a freshly stored upload into its canonical stored form.
+
+    With TRANSCODE_ON_INGEST the upload is re-encoded to mono at the
+    models' sample rate, which is all Whisper and pyannote need, as FLAC
+    (lossless, the cheapest to decode) or Opus at a speech bitrate
+    (smallest); the canonical blob is keyed by the original's hash, so
+    re-uploads never transcode twice. The original is left in place for
+    the caller to drop once the canonical blob is recorded (unless
+    original_file_path says to keep it). Blocking: runs on a worker.
+
+    Args:
+        file_path (str): Blob path of the upload as received
+        content_hash (str): SHA-256 of the upload as received
+
+    Returns:
+        IngestedAudio: Path and sizes to record on the Audio row
+    """
+    original_size = os.path.getsize(file_path)
+    if not settings.TRANSCODE_ON_INGEST:
+        return IngestedAudio(
+            file_path=file_path,
+            stored_size_bytes=original_size,
+            original_size_bytes=original_size,
+        )
+
+    canonical_path = blob_path(content_hash, canonical_extension())
+    if not canonical_path.exists():
+        canonical_path = _transcode(file_path, content_hash)
+
+    kept_original = file_path if settings.KEEP_ORIGINAL_UPLOAD else None
+    stored_size = canonical_path.stat().st_size
+    logger.info(
+        f"Ingested {file_path}: {original_size} -> {stored_size} bytes "
+        f"({stored_size / original_size:.1%})"
+    )
+    return IngestedAudio(
+        file_path=str(canonical_path),
+        stored_size_bytes=stored_size,
+        original_size_bytes=original_size,
+        original_file_path=kept_original,
+    )
+
+
+def as_received(stored) -> IngestedAudio:
+    """An upload recorded as it arrived, before any worker ingests it."""
+    return IngestedAudio(
+        file_path=stored.file_path,
+        stored_size_bytes=stored.size,
+        original_size_bytes=stored.size,
+    )
+
+
+def reuse_ingested(existing, stored) -> IngestedAudio:
+    """
+    Point a re-upload at the stored file of an earlier identical one.
+
+    The earlier row may hold a transcoded blob whose original was dropped;
+    the re-upload brought that original back, so drop it again unless it
+    is a file some row still refers to.
+    """
+    kept_original = existing.original_file_path
+    if stored.file_path not in {existing.file_path, existing.original_file_path}:
+        if settings.KEEP_ORIGINAL_UPLOAD:
+            kept_original = stored.file_path
+        else:
+            os.unlink(stored.file_path)
+    return IngestedAudio(
+        file_path=existing.file_path,
+        stored_size_bytes=existing.stored_size_bytes or os.path.getsize(existing.file_path),
+        original_size_bytes=stored.size,
+        original_file_path=kept_original,
+    )
+
+
+def canonical_extension(codec: Optional[str] = None) -> str:
+    return CANONICAL_FORMATS[codec or settings.TRANSCODE_CODEC][0]
+
+
+def transcode_command(
+    source_path: str, output_path: str, codec: Optional[str] = None
+) -> list:
+    """ffmpeg invocation for the canonical format."""
+    codec = codec or settings.TRANSCODE_CODEC
+    bitrate = (
+        ["-b:a", f"{settings.TRANSCODE_BITRATE_KBPS}k"] if codec == "opus" else []
+    )
+    return [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0",
+        "-i", source_path,
+        "-vn", "-map_metadata", "-1",
+        "-ac", "1", "-ar", str(settings.TRANSCODE_SAMPLE_RATE),
+        *CANONICAL_FORMATS[codec][1], *bitrate,
+        "-y", output_path,
+    ]
+
+
+def _transcode(source_path: str, content_hash: str) -> Path:
+    extension = canonical_extension()
+    tmp_path = INCOMING_DIR / f"{uuid.uuid4()}{extension}"
+    try:
+        subprocess.run(
+            transcode_command(source_path, str(tmp_path)),
+            check=True,
+            capture_output=True,
+        )
+    except subprocess.CalledProcessError as e:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise RuntimeError(
+            f"Failed to transcode audio: {e.stderr.decode(errors='ignore')}"
+        ) from e
+    return commit_blob(tmp_path, content_hash, extension)
@@ -0,0 +1,249 @@
+# app/services/live_transcription.py
+import asyncio
+import hashlib
+import threading
+import uuid
+import wave
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.config import settings
+from services.model_registry import model_registry
+from services.pcm_cache import SAMPLE_RATE
+from utils.file_handling import INCOMING_DIR, StoredUpload, commit_blob, ensure_upload_dir
+
+SUPPORTED_FORMATS = {"pcm16", "opus"}
+
+
+class LiveTranscriptionSession:
+    """Incremental Whisper decoding over a sliding window of live audio.
+
+    Responsibilities:
+    - Buffer incoming 16 kHz mono audio and record it to disk as it arrives
+    - Re-decode the uncommitted tail on every step and report a partial
+    - Commit segments once they are old enough to be stable, and slide the
+      window past them
+    - Hand back the full recording as a blob when the stream ends
+
+    step() and finish() block on inference and are meant to run in an
+    executor; feed() is cheap and is called from the event loop.
+    """
+
+    def __init__(self, model_size: Optional[str] = None, language: Optional[str] = None):
+        self.model_size = model_size or settings.LIVE_WHISPER_MODEL_SIZE
+        self.language = language
+        self.window_seconds = settings.LIVE_WINDOW_SECONDS
+        self.finalize_lag = settings.LIVE_FINALIZE_LAG_SECONDS
+
+        self._lock = threading.Lock()
+        self._chunks: List[np.ndarray] = []
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_offset = 0.0  # absolute time of _buffer[0]
+        self._undecoded_samples = 0
+        self.final_segments: List[Dict] = []
+
+        ensure_upload_dir()
+        self._recording_path = INCOMING_DIR / f"live-{uuid.uuid4()}.wav"
+        self._recording = wave.open(str(self._recording_path), "wb")
+        self._recording.setnchannels(1)
+        self._recording.setsampwidth(2)
+        self._recording.setframerate(SAMPLE_RATE)
+        self._recorded_samples = 0
+
+    @property
+    def undecoded_seconds(self) -> float:
+        """Audio received since the last decode started."""
+        return self._undecoded_samples / SAMPLE_RATE
+
+    @property
+    def duration(self) -> float:
+        return self._recorded_samples / SAMPLE_RATE
+
+    def feed(self, pcm: np.ndarray) -> None:
+        """Append float32 samples in [-1, 1]."""
+        if not len(pcm):
+            return
+        self._recording.writeframes(
+            (np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        )
+        self._recorded_samples += len(pcm)
+        with self._lock:
+            self._chunks.append(pcm)
+            self._undecoded_samples += len(pcm)
+
+    def step(self) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        Decode the current window.
+
+        Returns:
+            Tuple of (segments committed by this step, partial hypothesis
+            for the rest of the window or None)
+        """
+        buffer, offset = self._snapshot()
+        if not len(buffer):
+            return [], None
+        segments = self._decode(buffer)
+        buffer_seconds = len(buffer) / SAMPLE_RATE
+
+        horizon = buffer_seconds - self.finalize_lag
+        if buffer_seconds >= self.window_seconds:
+            # Window is full: commit all but the newest segment to move on
+            horizon = segments[-1]["start"] if len(segments) > 1 else buffer_seconds
+
+        committed = []
+        for segment in segments:
+            if segment["end"] > horizon:
+                break
+            committed.append(segment)
+        rest = segments[len(committed):]
+
+        if committed:
+            cut = committed[-1]["end"] if rest else buffer_seconds
+            self._advance(cut)
+        elif buffer_seconds >= self.window_seconds:
+            self._advance(buffer_seconds)
+
+        finals = [self._absolute(segment, offset) for segment in committed]
+        self.final_segments.extend(finals)
+        partial = None
+        if rest:
+            partial = {
+                "start": offset + rest[0]["start"],
+                "end": offset + rest[-1]["end"],
+                "text": " ".join(segment["text"].strip() for segment in rest),
+            }
+        return finals, partial
+
+    def finish(self) -> Tuple[List[Dict], StoredUpload]:
+        """Commit whatever is left and seal the recording into the blob store."""
+        buffer, offset = self._snapshot()
+        finals = []
+        if len(buffer):
+            finals = [self._absolute(s, offset) for s in self._decode(buffer)]
+            self._advance(len(buffer) / SAMPLE_RATE)
+        self.final_segments.extend(finals)
+        return finals, self._seal_recording()
+
+    def discard(self) -> None:
+        """Drop the recording of an aborted session."""
+        self._recording.close()
+        if self._recording_path.exists():
+            self._recording_path.unlink()
+
+    def _snapshot(self) -> Tuple[np.ndarray, float]:
+        with self._lock:
+            if self._chunks:
+                self._buffer = np.concatenate([self._buffer, *self._chunks])
+                self._chunks = []
+            self._undecoded_samples = 0
+            return self._buffer, self._buffer_offset
+
+    def _advance(self, seconds: float) -> None:
+        samples = min(int(seconds * SAMPLE_RATE), len(self._buffer))
+        with self._lock:
+            self._buffer = self._buffer[samples:]
+            self._buffer_offset += samples / SAMPLE_RATE
+
+    def _decode(self, buffer: np.ndarray) -> List[Dict]:
+        model = model_registry.get_whisper(self.model_size)
+        result = model.transcribe(
+            buffer,
+            language=self.language,
+            initial_prompt=self._prompt(),
+            condition_on_previous_text=False,
+            fp16=False,
+        )
+        return [s for s in result["segments"] if s["text"].strip()]
+
+    def _prompt(self) -> Optional[str]:
+        """Tail of the committed text, to keep wording consistent across cuts."""
+        if not self.final_segments:
+            return None
+        return " ".join(s["text"] for s in self.final_segments[-3:])[-200:]
+
+    @staticmethod
+    def _absolute(segment: Dict, offset: float) -> Dict:
+        return {
+            "speaker": None,
+            "start_time": offset + segment["start"],
+            "end_time": offset + segment["end"],
+            "text": segment["text"].strip(),
+        }
+
+    def _seal_recording(self) -> StoredUpload:
+        self._recording.close()
+        digest = hashlib.sha256()
+        with self._recording_path.open("rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        size = self._recording_path.stat().st_size
+        content_hash = digest.hexdigest()
+        file_path = commit_blob(self._recording_path, content_hash, ".wav")
+        return StoredUpload(file_path=str(file_path), content_hash=content_hash, size=size)
+
+
+class PCM16Decoder:
+    """Raw little-endian 16-bit mono frames at 16 kHz."""
+
+    def __init__(self):
+        self._carry = b""
+
+    async def decode(self, frame: bytes) -> np.ndarray:
+        data = self._carry + frame
+        usable = len(data) - len(data) % 2
+        self._carry = data[usable:]
+        return np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+
+    async def close(self) -> np.ndarray:
+        return np.zeros(0, dtype=np.float32)
+
+
+class OpusDecoder:
+    """Ogg/Opus stream decoded by a long-lived ffmpeg subprocess."""
+
+    def __init__(self):
+        self._process = None
+        self._decoded: List[bytes] = []
+        self._reader: Optional[asyncio.Task] = None
+
+    async def _start(self) -> None:
+        self._process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-f", "ogg", "-i", "pipe:0",
+            "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while chunk := await self._process.stdout.read(64 * 1024):
+            self._decoded.append(chunk)
+
+    def _drain(self) -> np.ndarray:
+        data = b"".join(self._decoded)
+        usable = len(data) - len(data) % 4
+        self._decoded = [data[usable:]] if usable < len(data) else []
+        return np.frombuffer(data[:usable], dtype="<f4").copy()
+
+    async def decode(self, frame: bytes) -> np.ndarray:
+        if self._process is None:
+            await self._start()
+        self._process.stdin.write(frame)
+        await self._process.stdin.drain()
+        return self._drain()
+
+    async def close(self) -> np.ndarray:
+        if self._process is None:
+            return np.zeros(0, dtype=np.float32)
+        self._process.stdin.close()
+        await self._reader
+        await self._process.wait()
+        return self._drain()
+
+
+def make_decoder(audio_format: str):
+    if audio_format == "opus":
+        return OpusDecoder()
+    return PCM16Decoder()
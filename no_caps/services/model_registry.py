@@ -0,0 +1,140 @@
+# app/services/model_registry.py
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from core.config import settings
+from core.logging import logger
+from services.pcm_cache import SAMPLE_RATE, pipeline_input
+
+
+class ModelNotFoundError(RuntimeError):
+    """Raised when a model artifact is missing from the local artifact dir."""
+
+
+class ModelRegistry:
+    """Process-wide, lazily populated cache of inference models.
+
+    Responsibilities:
+    - Load Whisper and pyannote models from the local artifact directory only
+    - Share loaded models between all jobs in the process
+    - Keep several Whisper sizes resident under an LRU memory budget
+    - Warm models up with a synthetic inference before reporting ready
+
+    Nothing is loaded at construction time, so importing the API never pays
+    for models it will not use.
+    """
+
+    def __init__(
+        self,
+        artifact_dir: Optional[str] = None,
+        memory_budget_mb: Optional[int] = None,
+    ):
+        self.artifact_dir = artifact_dir or settings.MODEL_ARTIFACT_DIR
+        self.memory_budget_bytes = (
+            memory_budget_mb or settings.MODEL_MEMORY_BUDGET_MB
+        ) * 1024 * 1024
+        self._whisper_models: "OrderedDict[str, object]" = OrderedDict()
+        self._whisper_sizes: dict = {}
+        self._diarization_pipeline = None
+        self._lock = threading.RLock()
+        self._ready = False
+
+    @property
+    def ready(self) -> bool:
+        """True once warmup() has completed successfully."""
+        return self._ready
+
+    @property
+    def resident_bytes(self) -> int:
+        """Approximate memory held by the resident Whisper models."""
+        return sum(self._whisper_sizes.values())
+
+    def get_whisper(self, size: Optional[str] = None):
+        """Return the Whisper model for `size`, loading it on first use."""
+        size = size or settings.WHISPER_MODEL_SIZE
+        with self._lock:
+            model = self._whisper_models.get(size)
+            if model is not None:
+                self._whisper_models.move_to_end(size)
+                return model
+
+            model = self._load_whisper(size)
+            self._whisper_models[size] = model
+            self._whisper_sizes[size] = self._model_bytes(model)
+            self._evict(keep=size)
+            return model
+
+    def whisper_bytes(self, size: Optional[str] = None) -> int:
+        """Approximate memory of one copy of a Whisper model, loading it."""
+        size = size or settings.WHISPER_MODEL_SIZE
+        with self._lock:
+            self.get_whisper(size)
+            return self._whisper_sizes.get(size, 0)
+
+    def get_diarization_pipeline(self):
+        """Return the shared pyannote pipeline, loading it on first use."""
+        with self._lock:
+            if self._diarization_pipeline is None:
+                self._diarization_pipeline = self._load_diarization()
+            return self._diarization_pipeline
+
+    def warmup(self, sizes: Optional[list] = None) -> None:
+        """Load and exercise models once so the first real job runs hot."""
+        audio = self._synthetic_audio(seconds=2)
+        for size in sizes or [settings.WHISPER_MODEL_SIZE]:
+            self.get_whisper(size).transcribe(audio, fp16=False)
+        self.get_diarization_pipeline()(pipeline_input(audio))
+        self._ready = True
+        logger.info(
+            f"Model registry ready: whisper={list(self._whisper_models)} "
+            f"resident={self.resident_bytes / 1024 ** 2:.0f}MB"
+        )
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used Whisper models until within budget."""
+        for size in list(self._whisper_models):
+            if self.resident_bytes <= self.memory_budget_bytes:
+                break
+            if size == keep:
+                continue
+            del self._whisper_models[size]
+            self._whisper_sizes.pop(size, None)
+            logger.info(f"Evicted whisper model '{size}' from registry")
+
+    def _load_whisper(self, size: str):
+        import whisper
+
+        checkpoint = os.path.join(self.artifact_dir, "whisper", f"{size}.pt")
+        if not os.path.exists(checkpoint):
+            raise ModelNotFoundError(f"Whisper checkpoint {checkpoint} not found")
+        logger.info(f"Loading whisper model from {checkpoint}")
+        # Passing a path (not a name) keeps whisper from hitting the network
+        return whisper.load_model(checkpoint, device="cpu")
+
+    def _load_diarization(self):
+        from pyannote.audio import Pipeline
+
+        config = os.path.join(self.artifact_dir, "pyannote", "config.yaml")
+        if not os.path.exists(config):
+            raise ModelNotFoundError(f"pyannote config {config} not found")
+        logger.info(f"Loading diarization pipeline from {config}")
+        return Pipeline.from_pretrained(config)
+
+    @staticmethod
+    def _model_bytes(model) -> int:
+        try:
+            return sum(p.numel() * p.element_size() for p in model.parameters())
+        except AttributeError:
+            return 0
+
+    @staticmethod
+    def _synthetic_audio(seconds: int) -> np.ndarray:
+        t = np.arange(seconds * SAMPLE_RATE, dtype=np.float32) / SAMPLE_RATE
+        return (0.1 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,101 @@
+# app/services/pcm_cache.py
+import os
+import subprocess
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from core.config import settings
+from core.logging import logger
+from services.storage_service import get_storage
+from utils.disk_cache import prune_lru, touch
+
+# Whisper and pyannote both consume 16 kHz mono float32
+SAMPLE_RATE = 16000
+PCM_DTYPE = np.float32
+
+
+class PCMCache:
+    """Decode-once store of model-ready audio.
+
+    Responsibilities:
+    - Decode each upload to 16 kHz mono float32 exactly once, via ffmpeg
+    - Keep the result on disk keyed by audio id, under a size budget
+    - Hand out memory-mapped arrays so every consumer reads the same pages
+
+    Arrays are opened copy-on-write: torch can wrap them without a copy,
+    and nothing a model does in place ever reaches the cached file.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or settings.PCM_CACHE_DIR)
+        self.max_bytes = max_bytes or settings.PCM_CACHE_MAX_BYTES
+
+    def path_for(self, audio_id: int) -> Path:
+        return self.cache_dir / f"{audio_id}.f32"
+
+    def load(self, audio_id: int, source_path: str) -> np.ndarray:
+        """
+        Return the decoded signal for an audio file, decoding on a miss.
+
+        source_path is the stored file_path; hosts without the uploads
+        volume read it through the storage backend, so every consumer of
+        decoded audio (jobs, peaks, clips, renditions) works anywhere.
+        """
+        path = self.path_for(audio_id)
+        if path.exists():
+            touch(path)
+        else:
+            self._decode(str(get_storage().local_path(source_path)), path)
+            prune_lru(self.cache_dir, self.max_bytes, "*.f32", keep=path)
+
+        if path.stat().st_size == 0:
+            return np.zeros(0, dtype=PCM_DTYPE)
+        return np.memmap(path, dtype=PCM_DTYPE, mode="c")
+
+    def evict(self, audio_id: int) -> None:
+        try:
+            self.path_for(audio_id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _decode(self, source_path: str, path: Path) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Decode to a private temp name and rename into place, so concurrent
+        # workers never read a half-written file
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        cmd = [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0",
+            "-i", source_path,
+            "-f", "f32le", "-acodec", "pcm_f32le",
+            "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "-y", str(tmp_path),
+        ]
+        logger.info(f"Decoding {source_path} to {path}")
+        try:
+            subprocess.run(cmd, check=True, capture_output=True)
+            os.replace(tmp_path, path)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(
+                f"Failed to decode audio: {e.stderr.decode(errors='ignore')}"
+            ) from e
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+
+def duration_of(pcm: np.ndarray) -> float:
+    """Length of a decoded signal in seconds."""
+    return len(pcm) / SAMPLE_RATE
+
+
+def pipeline_input(pcm: np.ndarray) -> dict:
+    """Wrap decoded audio for pyannote without copying it."""
+    import torch
+
+    return {"waveform": torch.from_numpy(pcm).unsqueeze(0), "sample_rate": SAMPLE_RATE}
+
+
+pcm_cache = PCMCache()
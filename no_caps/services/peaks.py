@@ -0,0 +1,152 @@
+# app/services/peaks.py
+import os
+import struct
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from core.logging import logger
+from services.pcm_cache import SAMPLE_RATE, pcm_cache
+from utils.disk_cache import KeyedLocks
+
+# Finest level: one min/max pair per 256 samples (16 ms at 16 kHz); each
+# further level halves the resolution
+BASE_SAMPLES_PER_PEAK = 256
+PEAK_LEVELS = 10
+
+PEAKS_MAGIC = b"PEAK"
+PEAKS_VERSION = 1
+# magic, version, levels, sample rate
+_HEADER = struct.Struct("<4sBBI")
+# samples per peak, number of peaks, byte offset of the level's data
+_LEVEL = struct.Struct("<IIQ")
+# Peaks files being computed in this process
+_locks = KeyedLocks()
+
+
+@dataclass
+class PeakLevel:
+    samples_per_peak: int
+    length: int
+    offset: int
+
+
+def peaks_path_for(file_path: str) -> Path:
+    """Peaks live next to the audio they describe."""
+    return Path(f"{file_path}.peaks")
+
+
+def compute_peaks(
+    pcm: np.ndarray,
+    base_samples_per_peak: int = BASE_SAMPLES_PER_PEAK,
+    levels: int = PEAK_LEVELS,
+) -> List[np.ndarray]:
+    """
+    Multi-resolution min/max peaks as int8 arrays of shape (n, 2).
+
+    Level 0 reduces the signal through a reshaped view; every coarser level
+    reduces the one before it pairwise, so only level 0 touches the signal.
+    """
+    if not len(pcm):
+        return [np.zeros((0, 2), dtype=np.int8)]
+    # Whole frames are a reshaped view of the (memory-mapped) signal; only
+    # the partial last frame is reduced separately
+    whole = len(pcm) // base_samples_per_peak
+    frames = np.asarray(pcm[:whole * base_samples_per_peak]).reshape(whole, base_samples_per_peak)
+    current = np.stack([frames.min(axis=1), frames.max(axis=1)], axis=1)
+    tail = pcm[whole * base_samples_per_peak:]
+    if len(tail):
+        current = np.concatenate([current, [[tail.min(), tail.max()]]])
+
+    result = [current]
+    for _ in range(1, levels):
+        if len(current) <= 1:
+            break
+        if len(current) % 2:
+            current = np.concatenate([current, current[-1:]])
+        pairs = current.reshape(-1, 2, 2)
+        current = np.stack(
+            [pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)], axis=1
+        )
+        result.append(current)
+    return [_quantize(level) for level in result]
+
+
+def _quantize(peaks: np.ndarray) -> np.ndarray:
+    return np.clip(np.round(peaks * 127), -127, 127).astype(np.int8)
+
+
+def write_peaks(path: Path, levels: List[np.ndarray], base_samples_per_peak: int) -> None:
+    """Write all levels to one file: header, level table, then data."""
+    offset = _HEADER.size + _LEVEL.size * len(levels)
+    table = []
+    for index, level in enumerate(levels):
+        table.append(_LEVEL.pack(base_samples_per_peak << index, len(level), offset))
+        offset += level.nbytes
+
+    # Worker hosts without the uploads volume have no directory for it yet
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    with tmp_path.open("wb") as f:
+        f.write(_HEADER.pack(PEAKS_MAGIC, PEAKS_VERSION, len(levels), SAMPLE_RATE))
+        f.write(b"".join(table))
+        for level in levels:
+            f.write(level.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_peak_levels(path: Path) -> List[PeakLevel]:
+    with path.open("rb") as f:
+        magic, version, count, _ = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != PEAKS_MAGIC or version != PEAKS_VERSION:
+            raise ValueError(f"Not a peaks file: {path}")
+        return [
+            PeakLevel(*_LEVEL.unpack(f.read(_LEVEL.size))) for _ in range(count)
+        ]
+
+
+def read_peaks(path: Path, level: PeakLevel) -> bytes:
+    """Interleaved int8 min,max pairs for one level."""
+    with path.open("rb") as f:
+        return os.pread(f.fileno(), level.length * 2, level.offset)
+
+
+def pick_level(
+    levels: List[PeakLevel], level: Optional[int] = None, width: Optional[int] = None
+) -> PeakLevel:
+    """
+    Choose a zoom level by index, or the coarsest that still has at least
+    width peaks (one per pixel), or the finest if none is asked for.
+    """
+    if level is not None:
+        return levels[min(level, len(levels) - 1)]
+    if width is not None:
+        for candidate in reversed(levels):
+            if candidate.length >= width:
+                return candidate
+    return levels[0]
+
+
+def ensure_peaks(audio_id: int, file_path: str) -> Path:
+    """Compute and store peaks for an upload unless they already exist.
+
+    Concurrent first views of one upload wait for a single computation
+    instead of each decoding the audio.
+    """
+    path = peaks_path_for(file_path)
+    if path.exists():
+        return path
+    with _locks.hold(path):
+        if path.exists():
+            return path
+        pcm = pcm_cache.load(audio_id, file_path)
+        levels = compute_peaks(pcm)
+        write_peaks(path, levels, BASE_SAMPLES_PER_PEAK)
+    logger.info(
+        f"Stored {len(levels)} peak levels for audio {audio_id} "
+        f"({path.stat().st_size} bytes)"
+    )
+    return path
@@ -0,0 +1,221 @@
+# app/services/renditions.py
+import bisect
+import os
+import re
+import shutil
+import subprocess
+import uuid
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from core.config import settings
+from core.logging import logger
+from services.pcm_cache import SAMPLE_RATE, duration_of, pcm_cache
+from utils.disk_cache import KeyedLocks
+
+PLAYLIST_NAME = "index.m3u8"
+SEGMENT_PATTERN = "seg_%05d.ts"
+SEGMENT_NAME = re.compile(r"seg_\d{5}\.ts")
+# {file_path}.hls/current names the published build, {file_path}.hls/v<hex>/
+CURRENT_NAME = "current"
+VERSION_NAME = re.compile(r"v[0-9a-f]{32}")
+# Present in builds whose cuts could follow speaker turns
+TURNS_MARKER = "cut_on_turns"
+
+# Renditions being built in this process
+_locks = KeyedLocks()
+
+
+def rendition_dir_for(file_path: str) -> Path:
+    """Renditions live next to the audio they were cut from."""
+    return Path(f"{file_path}.hls")
+
+
+def plan_cuts(
+    duration: float,
+    turn_starts: Sequence[float],
+    segment_seconds: float,
+    snap_seconds: float,
+) -> List[float]:
+    """
+    Segment boundaries every segment_seconds, each moved to the nearest
+    speaker change within snap_seconds, so a seek to a turn lands on a
+    segment start. Segments never shrink below half the nominal length.
+
+    Args:
+        duration (float): Length of the recording
+        turn_starts (Sequence[float]): Sorted speaker-turn start times
+        segment_seconds (float): Nominal segment length
+        snap_seconds (float): How far a cut may move to meet a turn
+
+    Returns:
+        List[float]: Cut times, strictly increasing, excluding 0 and the end
+    """
+    cuts: List[float] = []
+    previous = 0.0
+    while previous + segment_seconds < duration:
+        target = previous + segment_seconds
+        lo = max(target - snap_seconds, previous + segment_seconds / 2)
+        hi = target + snap_seconds
+        i = bisect.bisect_left(turn_starts, lo)
+        j = bisect.bisect_right(turn_starts, hi)
+        candidates = [t for t in turn_starts[i:j] if t < duration]
+        cut = min(candidates, key=lambda t: abs(t - target)) if candidates else target
+        if duration - cut < segment_seconds / 2:
+            break  # fold a short tail into the last segment
+        cuts.append(round(cut, 3))
+        previous = cut
+    return cuts
+
+
+def current_rendition(file_path: str) -> Optional[Path]:
+    """The published build of an upload's rendition, if there is one."""
+    root = rendition_dir_for(file_path)
+    try:
+        version = (root / CURRENT_NAME).read_text().strip()
+    except FileNotFoundError:
+        return None
+    build = root / version
+    return build if VERSION_NAME.fullmatch(version) and build.is_dir() else None
+
+
+def ensure_rendition(
+    audio_id: int,
+    file_path: str,
+    segments: Optional[List[dict]] = None,
+    rebuild: bool = False,
+) -> Path:
+    """
+    Build the HLS rendition for an upload unless it already exists. Blocking.
+
+    Each build is a directory of its own, published by atomically
+    replacing a pointer file, so a rebuild never takes the playlist away
+    or renumbers segments under a client that is still playing the last
+    one. A build cut before the transcript existed is redone once speaker
+    turns are known. Concurrent first plays of one upload wait for a
+    single build.
+
+    Args:
+        audio_id (int): Audio row id, for the PCM cache
+        file_path (str): Stored audio file
+        segments (List[dict]): Transcript segments whose speaker changes
+            the cuts should follow, if a transcript exists
+        rebuild (bool): Replace an existing rendition regardless
+
+    Returns:
+        Path: Directory of the published build, holding the playlist and
+        its segments
+    """
+    turn_starts = _turn_starts(segments or [])
+    current = current_rendition(file_path)
+    if _is_usable(current, turn_starts, rebuild):
+        return current
+
+    root = rendition_dir_for(file_path)
+    with _locks.hold(root):
+        # Whoever held the lock before us may have just built it
+        current = current_rendition(file_path)
+        if _is_usable(current, turn_starts, rebuild):
+            return current
+        return _build(audio_id, file_path, root, turn_starts)
+
+
+def _is_usable(
+    current: Optional[Path], turn_starts: List[float], rebuild: bool
+) -> bool:
+    if current is None or rebuild:
+        return False
+    return not turn_starts or (current / TURNS_MARKER).exists()
+
+
+def _build(
+    audio_id: int, file_path: str, root: Path, turn_starts: List[float]
+) -> Path:
+    pcm = pcm_cache.load(audio_id, file_path)
+    cuts = plan_cuts(
+        duration_of(pcm),
+        turn_starts,
+        settings.HLS_SEGMENT_SECONDS,
+        settings.HLS_SNAP_SECONDS,
+    )
+
+    version = f"v{uuid.uuid4().hex}"
+    # Hidden until complete; pruning only ever removes published builds
+    tmp_dir = root / f".{version}"
+    tmp_dir.mkdir(parents=True)
+    try:
+        _segment(str(pcm_cache.path_for(audio_id)), cuts, tmp_dir, version)
+        if turn_starts:
+            (tmp_dir / TURNS_MARKER).touch()
+        os.rename(tmp_dir, root / version)
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    _publish(root, version)
+    logger.info(
+        f"Built HLS rendition {version} for audio {audio_id}: "
+        f"{len(cuts) + 1} segments"
+    )
+    return root / version
+
+
+def _publish(root: Path, version: str) -> None:
+    """Point readers at a finished build, then drop superseded ones.
+
+    The build just replaced is kept for clients that loaded its playlist
+    before the switch; anything older has no readers left.
+    """
+    previous = None
+    try:
+        previous = (root / CURRENT_NAME).read_text().strip()
+    except FileNotFoundError:
+        pass
+    pointer = root / f".{CURRENT_NAME}.{uuid.uuid4().hex}"
+    pointer.write_text(version)
+    os.replace(pointer, root / CURRENT_NAME)
+    for child in root.iterdir():
+        if (
+            VERSION_NAME.fullmatch(child.name)
+            and child.name not in (version, previous)
+        ):
+            shutil.rmtree(child, ignore_errors=True)
+
+
+def _turn_starts(segments: List[dict]) -> List[float]:
+    """Times where the speaker changes."""
+    starts = []
+    speaker = None
+    for segment in segments:
+        if segment.get("speaker") != speaker:
+            starts.append(segment["start_time"])
+            speaker = segment.get("speaker")
+    return sorted(starts)
+
+
+def _segment(pcm_path: str, cuts: List[float], out_dir: Path, version: str) -> None:
+    """Encode the cached PCM once, cutting it into segments as it goes.
+
+    Playlist entries are prefixed with the build's version, so the one
+    playlist URL resolves to that build's segments.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-f", "f32le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", pcm_path,
+        "-c:a", "aac", "-b:a", f"{settings.HLS_BITRATE_KBPS}k",
+        "-f", "segment",
+        "-segment_format", "mpegts",
+        "-segment_list", str(out_dir / PLAYLIST_NAME),
+        "-segment_list_type", "m3u8",
+        "-segment_list_entry_prefix", f"{version}/",
+    ]
+    if cuts:
+        cmd += ["-segment_times", ",".join(f"{cut:.3f}" for cut in cuts)]
+    else:
+        cmd += ["-segment_time", "86400"]  # one segment for very short audio
+    cmd.append(str(out_dir / SEGMENT_PATTERN))
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(
+            f"Failed to build rendition: {e.stderr.decode(errors='ignore')}"
+        ) from e
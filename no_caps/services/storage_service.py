@@ -1,26 +1,197 @@
-# this may not be needed, if files are kept on the client device
-# altho if u want data persistance, let's say device failure...hmm
 # app/services/storage_service.py
-import boto3
+import hashlib
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Optional
+
 from core.config import settings
+from core.logging import logger
+from utils.disk_cache import KeyedLocks, prune_lru, touch
+from utils.file_handling import UPLOAD_DIR
+
+
+class StorageBackend(ABC):
+    """Where stored audio lives beyond the host that received it.
+
+    Files are always written under UPLOAD_DIR first; a backend makes them
+    durable (store) and makes them readable on any host (local_path).
+    Keys are paths relative to UPLOAD_DIR, e.g. blobs/ab/ab12....opus.
+    """
+
+    @staticmethod
+    def key_for(file_path: str) -> str:
+        return Path(file_path).resolve().relative_to(UPLOAD_DIR.resolve()).as_posix()
+
+    @abstractmethod
+    def store(self, file_path: str) -> None:
+        """Persist a file written under UPLOAD_DIR. Blocking."""
+
+    @abstractmethod
+    def local_path(self, file_path: str) -> Path:
+        """A readable local copy of a stored file. Blocking."""
+
+    @abstractmethod
+    def delete(self, file_path: str) -> None:
+        """Remove a stored file from the backend."""
+
+
+class LocalStorage(StorageBackend):
+    """UPLOAD_DIR is the store: a shared volume, or a single host."""
+
+    def store(self, file_path: str) -> None:
+        pass
+
+    def local_path(self, file_path: str) -> Path:
+        return Path(file_path)
+
+    def delete(self, file_path: str) -> None:
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+
+
+class ReadThroughCache:
+    """Size-bounded local copies of remote objects, least recently used out.
+
+    Each key is fetched at most once at a time per process; concurrent
+    readers of a missing key wait for the one download.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._locks = KeyedLocks()
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / f"{digest}{Path(key).suffix}"
+
+    def get(self, key: str, fetch: Callable[[str], None]) -> Path:
+        """
+        Return the cached copy of key, calling fetch(destination) on a miss.
+        """
+        path = self.path_for(key)
+        with self._locks.hold(key):
+            if path.exists():
+                self.hits += 1
+                touch(path)
+                return path
+            self.misses += 1
+            tmp_dir = self.cache_dir / "tmp"
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = tmp_dir / f"{uuid.uuid4().hex}{path.suffix}"
+            try:
+                fetch(str(tmp_path))
+                os.replace(tmp_path, path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+        prune_lru(self.cache_dir, self.max_bytes, "*.*", keep=path)
+        return path
+
+    def evict(self, key: str) -> None:
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class S3Storage(StorageBackend):
+    """S3 or any S3-compatible service (MinIO locally, via endpoint_url).
+
+    Transfers above the multipart threshold are split into parts moved in
+    parallel by boto3's transfer manager. Reads on hosts without the file
+    go through a local read-through cache, so hot objects are downloaded
+    once per worker host.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        client=None,
+        cache: Optional[ReadThroughCache] = None,
+    ):
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.client = client or _make_s3_client()
+        self.cache = cache or ReadThroughCache(
+            settings.STORAGE_CACHE_DIR, settings.STORAGE_CACHE_MAX_BYTES
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * 1024 * 1024,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_MB * 1024 * 1024,
+            max_concurrency=settings.S3_MAX_CONCURRENCY,
+            use_threads=True,
+        )
+
+    def store(self, file_path: str) -> None:
+        key = self.key_for(file_path)
+        try:
+            self.client.upload_file(
+                file_path, self.bucket, key, Config=self.transfer_config
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to upload {key} to S3: {str(e)}") from e
+        logger.info(f"Stored s3://{self.bucket}/{key}")
+
+    def local_path(self, file_path: str) -> Path:
+        # The host that received the upload still has it
+        if os.path.exists(file_path):
+            return Path(file_path)
+        key = self.key_for(file_path)
+
+        def fetch(destination: str) -> None:
+            try:
+                self.client.download_file(
+                    self.bucket, key, destination, Config=self.transfer_config
+                )
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to download {key} from S3: {str(e)}"
+                ) from e
+
+        return self.cache.get(key, fetch)
+
+    def delete(self, file_path: str) -> None:
+        key = self.key_for(file_path)
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        self.cache.evict(key)
+
+
+def _make_s3_client():
+    import boto3
 
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY,
-    aws_secret_access_key=settings.AWS_SECRET_KEY
-)
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.S3_ENDPOINT_URL or None,
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+    )
 
 
-def upload_file(file_path: str, bucket: str, object_name: str):
-    try:
-        s3_client.upload_file(file_path, bucket, object_name)
-        return f"s3://{bucket}/{object_name}"
-    except Exception as e:
-        raise Exception(f"Failed to upload file to S3: {str(e)}")
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
 
 
-def download_file(bucket: str, object_name: str, file_path: str):
-    try:
-        s3_client.download_file(bucket, object_name, file_path)
-    except Exception as e:
-        raise Exception(f"Failed to download file from S3: {str(e)}")
+def get_storage() -> StorageBackend:
+    """The configured backend, created on first use."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if settings.STORAGE_BACKEND == "s3":
+                _storage = S3Storage(settings.S3_BUCKET)
+            elif settings.STORAGE_BACKEND == "local":
+                _storage = LocalStorage()
+            else:
+                raise ValueError(
+                    f"Unknown STORAGE_BACKEND {settings.STORAGE_BACKEND!r}"
+                )
+        return _storage
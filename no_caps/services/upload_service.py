@@ -0,0 +1,227 @@
+# app/services/upload_service.py
+import hashlib
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from sqlalchemy.orm import Session
+from core.config import settings
+from core.logging import logger
+from db.crud import upload_session as upload_crud
+from db.models import User
+from db.models.upload_session import UploadSession
+from services.audio_service import register_stored_audio
+from utils.audio_processing import SNIFF_BYTES, sniff_audio_format
+from utils.file_handling import (
+    ALLOWED_AUDIO_EXTENSIONS,
+    INCOMING_DIR,
+    UPLOAD_CHUNK_SIZE,
+    StoredUpload,
+    commit_blob,
+    ensure_upload_dir,
+)
+
+
+async def create_upload(
+    db: Session, filename: str, total_bytes: int, current_user: User
+) -> UploadSession:
+    """
+    Open a resumable upload.
+
+    The target file is preallocated at its final size so that every chunk
+    can be written in place at its offset and nothing is ever re-copied.
+    """
+    extension = Path(filename).suffix.lower()
+    if extension not in ALLOWED_AUDIO_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File extension {extension} not allowed. Allowed extensions: {ALLOWED_AUDIO_EXTENSIONS}",
+        )
+    if total_bytes <= 0:
+        raise HTTPException(status_code=400, detail="Upload size must be positive")
+    if total_bytes > settings.MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds the {settings.MAX_UPLOAD_BYTES} byte limit",
+        )
+
+    await run_in_threadpool(ensure_upload_dir)
+    upload = await run_in_threadpool(
+        upload_crud.create_upload_session,
+        db,
+        filename=filename,
+        total_bytes=total_bytes,
+        tmp_path="",
+        user_id=current_user.id,
+    )
+    tmp_path = INCOMING_DIR / f"{upload.id}.part{extension}"
+    await run_in_threadpool(_preallocate, tmp_path, total_bytes)
+    upload.tmp_path = str(tmp_path)
+    await run_in_threadpool(_commit, db, upload)
+    logger.info(f"Opened upload {upload.id} for {filename} ({total_bytes} bytes)")
+    return upload
+
+
+async def write_chunk(
+    db: Session, upload: UploadSession, offset: int, stream: AsyncIterator[bytes]
+) -> UploadSession:
+    """
+    Write a chunk at its offset, streaming it straight into place.
+
+    The offset must be exactly where the previous chunk ended. If the
+    client drops mid-chunk, whatever arrived is kept and the offset moves
+    past it, so the retry only sends the remainder.
+    """
+    if offset != upload.received_bytes:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload is at offset {upload.received_bytes}, not {offset}",
+        )
+
+    position = offset
+    fd = await run_in_threadpool(os.open, upload.tmp_path, os.O_RDWR)
+    try:
+        # The content check needs the file's first bytes, which may arrive
+        # split across pieces or even across chunks
+        sniff_len = min(SNIFF_BYTES, upload.total_bytes)
+        head = None
+        if offset < sniff_len:
+            head = await run_in_threadpool(os.pread, fd, offset, 0)
+        async for piece in stream:
+            if not piece:
+                continue
+            if position + len(piece) > upload.total_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Chunk runs past the declared size of {upload.total_bytes} bytes",
+                )
+            if head is not None:
+                head += piece[:sniff_len - len(head)]
+                if len(head) == sniff_len:
+                    if sniff_audio_format(head) is None:
+                        # Nothing of a rejected chunk counts towards the upload
+                        position = offset
+                        raise _not_audio_error()
+                    head = None
+            await run_in_threadpool(_write_at, fd, piece, position)
+            position += len(piece)
+    except ClientDisconnect:
+        logger.info(f"Upload {upload.id} dropped at offset {position}")
+    finally:
+        await run_in_threadpool(os.close, fd)
+        if position > offset and not await run_in_threadpool(
+            upload_crud.advance_upload_offset, db, upload.id, offset, position
+        ):
+            raise HTTPException(
+                status_code=409, detail="Upload was advanced by another request"
+            )
+
+    await run_in_threadpool(db.refresh, upload)
+    return upload
+
+
+async def finalize_upload(
+    db: Session, upload: UploadSession, current_user: User
+):
+    """Seal a complete upload into the blob store and register its Audio row."""
+    if upload.received_bytes != upload.total_bytes:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload incomplete: {upload.received_bytes} of {upload.total_bytes} bytes received",
+        )
+
+    # Normally checked while streaming; this covers any path around it
+    head = await run_in_threadpool(_read_head, upload.tmp_path)
+    if sniff_audio_format(head) is None:
+        raise _not_audio_error()
+
+    extension = Path(upload.filename).suffix.lower()
+    content_hash = await run_in_threadpool(_hash_file, upload.tmp_path)
+    # Same filesystem as the blob store: a rename, not a copy
+    file_path = await run_in_threadpool(
+        commit_blob, Path(upload.tmp_path), content_hash, extension
+    )
+
+    audio = await register_stored_audio(
+        db,
+        upload.filename,
+        StoredUpload(
+            file_path=str(file_path),
+            content_hash=content_hash,
+            size=upload.total_bytes,
+        ),
+        current_user,
+    )
+    await run_in_threadpool(upload_crud.delete_upload_session, db, upload)
+    logger.info(f"Finalized upload {upload.id} as audio {audio.id}")
+    return audio
+
+
+async def abort_upload(db: Session, upload: UploadSession) -> None:
+    """Drop an upload and its partial file."""
+    await run_in_threadpool(_remove, upload.tmp_path)
+    await run_in_threadpool(upload_crud.delete_upload_session, db, upload)
+
+
+def expire_stale_uploads(db: Session) -> int:
+    """
+    Drop uploads nobody has written to for UPLOAD_SESSION_TTL_HOURS, with
+    their partial files. Blocking: run from the periodic worker task.
+
+    Returns:
+        int: Number of uploads dropped
+    """
+    cutoff = datetime.now() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+    stale = upload_crud.list_stale_upload_sessions(db, cutoff)
+    for upload in stale:
+        _remove(upload.tmp_path)
+        upload_crud.delete_upload_session(db, upload)
+    if stale:
+        logger.info(f"Expired {len(stale)} abandoned uploads")
+    return len(stale)
+
+
+def _not_audio_error() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail="File content is not a recognised audio format",
+    )
+
+
+def _commit(db: Session, upload: UploadSession) -> None:
+    db.commit()
+    db.refresh(upload)
+
+
+def _read_head(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(SNIFF_BYTES)
+
+
+def _preallocate(path: Path, size: int) -> None:
+    with path.open("wb") as f:
+        f.truncate(size)
+
+
+def _write_at(fd: int, data: bytes, position: int) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, position)
+        view = view[written:]
+        position += written
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remove(path: str) -> None:
+    if path and os.path.exists(path):
+        os.unlink(path)
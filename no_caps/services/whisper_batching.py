@@ -0,0 +1,233 @@
+# app/services/whisper_batching.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from core.config import settings
+from core.logging import logger
+from services.pcm_cache import SAMPLE_RATE
+
+# Whisper's encoder always sees 30 s of audio
+WINDOW_SECONDS = 30
+WINDOW_SAMPLES = WINDOW_SECONDS * SAMPLE_RATE
+TIMESTAMP_STEP = 0.02
+
+
+@dataclass
+class _BatchRequest:
+    """One job's audio, split into windows that may land in any batch."""
+    n_windows: int
+    audio_seconds: float
+    future: Future = field(default_factory=Future)
+    window_segments: Dict[int, List[Dict]] = field(default_factory=dict)
+    language: Optional[str] = None
+
+
+@dataclass
+class _Window:
+    request: _BatchRequest
+    index: int
+    features: object
+    offset: float
+    duration: float
+
+
+class WhisperBatchScheduler:
+    """Batches 30 s mel windows from concurrent jobs into shared forward passes.
+
+    Responsibilities:
+    - Accept decoded audio from any number of jobs (threads) in the process
+    - Collect up to batch_size windows, waiting at most max_wait_ms
+    - Run encoder and decoder once per batch and route results back per job
+    - Track throughput in audio-seconds per wall-second
+
+    Cross-job batching needs several jobs in flight in the same process,
+    i.e. a worker started with a thread pool (celery -P threads).
+    """
+
+    def __init__(
+        self,
+        model_getter: Callable,
+        batch_size: Optional[int] = None,
+        max_wait_ms: Optional[int] = None,
+    ):
+        self.model_getter = model_getter
+        self.batch_size = batch_size or settings.WHISPER_BATCH_SIZE
+        self.max_wait = (max_wait_ms or settings.WHISPER_BATCH_MAX_WAIT_MS) / 1000
+        self._queue: "queue.Queue[_Window]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.audio_seconds = 0.0
+        self.busy_seconds = 0.0
+        self.batches = 0
+
+    @property
+    def throughput(self) -> float:
+        """Audio seconds transcribed per wall second spent in inference."""
+        return self.audio_seconds / self.busy_seconds if self.busy_seconds else 0.0
+
+    def submit(self, pcm: np.ndarray) -> Future:
+        """Queue a job's audio; the future resolves to a Whisper-shaped result."""
+        self._ensure_started()
+        n_windows = max(1, -(-len(pcm) // WINDOW_SAMPLES))
+        request = _BatchRequest(
+            n_windows=n_windows, audio_seconds=len(pcm) / SAMPLE_RATE
+        )
+        for index in range(n_windows):
+            window = pcm[index * WINDOW_SAMPLES:(index + 1) * WINDOW_SAMPLES]
+            self._queue.put(_Window(
+                request=request,
+                index=index,
+                features=self._features(window),
+                offset=index * WINDOW_SECONDS,
+                duration=len(window) / SAMPLE_RATE,
+            ))
+        return request.future
+
+    def transcribe(self, pcm: np.ndarray) -> dict:
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(pcm).result()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="whisper-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        import torch
+
+        torch.set_num_threads(settings.TRANSCRIPTION_TORCH_THREADS)
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_Window]) -> None:
+        started = time.perf_counter()
+        try:
+            outputs = self._infer([window.features for window in batch])
+
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            batch_audio = sum(window.duration for window in batch)
+            self.batches += 1
+            self.busy_seconds += elapsed
+            self.audio_seconds += batch_audio
+            logger.info(
+                f"Whisper batch of {len(batch)} windows: "
+                f"{batch_audio / elapsed:.1f} audio-s/s "
+                f"(running {self.throughput:.1f} audio-s/s)"
+            )
+
+            for window, (language, segments) in zip(batch, outputs):
+                request = window.request
+                if request.future.done():
+                    # Failed along with an earlier batch
+                    continue
+                request.language = request.language or language
+                request.window_segments[window.index] = [
+                    dict(
+                        segment,
+                        start=window.offset + min(segment["start"], window.duration),
+                        end=window.offset + min(segment["end"], window.duration),
+                    )
+                    for segment in segments
+                ]
+                if len(request.window_segments) == request.n_windows:
+                    self._complete(request)
+        except Exception as e:
+            # Never let the batcher thread die: every job would wait forever
+            logger.error(f"Batched whisper inference failed: {str(e)}")
+            for window in batch:
+                if not window.request.future.done():
+                    window.request.future.set_exception(e)
+
+    @staticmethod
+    def _complete(request: _BatchRequest) -> None:
+        segments = [
+            segment
+            for index in range(request.n_windows)
+            for segment in request.window_segments[index]
+        ]
+        request.future.set_result({
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": request.language,
+        })
+
+    def _features(self, window: np.ndarray):
+        import whisper
+
+        model = self.model_getter()
+        audio = whisper.pad_or_trim(np.asarray(window, dtype=np.float32))
+        return whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels)
+
+    def _infer(self, features: list) -> List[tuple]:
+        """One encoder+decoder pass over a batch of mel windows."""
+        import torch
+        import whisper
+        from whisper.tokenizer import get_tokenizer
+
+        model = self.model_getter()
+        mel = torch.stack(features).to(model.device)
+        options = whisper.DecodingOptions(without_timestamps=False, fp16=False)
+        results = whisper.decode(model, mel, options)
+
+        outputs = []
+        for result in results:
+            tokenizer = get_tokenizer(
+                model.is_multilingual,
+                num_languages=model.num_languages,
+                language=result.language,
+                task="transcribe",
+            )
+            outputs.append(
+                (result.language, _segments_from_tokens(result.tokens, tokenizer))
+            )
+        return outputs
+
+
+def _segments_from_tokens(tokens: List[int], tokenizer) -> List[Dict]:
+    """Split a timestamped token stream (<|t0|> text <|t1|> ...) into segments."""
+    segments = []
+    start = None
+    text_tokens: List[int] = []
+    last_time = 0.0
+    for token in tokens:
+        if token >= tokenizer.timestamp_begin:
+            last_time = (token - tokenizer.timestamp_begin) * TIMESTAMP_STEP
+            if start is not None and text_tokens:
+                segments.append({
+                    "start": start,
+                    "end": last_time,
+                    "text": tokenizer.decode(text_tokens),
+                })
+                text_tokens = []
+                start = None
+            else:
+                start = last_time
+        elif token < tokenizer.eot:
+            text_tokens.append(token)
+    if text_tokens:
+        # Unterminated tail: runs to the end of the window
+        segments.append({
+            "start": start if start is not None else last_time,
+            "end": float(WINDOW_SECONDS),
+            "text": tokenizer.decode(text_tokens),
+        })
+    return segments
@@ -3,7 +3,6 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from db.session import Base
 from db.models.user import User
 from main import app
 
@@ -13,7 +12,8 @@ SQLALCHEMY_DATABASE_URL = "postgresql://user:password@db:5432/audio_db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base.metadata.create_all(bind=engine)
+# The schema comes from migrations (alembic -c migrations/alembic.ini
+# upgrade head), applied before the suite runs
 
 
 @pytest.fixture(scope="module")
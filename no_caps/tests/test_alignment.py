@@ -0,0 +1,63 @@
+# tests/test_alignment.py
+from utils.alignment import merge_speaker_turns, timed_items
+
+
+def test_segment_goes_to_turn_with_most_overlap():
+    """A segment straddling two turns is attributed once, to the larger overlap."""
+    turns = [(0.0, 5.0, "SPEAKER_00"), (5.0, 10.0, "SPEAKER_01")]
+    items = [
+        {"start": 0.5, "end": 4.0, "text": " Hello there."},
+        {"start": 4.5, "end": 9.0, "text": " How are you?"},
+    ]
+
+    merged = merge_speaker_turns(turns, items)
+
+    assert [m["text"] for m in merged] == ["Hello there.", "How are you?"]
+    assert [m["speaker"] for m in merged] == ["SPEAKER_00", "SPEAKER_01"]
+
+
+def test_unsorted_input_and_empty_turns():
+    """Inputs are sorted first, and turns without speech keep an empty text."""
+    turns = [(10.0, 12.0, "SPEAKER_01"), (0.0, 2.0, "SPEAKER_00"), (20.0, 21.0, "SPEAKER_00")]
+    items = [
+        {"start": 10.5, "end": 11.5, "text": " second"},
+        {"start": 0.2, "end": 1.0, "text": " first"},
+    ]
+
+    merged = merge_speaker_turns(turns, items)
+
+    assert [(m["start_time"], m["text"]) for m in merged] == [
+        (0.0, "first"),
+        (10.0, "second"),
+        (20.0, ""),
+    ]
+
+
+def test_word_level_assignment_splits_a_segment():
+    """With word timestamps, a speaker change mid-segment is honoured."""
+    turns = [(0.0, 1.0, "SPEAKER_00"), (1.0, 2.0, "SPEAKER_01")]
+    result = {
+        "segments": [
+            {
+                "start": 0.0,
+                "end": 2.0,
+                "text": " Yes. No way.",
+                "words": [
+                    {"start": 0.1, "end": 0.6, "word": " Yes."},
+                    {"start": 1.1, "end": 1.4, "word": " No"},
+                    {"start": 1.4, "end": 1.4, "word": " way."},
+                ],
+            }
+        ]
+    }
+
+    merged = merge_speaker_turns(turns, timed_items(result))
+
+    assert merged[0]["text"] == "Yes."
+    assert merged[1]["text"] == "No way."
+
+
+def test_timed_items_falls_back_to_segments():
+    """Without word timestamps the segments themselves are used."""
+    result = {"segments": [{"start": 0.0, "end": 1.0, "text": " hi"}]}
+    assert timed_items(result) == result["segments"]
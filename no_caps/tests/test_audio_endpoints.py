@@ -2,9 +2,29 @@
 import io
 import pytest
 import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest import mock
 from fastapi import UploadFile
+from core.auth import create_access_token
 from core.config import settings
+from db.models.transcription import TranscriptionStatus
+from utils.file_handling import StoredUpload
+
+
+@pytest.fixture
+def user_headers(monkeypatch):
+    """Bearer headers for user 1, resolved without the database."""
+    user = SimpleNamespace(id=1, email="owner@example.com", is_active=True)
+
+    async def get_user_by_email_async(db, email):
+        return user if email == user.email else None
+
+    monkeypatch.setattr("core.auth.get_user_by_email_async", get_user_by_email_async)
+    token = create_access_token(
+        data={"sub": user.email}, expires_delta=timedelta(minutes=30)
+    )
+    return {"Authorization": f"Bearer {token}"}
 
 
 def test_audio_upload_success(client, monkeypatch):
@@ -12,12 +32,18 @@ def test_audio_upload_success(client, monkeypatch):
 
     # Mock file saving to avoid actual file operations during testing
     async def mock_save_upload_file(file):
-        return "/mocked/path/to/audio.mp3"
+        return StoredUpload(
+            file_path="/mocked/path/to/audio.mp3", content_hash="ab" * 32, size=24
+        )
 
     # Mock audio duration calculation
-    def mock_get_audio_duration(file_path):
+    def mock_get_audio_duration(file_path, content_hash=None):
         return 120  # 2 minutes duration
 
+    monkeypatch.setattr(
+        "db.crud.audio.get_audio_by_hash", lambda db, content_hash: None
+    )
+
     # Apply our mocks
     monkeypatch.setattr(
         "services.audio_service.save_upload_file", mock_save_upload_file
@@ -25,17 +51,24 @@ def test_audio_upload_success(client, monkeypatch):
     monkeypatch.setattr(
         "services.audio_service.get_audio_duration", mock_get_audio_duration
     )
+    monkeypatch.setattr(
+        "services.audio_service.settings.TRANSCODE_ON_INGEST", False
+    )
     monkeypatch.setattr(
         "db.crud.audio.create_audio",
-        lambda db, filename, file_path, duration, user_id: {
-            "id": 1,
-            "filename": filename,
-            "file_path": file_path,
-            "duration": duration,
-            "user_id": user_id,
-            "created_at": "2025-02-24T00:00:00",
-        },
+        lambda db, filename, file_path, duration, user_id, **kwargs: SimpleNamespace(
+            id=1,
+            filename=filename,
+            file_path=file_path,
+            duration=duration,
+            user_id=user_id,
+            created_at="2025-02-24T00:00:00",
+        ),
     )
+    peaks_task = mock.MagicMock()
+    monkeypatch.setattr("services.audio_service.compute_peaks_task", peaks_task)
+    store_task = mock.MagicMock()
+    monkeypatch.setattr("services.audio_service.store_audio_task", store_task)
 
     # Create test file data
     test_file_name = "test_audio.mp3"
@@ -56,6 +89,64 @@ def test_audio_upload_success(client, monkeypatch):
     assert data["filename"] == test_file_name
     assert data["user_id"] == 1  # Your service hardcodes user_id to 1
     assert data["duration"] == 120  # Our mocked duration
+    peaks_task.delay.assert_called_once_with(1, "/mocked/path/to/audio.mp3")
+    store_task.delay.assert_called_once_with("/mocked/path/to/audio.mp3")
+
+
+async def test_transcode_runs_on_a_worker(monkeypatch):
+    """With TRANSCODE_ON_INGEST the row is recorded as received first."""
+    from services.audio_service import register_stored_audio
+
+    monkeypatch.setattr("services.audio_service.settings.TRANSCODE_ON_INGEST", True)
+    monkeypatch.setattr("db.crud.audio.get_audio_by_hash", lambda db, content_hash: None)
+    monkeypatch.setattr(
+        "services.audio_service.get_audio_duration",
+        lambda file_path, content_hash=None: 60,
+    )
+    monkeypatch.setattr(
+        "db.crud.audio.create_audio",
+        lambda db, **kwargs: SimpleNamespace(id=3, **kwargs),
+    )
+    transcode_task = mock.MagicMock()
+    store_task = mock.MagicMock()
+    monkeypatch.setattr("services.audio_service.transcode_audio_task", transcode_task)
+    monkeypatch.setattr("services.audio_service.store_audio_task", store_task)
+    stored = StoredUpload(file_path="/uploads/a.wav", content_hash="ab" * 32, size=9)
+
+    audio = await register_stored_audio(None, "a.wav", stored, SimpleNamespace(id=1))
+
+    assert audio.file_path == "/uploads/a.wav"
+    assert audio.stored_size_bytes == 9
+    transcode_task.delay.assert_called_once_with(3)
+    store_task.delay.assert_not_called()
+
+
+async def test_duplicate_upload_is_not_stored_again(monkeypatch, tmp_path):
+    """Content that was uploaded before is already in the storage backend."""
+    from services.audio_service import register_stored_audio
+
+    blob = tmp_path / "blob.mp3"
+    blob.write_bytes(b"audio")
+    existing = SimpleNamespace(
+        file_path=str(blob), duration=120, original_file_path=None,
+        stored_size_bytes=5,
+    )
+    monkeypatch.setattr(
+        "db.crud.audio.get_audio_by_hash", lambda db, content_hash: existing
+    )
+    monkeypatch.setattr(
+        "db.crud.audio.create_audio",
+        lambda db, **kwargs: SimpleNamespace(id=2, **kwargs),
+    )
+    store_task = mock.MagicMock()
+    monkeypatch.setattr("services.audio_service.store_audio_task", store_task)
+    monkeypatch.setattr("services.audio_service.compute_peaks_task", mock.MagicMock())
+    stored = StoredUpload(file_path=str(blob), content_hash="ab" * 32, size=5)
+
+    audio = await register_stored_audio(None, "again.mp3", stored, SimpleNamespace(id=1))
+
+    assert audio.file_path == str(blob)
+    store_task.delay.assert_not_called()
 
 
 def test_audio_upload_failure(client, monkeypatch):
@@ -86,45 +177,70 @@ def test_audio_upload_failure(client, monkeypatch):
     assert "File must be an audio file" in response.text
 
 
-def test_get_audio_uploads_success(client, monkeypatch):
-    """Test retrieving audio files for a user."""
-    # Mock the get_user_audio_files function
+def test_get_audio_uploads_success(client, monkeypatch, user_headers):
+    """Test retrieving a page of audio files for a user."""
+    # Mock the list_user_audio_page_async function
     test_audio_files = [
-        {
-            "id": 1,
-            "filename": "audio1.mp3",
-            "file_path": "/path/to/audio1.mp3",
-            "duration": 60,
-            "user_id": 1,
-            "created_at": "2025-02-24T00:00:00",
-        },
         {
             "id": 2,
             "filename": "audio2.mp3",
-            "file_path": "/path/to/audio2.mp3",
             "duration": 120,
-            "user_id": 1,
-            "created_at": "2025-02-24T00:00:00",
+            "stored_size_bytes": 2048,
+            "created_at": datetime(2025, 2, 24, 0, 1),
+            "transcription_id": 7,
+            "transcription_status": TranscriptionStatus.COMPLETED,
+            "word_count": 42,
+        },
+        {
+            "id": 1,
+            "filename": "audio1.mp3",
+            "duration": 60,
+            "stored_size_bytes": 1024,
+            "created_at": datetime(2025, 2, 24, 0, 0),
+            "transcription_id": None,
+            "transcription_status": None,
+            "word_count": None,
         },
     ]
+    calls = []
 
-    def mock_get_user_audio_files(db, user_id):
-        return test_audio_files
+    async def mock_list_user_audio_page(db, user_id, limit, after=None):
+        calls.append((user_id, limit, after))
+        return [dict(row) for row in test_audio_files[:limit]]
 
-    monkeypatch.setattr("db.crud.audio.get_user_audio_files", mock_get_user_audio_files)
+    monkeypatch.setattr(
+        "db.crud.audio.list_user_audio_page_async", mock_list_user_audio_page
+    )
 
-    # Get audio files for user_id=1
-    response = client.get(f"{settings.API_V1_STR}/audio/1/")
+    # First page of one file for user_id=1
+    response = client.get(
+        f"{settings.API_V1_STR}/audio/1/?limit=1", headers=user_headers
+    )
 
-    # Assert the response
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) == 2
+    assert [item["filename"] for item in data["items"]] == ["audio2.mp3"]
+    assert data["items"][0]["transcription_status"] == "completed"
+    assert data["items"][0]["word_count"] == 42
+    assert data["next_cursor"]
+    # One extra row is fetched to detect a following page
+    assert calls[0] == (1, 2, None)
+
+    # The cursor resumes after the last file of the first page
+    response = client.get(
+        f"{settings.API_V1_STR}/audio/1/?limit=1&cursor={data['next_cursor']}",
+        headers=user_headers,
+    )
+    assert response.status_code == 200
+    assert calls[1] == (1, 2, (datetime(2025, 2, 24, 0, 1), 2))
+
 
-    # Check that the files match our mock data
-    assert data[0]["filename"] == "audio1.mp3"
-    assert data[1]["filename"] == "audio2.mp3"
+def test_get_audio_uploads_invalid_cursor(client, user_headers):
+    """A cursor the server did not issue is rejected."""
+    response = client.get(
+        f"{settings.API_V1_STR}/audio/1/?cursor=not-a-cursor", headers=user_headers
+    )
+    assert response.status_code == 400
 
 
 def test_upload_no_file(client):
@@ -136,23 +252,50 @@ def test_upload_no_file(client):
     assert response.status_code == 422  # Validation error for missing required field
 
 
-def test_get_audio_nonexistent_user(client, monkeypatch):
-    """Test getting audio files for a user that doesn't exist."""
+def test_get_audio_of_another_user_is_forbidden(client, monkeypatch, user_headers):
+    """Only the owner can list a library; anonymous requests are refused."""
+    listed = []
+
+    async def mock_list_user_audio_page(db, user_id, limit, after=None):
+        listed.append(user_id)
+        return []
+
+    monkeypatch.setattr(
+        "db.crud.audio.list_user_audio_page_async", mock_list_user_audio_page
+    )
+
+    response = client.get(f"{settings.API_V1_STR}/audio/999/", headers=user_headers)
+    assert response.status_code == 403
+
+    response = client.get(f"{settings.API_V1_STR}/audio/1/")
+    assert response.status_code == 401
+    assert listed == []
+
+
+def test_peaks_are_served_from_the_async_session(client, monkeypatch, user_headers):
+    """The peaks route looks the audio up on the async session."""
+    from api.v1.endpoints import audio as audio_endpoints
+    from services import peaks
+
+    looked_up = []
 
-    # Mock the get_user_audio_files function to return empty list
-    def mock_get_user_audio_files(db, user_id):
-        if user_id == 999:
-            return []
-        else:
-            return [{"id": 1, "filename": "test.mp3"}]
+    async def get_audio_or_404_async(db, audio_id, user_id):
+        looked_up.append((audio_id, user_id))
+        return SimpleNamespace(id=audio_id, file_path="/no_caps/uploads/a.wav")
 
-    monkeypatch.setattr("db.crud.audio.get_user_audio_files", mock_get_user_audio_files)
+    def get_audio_or_404(db, audio_id, user_id):
+        raise AssertionError("sync session used on the event loop")
 
-    # Get audio files for a non-existent user
-    response = client.get(f"{settings.API_V1_STR}/audio/999/")
+    level = SimpleNamespace(samples_per_peak=256, length=2)
+    monkeypatch.setattr(audio_endpoints, "get_audio_or_404_async", get_audio_or_404_async)
+    monkeypatch.setattr("db.crud.audio.get_audio_or_404", get_audio_or_404)
+    monkeypatch.setattr(peaks, "ensure_peaks", lambda audio_id, file_path: "a.peaks")
+    monkeypatch.setattr(peaks, "read_peak_levels", lambda path: [level])
+    monkeypatch.setattr(peaks, "read_peaks", lambda path, chosen: b"\x00\x01\x02\x03")
+
+    response = client.get(f"{settings.API_V1_STR}/audio/5/peaks", headers=user_headers)
 
-    # Assuming your API returns an empty list for users with no files
     assert response.status_code == 200
-    data = response.json()
-    assert isinstance(data, list)
-    assert len(data) == 0
+    assert response.content == b"\x00\x01\x02\x03"
+    assert response.headers["x-peaks-levels"] == "1"
+    assert looked_up == [(5, 1)]
@@ -0,0 +1,111 @@
+# tests/test_audio_processing.py
+import struct
+import wave
+from unittest import mock
+
+import pytest
+
+from utils import audio_processing
+from utils.audio_processing import get_audio_duration
+
+
+@pytest.fixture(autouse=True)
+def no_ffprobe(monkeypatch):
+    """Header parsing must not need the fallback for well-formed files."""
+    ffprobe = mock.MagicMock(side_effect=AssertionError("ffprobe called"))
+    monkeypatch.setattr(audio_processing, "_ffprobe_duration", ffprobe)
+    monkeypatch.setattr(audio_processing, "_duration_cache", audio_processing.OrderedDict())
+    return ffprobe
+
+
+def test_wav(tmp_path):
+    path = tmp_path / "a.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(b"\x00\x00" * 16000 * 3)
+
+    assert get_audio_duration(str(path)) == pytest.approx(3.0)
+
+
+def test_flac(tmp_path):
+    path = tmp_path / "a.flac"
+    # 44.1 kHz, 2 channels, 16 bit, 441000 samples
+    packed = (44100 << 44) | (1 << 41) | (15 << 36) | 441000
+    streaminfo = bytes(10) + packed.to_bytes(8, "big") + bytes(16)
+    path.write_bytes(b"fLaC" + b"\x80\x00\x00\x22" + streaminfo)
+
+    assert get_audio_duration(str(path)) == pytest.approx(10.0)
+
+
+def ogg_page(granule: int, payload: bytes) -> bytes:
+    return b"OggS\x00\x00" + struct.pack("<q", granule) + bytes(13) + payload
+
+
+def test_ogg_opus(tmp_path):
+    path = tmp_path / "a.ogg"
+    head = b"OpusHead\x01\x01" + struct.pack("<H", 312) + bytes(7)
+    path.write_bytes(
+        ogg_page(0, head) + bytes(200_000) + ogg_page(48000 * 5 + 312, b"")
+    )
+
+    assert get_audio_duration(str(path)) == pytest.approx(5.0)
+
+
+def atom(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(body)) + kind + body
+
+
+def test_m4a_with_moov_after_mdat(tmp_path):
+    path = tmp_path / "a.m4a"
+    mvhd = atom(b"mvhd", b"\x00\x00\x00\x00" + struct.pack(">IIII", 0, 0, 1000, 7500) + bytes(80))
+    path.write_bytes(
+        atom(b"ftyp", b"M4A \x00\x00\x00\x00")
+        + atom(b"mdat", bytes(300_000))
+        + atom(b"moov", mvhd)
+    )
+
+    assert get_audio_duration(str(path)) == pytest.approx(7.5)
+
+
+def mp3_frame(extra: bytes = b"") -> bytes:
+    # MPEG-1 layer III, 128 kbps, 44.1 kHz, stereo: 417-byte frames
+    header = b"\xff\xfb\x90\x00"
+    return header + extra + bytes(417 - 4 - len(extra))
+
+
+def test_mp3_xing_frame_count(tmp_path):
+    path = tmp_path / "a.mp3"
+    xing = bytes(32) + b"Xing" + struct.pack(">II", 1, 1000)
+    path.write_bytes(mp3_frame(xing) + mp3_frame() * 3)
+
+    assert get_audio_duration(str(path)) == pytest.approx(1000 * 1152 / 44100)
+
+
+def test_mp3_cbr_estimate_skips_id3(tmp_path):
+    path = tmp_path / "a.mp3"
+    id3 = b"ID3\x04\x00\x00\x00\x00\x01\x00" + bytes(128)
+    audio = mp3_frame() * 100
+    path.write_bytes(id3 + audio)
+
+    assert get_audio_duration(str(path)) == pytest.approx(len(audio) * 8 / 128000)
+
+
+def test_falls_back_to_ffprobe(tmp_path, no_ffprobe):
+    path = tmp_path / "a.ogg"
+    path.write_bytes(b"OggS" + bytes(100))  # no codec header to read
+    no_ffprobe.side_effect = None
+    no_ffprobe.return_value = 4.2
+
+    assert get_audio_duration(str(path)) == 4.2
+    no_ffprobe.assert_called_once_with(str(path))
+
+
+def test_cached_by_content_hash(tmp_path, monkeypatch):
+    probe = mock.MagicMock(return_value=9.0)
+    monkeypatch.setattr(audio_processing, "_probe_duration", probe)
+
+    assert get_audio_duration("/blobs/a.mp3", "abc") == 9.0
+    assert get_audio_duration("/blobs/a-copy.mp3", "abc") == 9.0
+    assert probe.call_count == 1
@@ -0,0 +1,190 @@
+# tests/test_chunked_transcription.py
+import multiprocessing
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from services import chunked_transcription
+from services.chunked_transcription import (
+    Chunk,
+    ChunkedTranscriber,
+    find_chunks,
+    stitch_chunk,
+    transcribe_chunk,
+)
+from services.pcm_cache import SAMPLE_RATE
+
+
+def speech_with_pauses(seconds, pause_every, pause_length=0.5):
+    """Noise with silent gaps every pause_every seconds."""
+    rng = np.random.default_rng(0)
+    pcm = rng.uniform(-0.5, 0.5, seconds * SAMPLE_RATE).astype(np.float32)
+    for t in np.arange(pause_every, seconds, pause_every):
+        lo = int(t * SAMPLE_RATE)
+        pcm[lo:lo + int(pause_length * SAMPLE_RATE)] = 0
+    return pcm
+
+
+def test_chunks_cover_signal_and_cut_in_silence():
+    """Keep ranges tile the signal, and every cut lands in a pause."""
+    pcm = speech_with_pauses(seconds=100, pause_every=7)
+
+    chunks = find_chunks(pcm, chunk_seconds=30, overlap_seconds=1, search_seconds=8)
+
+    assert chunks[0].keep_start == 0
+    assert chunks[-1].keep_end == len(pcm)
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev.keep_end == nxt.keep_start
+        assert np.all(pcm[prev.keep_end - 100:prev.keep_end + 100] == 0)
+        assert nxt.start == nxt.keep_start - SAMPLE_RATE
+
+
+def test_short_signal_is_a_single_chunk():
+    pcm = np.zeros(5 * SAMPLE_RATE, dtype=np.float32)
+    chunks = find_chunks(pcm, chunk_seconds=30, overlap_seconds=1, search_seconds=8)
+    assert chunks == [Chunk(0, len(pcm), 0, len(pcm))]
+
+
+def test_stitch_drops_words_in_the_overlap():
+    """Words outside the keep range are trimmed and timestamps are absolute."""
+    chunk = Chunk(
+        start=9 * SAMPLE_RATE,
+        end=21 * SAMPLE_RATE,
+        keep_start=10 * SAMPLE_RATE,
+        keep_end=20 * SAMPLE_RATE,
+    )
+    result = {
+        "segments": [
+            {
+                "start": 0.0,
+                "end": 2.0,
+                "text": " again hello",
+                "words": [
+                    {"start": 0.2, "end": 0.8, "word": " again"},
+                    {"start": 1.2, "end": 2.0, "word": " hello"},
+                ],
+            },
+            {
+                "start": 10.5,
+                "end": 12.0,
+                "text": " next",
+                "words": [{"start": 11.5, "end": 12.0, "word": " next"}],
+            },
+        ]
+    }
+
+    segments = stitch_chunk(result, chunk)
+
+    assert len(segments) == 1
+    assert segments[0]["text"] == " hello"
+    assert segments[0]["start"] == 10.2
+    assert segments[0]["end"] == 11.0
+
+
+def test_in_process_mode_reports_each_chunk_as_it_finishes(monkeypatch):
+    """Mid-length audio runs on the caller's model and emits per chunk."""
+    monkeypatch.setattr("core.config.settings.LONG_AUDIO_CHUNK_SECONDS", 30)
+    monkeypatch.setattr("core.config.settings.LONG_AUDIO_CHUNK_OVERLAP_SECONDS", 0)
+    monkeypatch.setattr("core.config.settings.WHISPER_WORD_TIMESTAMPS", False)
+    pcm = speech_with_pauses(seconds=70, pause_every=7)
+    model = mock.MagicMock()
+    model.transcribe.return_value = {
+        "segments": [{"start": 1.0, "end": 2.0, "text": " hi"}],
+        "language": "en",
+    }
+    reported = []
+
+    send_task = mock.MagicMock()
+    monkeypatch.setattr(chunked_transcription.celery_app, "send_task", send_task)
+
+    result = ChunkedTranscriber().transcribe(
+        "unused.f32", pcm,
+        on_segments=lambda segments, covered: reported.append(covered),
+        model=model,
+    )
+
+    send_task.assert_not_called()
+    assert model.transcribe.call_count == 3
+    assert len(reported) == 3
+    assert reported[-1] == 70.0
+    assert result["language"] == "en"
+    assert len(result["segments"]) == 3
+
+
+@pytest.fixture
+def long_audio(tmp_path, monkeypatch):
+    """Chunk tasks run inline on a stub model, as a long-audio worker would."""
+    monkeypatch.setattr("core.config.settings.LONG_AUDIO_CHUNK_SECONDS", 30)
+    monkeypatch.setattr("core.config.settings.LONG_AUDIO_CHUNK_OVERLAP_SECONDS", 0)
+    monkeypatch.setattr("core.config.settings.WHISPER_WORD_TIMESTAMPS", False)
+    monkeypatch.setattr(
+        "core.config.settings.LONG_AUDIO_RESULTS_DIR", str(tmp_path / "chunks")
+    )
+    model = mock.MagicMock()
+    model.transcribe.return_value = {
+        "segments": [{"start": 1.0, "end": 2.0, "text": " hi"}],
+        "language": "en",
+    }
+    monkeypatch.setattr(chunked_transcription, "_chunk_model", lambda: model)
+
+    def send_task(name, args, queue):
+        assert (name, queue) == ("transcription.chunk", "long-audio")
+        pcm_path, chunk, word_timestamps, result_path = args
+        transcribe_chunk(pcm_path, Chunk(**chunk), word_timestamps, result_path)
+
+    monkeypatch.setattr(chunked_transcription.celery_app, "send_task", send_task)
+
+    pcm = speech_with_pauses(seconds=70, pause_every=7)
+    pcm_path = tmp_path / "a.f32"
+    pcm.tofile(pcm_path)
+    return str(pcm_path), pcm, model
+
+
+def test_chunks_fan_out_as_tasks_and_stitch_in_order(long_audio, tmp_path):
+    pcm_path, pcm, model = long_audio
+    reported = []
+
+    result = ChunkedTranscriber().transcribe(
+        pcm_path, pcm, on_segments=lambda segments, covered: reported.append(covered)
+    )
+
+    assert model.transcribe.call_count == 3
+    assert reported[-1] == 70.0
+    # One segment per chunk, each shifted to where its chunk starts
+    starts = [segment["start"] for segment in result["segments"]]
+    assert len(starts) == 3
+    assert starts == sorted(starts) and starts[0] == 1.0
+    # Every result file and the job's directory are gone
+    assert list((tmp_path / "chunks").iterdir()) == []
+
+
+def test_failed_chunk_fails_the_job(long_audio):
+    pcm_path, pcm, model = long_audio
+    model.transcribe.side_effect = RuntimeError("out of memory")
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        ChunkedTranscriber().transcribe(pcm_path, pcm)
+
+
+def _transcribe_in_daemon(pcm_path, pcm, outcome):
+    try:
+        result = ChunkedTranscriber().transcribe(pcm_path, pcm)
+        outcome.put(len(result["segments"]))
+    except BaseException as e:
+        outcome.put(repr(e))
+
+
+def test_runs_inside_a_daemonic_worker_process(long_audio):
+    """Celery prefork children are daemonic and may not start processes."""
+    pcm_path, pcm, _ = long_audio
+    context = multiprocessing.get_context("fork")
+    outcome = context.Queue()
+    worker = context.Process(
+        target=_transcribe_in_daemon, args=(pcm_path, pcm, outcome), daemon=True
+    )
+
+    worker.start()
+    worker.join(30)
+
+    assert outcome.get(timeout=5) == 3
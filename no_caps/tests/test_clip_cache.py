@@ -0,0 +1,60 @@
+# tests/test_clip_cache.py
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from services import clip_cache as clip_cache_module
+from services.clip_cache import ClipCache
+
+AUDIO = SimpleNamespace(id=1, file_path="/uploads/a.mp3", content_hash="ab" * 32)
+
+
+@pytest.fixture
+def pcm(monkeypatch):
+    signal = np.arange(16000 * 10, dtype=np.float32)
+    monkeypatch.setattr(
+        clip_cache_module.pcm_cache, "load", lambda audio_id, path: signal
+    )
+    return signal
+
+
+@pytest.fixture
+def ffmpeg(monkeypatch):
+    """Stand-in encoder that writes its raw input to the output path."""
+    def run(cmd, input, check, capture_output):
+        with open(cmd[-1], "wb") as f:
+            f.write(bytes(input))
+    run = mock.MagicMock(side_effect=run)
+    monkeypatch.setattr(clip_cache_module.subprocess, "run", run)
+    return run
+
+
+def test_clip_is_cut_sample_accurately(tmp_path, pcm, ffmpeg):
+    cache = ClipCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+
+    path = cache.get(AUDIO, 1.5, 2.25, "wav")
+
+    clip = np.frombuffer(path.read_bytes(), dtype=np.float32)
+    np.testing.assert_array_equal(clip, pcm[24000:36000])
+
+
+def test_repeat_plays_do_not_encode_again(tmp_path, pcm, ffmpeg):
+    cache = ClipCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+
+    first = cache.get(AUDIO, 1.0, 2.0, "mp3")
+    second = cache.get(AUDIO, 1.0, 2.0, "mp3")
+    cache.get(AUDIO, 1.0, 2.0, "opus")
+
+    assert first == second
+    assert ffmpeg.call_count == 2
+    # Hits as well as misses leave no per-clip lock behind
+    assert len(cache._locks) == 0
+
+
+def test_clip_outside_recording(tmp_path, pcm, ffmpeg):
+    cache = ClipCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+
+    with pytest.raises(ValueError):
+        cache.get(AUDIO, 20.0, 21.0, "mp3")
@@ -0,0 +1,58 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from core.config import settings
+from db.pool import InstrumentedQueuePool
+
+
+def _pool(**kwargs):
+    return InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False), **kwargs
+    )
+
+
+def test_checkouts_are_counted_and_in_use_tracked():
+    pool = _pool(pool_size=2, max_overflow=0)
+    first = pool.connect()
+    second = pool.connect()
+
+    snapshot = pool.metrics.snapshot(pool)
+    assert snapshot["checkouts"] == 2
+    assert snapshot["in_use"] == 2
+    assert snapshot["timeouts"] == 0
+
+    first.close()
+    second.close()
+    snapshot = pool.metrics.snapshot(pool)
+    assert snapshot["in_use"] == 0
+    assert snapshot["idle"] == 2
+
+
+def test_exhausted_pool_records_timeout_and_wait():
+    pool = _pool(pool_size=1, max_overflow=0, timeout=0.05)
+    held = pool.connect()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+
+    snapshot = pool.metrics.snapshot(pool)
+    assert snapshot["timeouts"] == 1
+    assert snapshot["max_wait_ms"] >= 50
+    held.close()
+
+
+def test_metrics_survive_recreate():
+    pool = _pool(pool_size=1, max_overflow=0)
+    pool.connect().close()
+
+    recreated = pool.recreate()
+    assert recreated.metrics is pool.metrics
+    assert recreated.metrics.checkouts == 1
+
+
+def test_pool_metrics_require_auth(client):
+    response = client.get(f"{settings.API_V1_STR}/metrics/db")
+
+    assert response.status_code == 401
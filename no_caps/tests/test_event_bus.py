@@ -0,0 +1,89 @@
+# tests/test_event_bus.py
+import asyncio
+import os
+import time
+
+import pytest
+
+from services.event_bus import (
+    ABANDONED_LOG_SECONDS,
+    TranscriptionEventBus,
+    expire_event_logs,
+    publish_transcription_event,
+    reset_transcription_events,
+)
+
+
+@pytest.fixture(autouse=True)
+def events_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("services.event_bus.settings.EVENTS_DIR", str(tmp_path))
+    return tmp_path
+
+
+async def test_worker_events_reach_every_subscriber():
+    """Lines appended by another process are fanned out to all local queues."""
+    bus = TranscriptionEventBus(poll_interval=0.01)
+    first = bus.subscribe(1)
+    second = bus.subscribe(1)
+
+    publish_transcription_event(1, "status", {"status": "in_progress"})
+    publish_transcription_event(1, "segments", {"segments": [], "processed_seconds": 30})
+
+    for queue in (first, second):
+        assert (await asyncio.wait_for(queue.get(), 1))["event"] == "status"
+        assert (await asyncio.wait_for(queue.get(), 1))["event"] == "segments"
+
+    bus.unsubscribe(1, first)
+    bus.unsubscribe(1, second)
+
+
+async def test_only_events_after_subscribing_are_delivered():
+    bus = TranscriptionEventBus(poll_interval=0.01)
+    publish_transcription_event(2, "status", {"status": "in_progress"})
+
+    queue = bus.subscribe(2)
+    publish_transcription_event(2, "status", {"status": "completed"})
+
+    message = await asyncio.wait_for(queue.get(), 1)
+    assert message["data"]["status"] == "completed"
+    bus.unsubscribe(2, queue)
+
+
+async def test_relay_stops_with_last_subscriber():
+    bus = TranscriptionEventBus(poll_interval=0.01)
+    queue = bus.subscribe(3)
+    relay = bus._relays[3]
+
+    bus.unsubscribe(3, queue)
+    await asyncio.sleep(0.05)
+
+    assert 3 not in bus._relays
+    assert relay.done()
+
+
+def test_reset_clears_previous_run(events_dir):
+    publish_transcription_event(4, "status", {"status": "failed"})
+    reset_transcription_events(4)
+    assert not (events_dir / "transcription-4.jsonl").exists()
+
+
+def test_finished_logs_expire_after_ttl(events_dir):
+    """Finished jobs' logs go once quiet for the TTL; running ones stay."""
+    publish_transcription_event(5, "status", {"status": "completed"})
+    publish_transcription_event(6, "segments", {"segments": []})
+    publish_transcription_event(7, "status", {"status": "failed"})
+
+    assert expire_event_logs(max_age=3600) == 0
+
+    old = time.time() - 7200
+    for tid in (5, 6):
+        os.utime(events_dir / f"transcription-{tid}.jsonl", (old, old))
+    assert expire_event_logs(max_age=3600) == 1
+    assert not (events_dir / "transcription-5.jsonl").exists()
+    assert (events_dir / "transcription-6.jsonl").exists()
+    assert (events_dir / "transcription-7.jsonl").exists()
+
+    abandoned = time.time() - ABANDONED_LOG_SECONDS - 1
+    os.utime(events_dir / "transcription-6.jsonl", (abandoned, abandoned))
+    assert expire_event_logs(max_age=3600) == 1
+    assert not (events_dir / "transcription-6.jsonl").exists()
@@ -0,0 +1,68 @@
+# tests/test_file_handling.py
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from utils import file_handling
+from utils.audio_processing import sniff_audio_format
+
+WAV_HEADER = b"RIFF\x24\x00\x00\x00WAVEfmt "
+
+
+@pytest.fixture(autouse=True)
+def upload_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_handling, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(file_handling, "BLOB_DIR", tmp_path / "blobs")
+    monkeypatch.setattr(file_handling, "INCOMING_DIR", tmp_path / "incoming")
+    monkeypatch.setattr(file_handling, "UPLOAD_CHUNK_SIZE", 16)
+    return tmp_path
+
+
+def upload(data: bytes, filename: str = "call.wav") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+async def test_streams_upload_into_blob_store(upload_dirs):
+    """Chunks are hashed and written in one pass."""
+    data = WAV_HEADER + bytes(range(100))
+
+    stored = await file_handling.save_upload_file(upload(data))
+
+    assert stored.content_hash == hashlib.sha256(data).hexdigest()
+    assert stored.size == len(data)
+    assert open(stored.file_path, "rb").read() == data
+    assert not list((upload_dirs / "incoming").iterdir())
+
+
+async def test_rejects_content_that_is_not_audio(upload_dirs):
+    with pytest.raises(HTTPException) as exc:
+        await file_handling.save_upload_file(upload(b"<html>not audio</html>" * 10))
+
+    assert exc.value.status_code == 400
+    assert not list((upload_dirs / "incoming").iterdir())
+
+
+async def test_rejects_oversized_upload_mid_stream(upload_dirs, monkeypatch):
+    """The limit trips on the chunk that crosses it; nothing is kept."""
+    monkeypatch.setattr(file_handling.settings, "MAX_UPLOAD_BYTES", 40)
+
+    with pytest.raises(HTTPException) as exc:
+        await file_handling.save_upload_file(upload(WAV_HEADER + bytes(200)))
+
+    assert exc.value.status_code == 413
+    assert not list((upload_dirs / "incoming").iterdir())
+
+
+@pytest.mark.parametrize("header, extension", [
+    (b"ID3\x04\x00\x00\x00\x00\x00\x00\x00\x00", ".mp3"),
+    (b"\xff\xfb\x90\x00\x00\x00\x00\x00\x00\x00\x00\x00", ".mp3"),
+    (WAV_HEADER, ".wav"),
+    (b"fLaC\x00\x00\x00\x22\x00\x00\x00\x00", ".flac"),
+    (b"OggS\x00\x02\x00\x00\x00\x00\x00\x00", ".ogg"),
+    (b"\x00\x00\x00\x20ftypM4A ", ".m4a"),
+    (b"PK\x03\x04\x00\x00\x00\x00\x00\x00\x00\x00", None),
+])
+def test_sniff_audio_format(header, extension):
+    assert sniff_audio_format(header) == extension
@@ -0,0 +1,110 @@
+# tests/test_ingest_service.py
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from services import ingest_service
+from utils.file_handling import StoredUpload
+
+HASH = "ab" * 32
+
+
+@pytest.fixture(autouse=True)
+def blob_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ingest_service, "blob_path", lambda h, ext: tmp_path / f"{h}{ext}"
+    )
+    monkeypatch.setattr(ingest_service, "INCOMING_DIR", tmp_path)
+    return tmp_path
+
+
+def fake_ffmpeg(output_bytes: int):
+    def run(cmd, check, capture_output):
+        with open(cmd[-1], "wb") as f:
+            f.write(bytes(output_bytes))
+    return mock.MagicMock(side_effect=run)
+
+
+def upload(tmp_path, size=1000):
+    path = tmp_path / f"{HASH}.wav"
+    path.write_bytes(bytes(size))
+    return str(path)
+
+
+def test_disabled_keeps_upload_as_is(blob_dir, monkeypatch):
+    monkeypatch.setattr(ingest_service.settings, "TRANSCODE_ON_INGEST", False)
+    path = upload(blob_dir)
+
+    ingested = ingest_service.ingest_upload(path, HASH)
+
+    assert ingested.file_path == path
+    assert ingested.stored_size_bytes == ingested.original_size_bytes == 1000
+
+
+def test_transcodes_and_leaves_original_for_the_caller(blob_dir, monkeypatch):
+    monkeypatch.setattr(ingest_service.settings, "TRANSCODE_ON_INGEST", True)
+    monkeypatch.setattr(ingest_service.settings, "KEEP_ORIGINAL_UPLOAD", False)
+    monkeypatch.setattr(ingest_service.subprocess, "run", fake_ffmpeg(100))
+    monkeypatch.setattr(
+        ingest_service, "commit_blob",
+        lambda tmp, h, ext: tmp.rename(blob_dir / f"{h}{ext}"),
+    )
+    path = upload(blob_dir)
+
+    ingested = ingest_service.ingest_upload(path, HASH)
+
+    # Lossless mono FLAC unless Opus is configured
+    assert ingested.file_path.endswith(".mono.flac")
+    assert ingested.stored_size_bytes == 100
+    assert ingested.original_size_bytes == 1000
+    assert ingested.original_file_path is None
+    # Dropped by the worker only once the row points at the canonical blob
+    assert (blob_dir / f"{HASH}.wav").exists()
+
+
+def test_existing_canonical_blob_is_not_transcoded_again(blob_dir, monkeypatch):
+    monkeypatch.setattr(ingest_service.settings, "TRANSCODE_ON_INGEST", True)
+    monkeypatch.setattr(ingest_service.settings, "KEEP_ORIGINAL_UPLOAD", True)
+    monkeypatch.setattr(ingest_service.settings, "TRANSCODE_CODEC", "opus")
+    run = fake_ffmpeg(100)
+    monkeypatch.setattr(ingest_service.subprocess, "run", run)
+    (blob_dir / f"{HASH}.opus").write_bytes(bytes(80))
+    path = upload(blob_dir)
+
+    ingested = ingest_service.ingest_upload(path, HASH)
+
+    run.assert_not_called()
+    assert ingested.stored_size_bytes == 80
+    assert ingested.original_file_path == path
+
+
+def test_reupload_reuses_stored_file_and_drops_restored_original(blob_dir, monkeypatch):
+    monkeypatch.setattr(ingest_service.settings, "KEEP_ORIGINAL_UPLOAD", False)
+    canonical = blob_dir / f"{HASH}.opus"
+    canonical.write_bytes(bytes(80))
+    existing = SimpleNamespace(
+        file_path=str(canonical), stored_size_bytes=80, original_file_path=None
+    )
+    path = upload(blob_dir)
+
+    ingested = ingest_service.reuse_ingested(
+        existing, StoredUpload(file_path=path, content_hash=HASH, size=1000)
+    )
+
+    assert ingested.file_path == str(canonical)
+    assert ingested.original_size_bytes == 1000
+    assert not (blob_dir / f"{HASH}.wav").exists()
+
+
+def test_transcode_command_per_codec(monkeypatch):
+    monkeypatch.setattr(ingest_service.settings, "TRANSCODE_BITRATE_KBPS", 24)
+
+    flac = ingest_service.transcode_command("in.mp3", "out.mono.flac", "flac")
+    opus = ingest_service.transcode_command("in.mp3", "out.opus", "opus")
+
+    assert flac[flac.index("-c:a") + 1] == "flac"
+    assert "-b:a" not in flac
+    assert opus[opus.index("-c:a") + 1] == "libopus"
+    assert opus[opus.index("-b:a") + 1] == "24k"
+    assert ingest_service.canonical_extension("opus") == ".opus"
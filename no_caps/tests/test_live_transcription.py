@@ -0,0 +1,175 @@
+# tests/test_live_transcription.py
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pytest
+from fastapi import WebSocketDisconnect
+
+from core.config import settings
+from services.live_transcription import LiveTranscriptionSession, PCM16Decoder
+from services.pcm_cache import SAMPLE_RATE
+from utils.file_handling import StoredUpload
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr("services.live_transcription.INCOMING_DIR", tmp_path)
+    monkeypatch.setattr("services.live_transcription.ensure_upload_dir", lambda: None)
+    monkeypatch.setattr(
+        "services.live_transcription.commit_blob",
+        lambda path, content_hash, ext: path,
+    )
+    session = LiveTranscriptionSession(model_size="tiny")
+    session.window_seconds = 10
+    session.finalize_lag = 2
+    return session
+
+
+def fake_model(monkeypatch, segments):
+    model = mock.MagicMock()
+    model.transcribe.return_value = {"segments": segments}
+    monkeypatch.setattr(
+        "services.live_transcription.model_registry.get_whisper", lambda size: model
+    )
+    return model
+
+
+def seconds(n):
+    return np.zeros(int(n * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_old_segments_are_committed_and_window_slides(session, monkeypatch):
+    """Segments older than the lag become final; the rest is a partial."""
+    fake_model(monkeypatch, [
+        {"start": 0.0, "end": 2.5, "text": " Tell me about"},
+        {"start": 2.5, "end": 5.5, "text": " your last role"},
+    ])
+    session.feed(seconds(6))
+
+    finals, partial = session.step()
+
+    assert [f["text"] for f in finals] == ["Tell me about"]
+    assert partial == {"start": 2.5, "end": 5.5, "text": "your last role"}
+
+    # The next decode starts where the committed segment ended
+    fake_model(monkeypatch, [{"start": 0.0, "end": 3.0, "text": " your last role"}])
+    session.feed(seconds(3))
+    finals, partial = session.step()
+    assert finals[0]["start_time"] == 2.5
+    assert finals[0]["end_time"] == 5.5
+
+
+def test_full_window_forces_progress(session, monkeypatch):
+    """A window that fills up without a stable cut is committed anyway."""
+    fake_model(monkeypatch, [{"start": 0.0, "end": 10.0, "text": " monologue"}])
+    session.feed(seconds(10))
+
+    finals, partial = session.step()
+
+    assert [f["text"] for f in finals] == ["monologue"]
+    assert partial is None
+    assert session.step() == ([], None)
+
+
+def test_finish_commits_tail_and_keeps_recording(session, monkeypatch):
+    fake_model(monkeypatch, [{"start": 0.0, "end": 1.0, "text": " bye"}])
+    session.feed(seconds(1.5))
+
+    finals, stored = session.finish()
+
+    assert [f["text"] for f in finals] == ["bye"]
+    assert session.duration == 1.5
+    assert stored.size > 1.5 * SAMPLE_RATE * 2
+
+
+async def test_pcm16_decoder_carries_odd_bytes():
+    decoder = PCM16Decoder()
+    first = await decoder.decode(b"\x00\x40\x00")
+    second = await decoder.decode(b"\xc0")
+
+    assert first.tolist() == [0.5]
+    assert second.tolist() == [-0.5]
+
+
+def test_disconnect_during_step_still_saves_recording(client, monkeypatch, tmp_path):
+    """A client that drops while a decode step is running loses nothing."""
+    stored = StoredUpload(
+        file_path=str(tmp_path / "live.wav"), content_hash="cd" * 32, size=64
+    )
+    step_started = threading.Event()
+    discarded = []
+
+    class FakeSession:
+        undecoded_seconds = 10.0
+        duration = 2.0
+
+        def __init__(self, language=None):
+            self.final_segments = []
+
+        def feed(self, pcm):
+            pass
+
+        def step(self):
+            step_started.set()
+            time.sleep(0.2)  # still decoding when the client goes away
+            segment = {"speaker": None, "start_time": 0.0, "end_time": 1.0, "text": "hi"}
+            self.final_segments.append(segment)
+            return [segment], None
+
+        def finish(self):
+            return [], stored
+
+        def discard(self):
+            discarded.append(True)
+
+    async def dropped_send(self, data, mode="text"):
+        raise WebSocketDisconnect(code=1006)
+
+    created = {}
+
+    def fake_create_audio(db, **kwargs):
+        created["audio"] = kwargs
+        return SimpleNamespace(id=11)
+
+    def fake_update_content(db, transcription_id, **kwargs):
+        created["content"] = kwargs["content"]
+
+    monkeypatch.setattr(
+        "api.v1.endpoints.live.authenticate_token",
+        lambda token, db: SimpleNamespace(id=1),
+    )
+    save_session = mock.MagicMock()
+    monkeypatch.setattr("api.v1.endpoints.live.SessionLocal", lambda: save_session)
+    monkeypatch.setattr("api.v1.endpoints.live.LiveTranscriptionSession", FakeSession)
+    monkeypatch.setattr("starlette.websockets.WebSocket.send_json", dropped_send)
+    monkeypatch.setattr("db.crud.audio.create_audio", fake_create_audio)
+    monkeypatch.setattr(
+        "db.crud.transcription.TranscriptionCRUD.create_transcription",
+        lambda db, audio_id, language: SimpleNamespace(id=12),
+    )
+    monkeypatch.setattr(
+        "db.crud.transcription.TranscriptionCRUD.update_transcription_content",
+        fake_update_content,
+    )
+
+    with client.websocket_connect(
+        f"{settings.API_V1_STR}/live/ws?token=t&format=pcm16"
+    ) as websocket:
+        websocket.send_bytes(b"\x00\x00" * SAMPLE_RATE)
+        assert step_started.wait(5)
+        # The connection is gone by the time the step tries to send
+        websocket.send_text("stop")
+        deadline = time.monotonic() + 5
+        while "content" not in created and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert not discarded
+    # Saved through a session of its own, off the event loop
+    save_session.close.assert_called_once()
+    assert created["audio"]["file_path"] == stored.file_path
+    assert created["content"] == [
+        {"speaker": None, "start_time": 0.0, "end_time": 1.0, "text": "hi"}
+    ]
@@ -0,0 +1,73 @@
+# tests/test_model_registry.py
+from unittest import mock
+
+import pytest
+
+from services.model_registry import ModelNotFoundError, ModelRegistry
+
+
+def fake_model(n_bytes):
+    """A stand-in model whose parameters add up to n_bytes."""
+    param = mock.MagicMock()
+    param.numel.return_value = n_bytes
+    param.element_size.return_value = 1
+    model = mock.MagicMock()
+    model.parameters.return_value = [param]
+    return model
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    registry = ModelRegistry(artifact_dir=str(tmp_path), memory_budget_mb=2)
+    sizes = {"tiny": 1024 ** 2, "base": 1024 ** 2, "small": 1024 ** 2}
+    loader = mock.MagicMock(side_effect=lambda size: fake_model(sizes[size]))
+    monkeypatch.setattr(registry, "_load_whisper", loader)
+    return registry, loader
+
+
+def test_models_load_lazily_and_are_shared(registry):
+    """Nothing loads until asked for, and repeat lookups reuse the model."""
+    registry, loader = registry
+    assert loader.call_count == 0
+
+    first = registry.get_whisper("tiny")
+    second = registry.get_whisper("tiny")
+
+    assert first is second
+    assert loader.call_count == 1
+
+
+def test_least_recently_used_model_is_evicted(registry):
+    """Loading past the memory budget drops the least recently used size."""
+    registry, loader = registry
+    registry.get_whisper("tiny")
+    registry.get_whisper("base")
+    registry.get_whisper("tiny")  # tiny is now most recently used
+    registry.get_whisper("small")
+
+    assert registry.resident_bytes <= registry.memory_budget_bytes
+    registry.get_whisper("tiny")
+    assert loader.call_count == 3  # tiny survived, no reload
+    registry.get_whisper("base")
+    assert loader.call_count == 4  # base was evicted
+
+
+def test_missing_artifact_never_downloads(tmp_path):
+    """A missing checkpoint is an error, not a network pull."""
+    registry = ModelRegistry(artifact_dir=str(tmp_path))
+    with mock.patch.dict("sys.modules", {"whisper": mock.MagicMock()}):
+        with pytest.raises(ModelNotFoundError):
+            registry.get_whisper("tiny")
+
+
+def test_ready_after_warmup(registry, monkeypatch):
+    """The registry only reports ready once warmup has run."""
+    registry, _ = registry
+    monkeypatch.setattr(registry, "get_diarization_pipeline", mock.MagicMock())
+    monkeypatch.setattr("services.model_registry.pipeline_input", lambda audio: audio)
+    assert registry.ready is False
+
+    registry.warmup(sizes=["tiny"])
+
+    assert registry.ready is True
+    registry.get_whisper("tiny").transcribe.assert_called_once()
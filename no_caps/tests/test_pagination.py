@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 2, 24, 13, 5, 7, 123456)
+    cursor = encode_cursor(created_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, datetime, int) == (created_at, 42)
+
+
+def test_missing_cursor_is_first_page():
+    assert decode_cursor(None, int) is None
+    assert decode_cursor("", int) is None
+
+
+@pytest.mark.parametrize(
+    "cursor", ["not-a-cursor", "!!!", encode_cursor(1, 2), encode_cursor("x")]
+)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, int)
+    assert exc.value.status_code == 400
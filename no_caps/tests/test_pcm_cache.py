@@ -0,0 +1,69 @@
+# tests/test_pcm_cache.py
+import os
+from unittest import mock
+
+import numpy as np
+
+from services.pcm_cache import PCMCache, duration_of
+
+
+def fake_ffmpeg(samples):
+    """Stand-in for the ffmpeg decode that writes raw float32 to the output."""
+    def run(cmd, check, capture_output):
+        out_path = cmd[-1]
+        np.asarray(samples, dtype=np.float32).tofile(out_path)
+    return mock.MagicMock(side_effect=run)
+
+
+def test_decodes_once_and_reuses(tmp_path, monkeypatch):
+    """The first load decodes; later loads map the cached file."""
+    run = fake_ffmpeg(np.linspace(-1, 1, 32000))
+    monkeypatch.setattr("services.pcm_cache.subprocess.run", run)
+    cache = PCMCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+
+    first = cache.load(1, "/uploads/a.mp3")
+    second = cache.load(1, "/uploads/a.mp3")
+
+    assert run.call_count == 1
+    assert isinstance(second, np.memmap)
+    assert duration_of(first) == 2.0
+    np.testing.assert_array_equal(first, second)
+
+
+def test_in_place_writes_never_reach_the_cache(tmp_path, monkeypatch):
+    """Arrays are copy-on-write, so a model mutating its input is harmless."""
+    monkeypatch.setattr("services.pcm_cache.subprocess.run", fake_ffmpeg([0.5] * 16))
+    cache = PCMCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+
+    pcm = cache.load(1, "/uploads/a.mp3")
+    pcm[:] = 0
+
+    assert cache.load(1, "/uploads/a.mp3")[0] == np.float32(0.5)
+
+
+def test_cache_is_pruned_to_budget(tmp_path, monkeypatch):
+    """Old decodes are evicted once the cache grows past its budget."""
+    monkeypatch.setattr("services.pcm_cache.subprocess.run", fake_ffmpeg([0.0] * 256))
+    cache = PCMCache(cache_dir=str(tmp_path), max_bytes=1024 + 512)
+
+    cache.load(1, "/uploads/a.mp3")
+    os.utime(cache.path_for(1), (0, 0))
+    cache.load(2, "/uploads/b.mp3")
+
+    assert not cache.path_for(1).exists()
+    assert cache.path_for(2).exists()
+
+
+def test_decode_reads_through_storage_backend(tmp_path, monkeypatch):
+    """Hosts without the uploads volume decode the backend's local copy."""
+    run = fake_ffmpeg([0.0] * 16)
+    monkeypatch.setattr("services.pcm_cache.subprocess.run", run)
+    storage = mock.MagicMock()
+    storage.local_path.return_value = tmp_path / "cached.mp3"
+    monkeypatch.setattr("services.pcm_cache.get_storage", lambda: storage)
+    cache = PCMCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+
+    cache.load(1, "/uploads/a.mp3")
+
+    storage.local_path.assert_called_once_with("/uploads/a.mp3")
+    assert str(tmp_path / "cached.mp3") in run.call_args[0][0]
@@ -0,0 +1,81 @@
+# tests/test_peaks.py
+import threading
+import time
+
+import numpy as np
+
+from services import peaks as peaks_module
+from services.peaks import (
+    compute_peaks,
+    ensure_peaks,
+    pick_level,
+    read_peak_levels,
+    read_peaks,
+    write_peaks,
+)
+
+
+def naive_peaks(pcm, samples_per_peak):
+    return np.array([
+        [pcm[i:i + samples_per_peak].min(), pcm[i:i + samples_per_peak].max()]
+        for i in range(0, len(pcm), samples_per_peak)
+    ])
+
+
+def test_every_level_matches_a_direct_reduction():
+    rng = np.random.default_rng(0)
+    pcm = rng.uniform(-1, 1, 16 * 1000 + 37).astype(np.float32)
+
+    levels = compute_peaks(pcm, base_samples_per_peak=16, levels=4)
+
+    for index, level in enumerate(levels):
+        expected = naive_peaks(pcm, 16 << index)
+        np.testing.assert_array_equal(
+            level, np.clip(np.round(expected * 127), -127, 127).astype(np.int8)
+        )
+
+
+def test_stops_at_a_single_peak():
+    levels = compute_peaks(np.zeros(64, dtype=np.float32), base_samples_per_peak=16, levels=10)
+
+    assert [len(level) for level in levels] == [4, 2, 1]
+
+
+def test_round_trip_and_zoom_selection(tmp_path):
+    pcm = np.sin(np.linspace(0, 100, 16000 * 60)).astype(np.float32)
+    levels = compute_peaks(pcm, base_samples_per_peak=256, levels=6)
+    path = tmp_path / "a.mp3.peaks"
+
+    write_peaks(path, levels, 256)
+    stored = read_peak_levels(path)
+
+    assert [level.samples_per_peak for level in stored] == [256, 512, 1024, 2048, 4096, 8192]
+    data = read_peaks(path, stored[2])
+    np.testing.assert_array_equal(np.frombuffer(data, dtype=np.int8).reshape(-1, 2), levels[2])
+
+    assert pick_level(stored) is stored[0]
+    assert pick_level(stored, level=99) is stored[-1]
+    # 3750 base peaks: 1000 px needs a level with at least 1000 peaks
+    assert pick_level(stored, width=1000).samples_per_peak == 512
+
+
+def test_concurrent_first_views_compute_once(tmp_path, monkeypatch):
+    loads = []
+
+    def slow_load(audio_id, file_path):
+        loads.append(audio_id)
+        time.sleep(0.1)
+        return np.zeros(16000, dtype=np.float32)
+
+    monkeypatch.setattr(peaks_module.pcm_cache, "load", slow_load)
+    file_path = str(tmp_path / "a.mp3")
+    threads = [
+        threading.Thread(target=ensure_peaks, args=(1, file_path)) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == [1]
+    assert len(peaks_module._locks) == 0
@@ -0,0 +1,97 @@
+# tests/test_range_response.py
+import pytest
+from fastapi import HTTPException
+
+from utils.range_response import (
+    ZEROCOPY_EXTENSION,
+    RangeFileResponse,
+    etag_matches,
+    parse_range,
+)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=990-5000", (990, 999)),
+    ("bytes=0-1,5-9", None),
+    ("items=0-1", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+def test_unsatisfiable_range():
+    with pytest.raises(HTTPException) as exc:
+        parse_range("bytes=1000-", 1000)
+
+    assert exc.value.status_code == 416
+    assert exc.value.headers["Content-Range"] == "bytes */1000"
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+async def run(response, scope):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await response(scope, None, send)
+    return messages
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "a.mp3"
+    path.write_bytes(bytes(range(256)) * 4)
+    return path
+
+
+async def test_range_is_streamed_in_chunks(audio_file):
+    response = RangeFileResponse(
+        str(audio_file), file_size=1024, byte_range=(100, 399), chunk_size=128
+    )
+
+    messages = await run(response, {"type": "http", "method": "GET"})
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert start["status"] == 206
+    assert headers[b"content-range"] == b"bytes 100-399/1024"
+    assert headers[b"content-length"] == b"300"
+    assert [len(m["body"]) for m in bodies] == [128, 128, 44]
+    assert b"".join(m["body"] for m in bodies) == audio_file.read_bytes()[100:400]
+    assert bodies[-1]["more_body"] is False
+
+
+async def test_zero_copy_extension_gets_the_file(audio_file):
+    response = RangeFileResponse(str(audio_file), file_size=1024)
+    scope = {"type": "http", "method": "GET", "extensions": {ZEROCOPY_EXTENSION: {}}}
+
+    messages = await run(response, scope)
+
+    assert messages[0]["status"] == 200
+    assert messages[1]["type"] == ZEROCOPY_EXTENSION
+    assert (messages[1]["offset"], messages[1]["count"]) == (0, 1024)
+
+
+async def test_head_sends_no_body(audio_file):
+    response = RangeFileResponse(str(audio_file), file_size=1024)
+
+    messages = await run(response, {"type": "http", "method": "HEAD"})
+
+    assert messages[1]["body"] == b""
+    assert dict(messages[0]["headers"])[b"content-length"] == b"1024"
@@ -0,0 +1,130 @@
+# tests/test_renditions.py
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from services import renditions
+from services.renditions import (
+    CURRENT_NAME,
+    PLAYLIST_NAME,
+    _turn_starts,
+    current_rendition,
+    ensure_rendition,
+    plan_cuts,
+    rendition_dir_for,
+)
+
+
+def test_nominal_cuts_without_turns():
+    assert plan_cuts(20.0, [], segment_seconds=6, snap_seconds=2) == [6.0, 12.0]
+
+
+def test_cuts_snap_to_the_nearest_speaker_change():
+    turns = [0.0, 4.5, 7.2, 13.9, 30.0]
+
+    cuts = plan_cuts(25.0, turns, segment_seconds=6, snap_seconds=2)
+
+    # 6 -> 7.2 (nearest change within 2s), 13.2 -> 13.9, 19.9 has none
+    assert cuts == [7.2, 13.9, 19.9]
+
+
+def test_segments_never_shrink_below_half_length():
+    # A change 1s after the previous cut is not a usable boundary
+    cuts = plan_cuts(20.0, [5.0, 7.0], segment_seconds=6, snap_seconds=4)
+
+    assert cuts[0] == 5.0
+    assert cuts[1] - cuts[0] >= 3
+
+
+def test_short_tail_is_folded_into_the_last_segment():
+    assert plan_cuts(13.0, [], segment_seconds=6, snap_seconds=2) == [6.0]
+
+
+def test_turn_starts_are_speaker_changes_only():
+    segments = [
+        {"speaker": "A", "start_time": 0.0},
+        {"speaker": "A", "start_time": 3.0},
+        {"speaker": "B", "start_time": 5.5},
+        {"speaker": "A", "start_time": 9.0},
+    ]
+
+    assert _turn_starts(segments) == [0.0, 5.5, 9.0]
+
+
+@pytest.fixture
+def fake_build(monkeypatch, tmp_path):
+    """ffmpeg stand-in writing a playlist with the requested entry prefix."""
+    monkeypatch.setattr(
+        renditions.pcm_cache, "load",
+        lambda audio_id, path: np.zeros(16000 * 20, dtype=np.float32),
+    )
+    monkeypatch.setattr(renditions.pcm_cache, "cache_dir", tmp_path / "pcm")
+    builds = []
+
+    def run(cmd, check, capture_output):
+        prefix = cmd[cmd.index("-segment_list_entry_prefix") + 1]
+        out_dir = renditions.Path(cmd[-1]).parent
+        (out_dir / "seg_00000.ts").write_bytes(b"ts")
+        (out_dir / PLAYLIST_NAME).write_text(f"#EXTM3U\n{prefix}seg_00000.ts\n")
+        builds.append(prefix)
+
+    monkeypatch.setattr(renditions.subprocess, "run", run)
+    return builds
+
+
+def test_rendition_is_rebuilt_once_turns_are_known(fake_build, tmp_path):
+    """A turn-less build is replaced, not rebuilt again for the same turns."""
+    file_path = str(tmp_path / "a.opus")
+    turns = [{"speaker": "A", "start_time": 0.0}, {"speaker": "B", "start_time": 7.0}]
+
+    first = ensure_rendition(1, file_path)
+    assert ensure_rendition(1, file_path) == first
+    second = ensure_rendition(1, file_path, turns)
+    assert ensure_rendition(1, file_path, turns) == second
+
+    assert len(fake_build) == 2
+    assert current_rendition(file_path) == second
+    playlist = (second / PLAYLIST_NAME).read_text()
+    assert f"{second.name}/seg_00000.ts" in playlist
+    # Clients still playing the first build keep its segments
+    assert (first / "seg_00000.ts").exists()
+
+
+def test_publishing_keeps_only_current_and_previous_builds(fake_build, tmp_path):
+    file_path = str(tmp_path / "a.opus")
+
+    builds = [ensure_rendition(1, file_path, rebuild=True) for _ in range(3)]
+
+    root = rendition_dir_for(file_path)
+    assert (root / CURRENT_NAME).read_text() == builds[2].name
+    assert not builds[0].exists()
+    assert builds[1].exists()
+    assert sorted(p.name for p in root.iterdir()) == sorted(
+        [CURRENT_NAME, builds[1].name, builds[2].name]
+    )
+
+
+def test_concurrent_first_plays_build_once(fake_build, tmp_path, monkeypatch):
+    def slow_load(audio_id, path):
+        time.sleep(0.1)
+        return np.zeros(16000 * 20, dtype=np.float32)
+
+    monkeypatch.setattr(renditions.pcm_cache, "load", slow_load)
+    file_path = str(tmp_path / "a.opus")
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(ensure_rendition(1, file_path))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_build) == 1
+    assert len(set(results)) == 1
+    assert len(renditions._locks) == 0
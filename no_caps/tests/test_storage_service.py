@@ -0,0 +1,102 @@
+# tests/test_storage_service.py
+from unittest import mock
+
+import pytest
+
+from services import storage_service
+from services.storage_service import LocalStorage, ReadThroughCache, S3Storage
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    root = tmp_path / "uploads"
+    (root / "blobs" / "ab").mkdir(parents=True)
+    monkeypatch.setattr(storage_service, "UPLOAD_DIR", root)
+    return root
+
+
+class FakeS3:
+    """Local stand-in for an S3 bucket: objects are kept in a dict."""
+
+    def __init__(self):
+        self.objects = {}
+        self.downloads = 0
+
+    def upload_file(self, file_path, bucket, key, Config=None):
+        with open(file_path, "rb") as f:
+            self.objects[(bucket, key)] = f.read()
+
+    def download_file(self, bucket, key, destination, Config=None):
+        self.downloads += 1
+        with open(destination, "wb") as f:
+            f.write(self.objects[(bucket, key)])
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+@pytest.fixture
+def s3(upload_dir, tmp_path):
+    client = FakeS3()
+    cache = ReadThroughCache(str(tmp_path / "cache"), max_bytes=10 ** 9)
+    return S3Storage("bucket", client=client, cache=cache)
+
+
+def test_local_storage_reads_in_place(upload_dir):
+    path = upload_dir / "blobs" / "ab" / "ab1.mp3"
+    path.write_bytes(b"audio")
+
+    assert LocalStorage().local_path(str(path)) == path
+
+
+def test_s3_store_uses_key_relative_to_uploads(s3, upload_dir):
+    path = upload_dir / "blobs" / "ab" / "ab1.mp3"
+    path.write_bytes(b"audio")
+
+    s3.store(str(path))
+
+    assert s3.client.objects[("bucket", "blobs/ab/ab1.mp3")] == b"audio"
+
+
+def test_s3_reads_are_downloaded_once_per_host(s3, upload_dir):
+    path = upload_dir / "blobs" / "ab" / "ab1.mp3"
+    path.write_bytes(b"audio")
+    s3.store(str(path))
+    path.unlink()  # as seen from a worker without the uploads volume
+
+    first = s3.local_path(str(path))
+    second = s3.local_path(str(path))
+
+    assert first == second
+    assert first.read_bytes() == b"audio"
+    assert s3.client.downloads == 1
+    assert (s3.cache.hits, s3.cache.misses) == (1, 1)
+
+
+def test_s3_reads_local_file_when_present(s3, upload_dir):
+    path = upload_dir / "blobs" / "ab" / "ab1.mp3"
+    path.write_bytes(b"audio")
+
+    assert s3.local_path(str(path)) == path
+    assert s3.client.downloads == 0
+
+
+def test_failed_download_leaves_nothing_behind(s3, upload_dir):
+    s3.client.download_file = mock.MagicMock(side_effect=OSError("no such key"))
+
+    with pytest.raises(RuntimeError):
+        s3.local_path(str(upload_dir / "blobs" / "ab" / "missing.mp3"))
+
+    assert not list(s3.cache.cache_dir.glob("*.*"))
+
+
+def test_cache_drops_locks_once_reads_finish(s3, upload_dir):
+    path = upload_dir / "blobs" / "ab" / "ab1.mp3"
+    path.write_bytes(b"audio")
+    s3.store(str(path))
+    path.unlink()
+
+    s3.local_path(str(path))
+    s3.local_path(str(path))
+
+    assert len(s3.cache._locks) == 0
@@ -0,0 +1,44 @@
+from db.crud.transcript_segment import transcript_segment_rows
+
+
+def test_rows_follow_content_order_and_keys():
+    content = [
+        {"speaker": "SPEAKER_00", "start_time": 0.0, "end_time": 2.5, "text": "Hello"},
+        {"speaker": "SPEAKER_01", "start_time": 2.5, "end_time": 4, "text": "Hi"},
+    ]
+
+    rows = transcript_segment_rows(7, content)
+
+    assert rows == [
+        {"transcription_id": 7, "position": 0, "start_time": 0.0,
+         "end_time": 2.5, "speaker": "SPEAKER_00", "text": "Hello"},
+        {"transcription_id": 7, "position": 1, "start_time": 2.5,
+         "end_time": 4.0, "speaker": "SPEAKER_01", "text": "Hi"},
+    ]
+
+
+def test_rows_from_segments_document():
+    content = {"text": "a b", "segments": [{"start": 0.0, "end": 1.0, "text": "a b"}]}
+
+    rows = transcript_segment_rows(1, content)
+
+    assert len(rows) == 1
+    assert rows[0]["start_time"] == 0.0
+    assert rows[0]["speaker"] is None
+
+
+def test_untimed_items_are_skipped_but_keep_positions():
+    content = [
+        {"text": "no times"},
+        "not a segment",
+        {"start_time": 5.0, "end_time": 6.0, "text": None},
+    ]
+
+    rows = transcript_segment_rows(1, content)
+
+    assert [(row["position"], row["text"]) for row in rows] == [(2, "")]
+
+
+def test_no_content_no_rows():
+    assert transcript_segment_rows(1, None) == []
+    assert transcript_segment_rows(1, []) == []
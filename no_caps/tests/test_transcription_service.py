@@ -1,4 +1,6 @@
 # tests/test_transcription_service.py
+import threading
+import numpy as np
 import pytest
 from unittest import mock
 from fastapi import HTTPException, status
@@ -130,3 +132,213 @@ class TestTranscriptionService:
             mock_get_audio.assert_called_once_with(
                 mock_db, audio_id=mock_transcription.audio_id, user_id=999
             )
+
+    def test_stages_run_concurrently(
+        self, transcription_service, mock_db, monkeypatch
+    ):
+        """Diarization and transcription overlap instead of running back-to-back."""
+        both_running = threading.Barrier(2, timeout=5)
+
+        def diarize(audio_path):
+            both_running.wait()
+            diarization = mock.MagicMock()
+            diarization.itertracks.return_value = []
+            return diarization
+
+        def transcribe(audio_path, **kwargs):
+            both_running.wait()
+            return {"segments": []}
+
+        registry = mock.MagicMock()
+        registry.get_diarization_pipeline.return_value = diarize
+        registry.get_whisper.return_value.transcribe = transcribe
+        transcription_service.registry = registry
+
+        monkeypatch.setattr("services.transcription_service.os.path.exists", lambda p: True)
+        monkeypatch.setattr(
+            "services.transcription_service.pcm_cache.load",
+            lambda audio_id, path: np.zeros(16000, dtype=np.float32),
+        )
+        monkeypatch.setattr(
+            "services.transcription_service.pipeline_input", lambda pcm: pcm
+        )
+        update_status = mock.MagicMock()
+        update_content = mock.MagicMock()
+        monkeypatch.setattr(
+            "services.transcription_service.TranscriptionCRUD.start_transcription",
+            mock.MagicMock(),
+        )
+        monkeypatch.setattr(
+            "services.transcription_service.TranscriptionCRUD.update_transcription_status",
+            update_status,
+        )
+        monkeypatch.setattr(
+            "services.transcription_service.TranscriptionCRUD.update_transcription_content",
+            update_content,
+        )
+
+        append_segments = mock.MagicMock()
+        monkeypatch.setattr(
+            "services.transcription_service.TranscriptionCRUD.append_transcription_segments",
+            append_segments,
+        )
+
+        success, error = transcription_service.process_transcription(
+            mock_db, 1, "/path/to/test_audio.mp3"
+        )
+
+        # A sequential pipeline would break the barrier and fail the job
+        assert (success, error) == (True, None)
+        update_content.assert_called_once()
+        # Transcribed segments were persisted before the final merge
+        append_segments.assert_called_once_with(
+            mock_db, 1, [], processed_seconds=1.0, total_seconds=1.0
+        )
+
+    def test_concurrent_jobs_share_a_whisper_batch(
+        self, transcription_service, monkeypatch
+    ):
+        """Short clips of jobs running at once are decoded in one pass."""
+        monkeypatch.setitem(__import__("sys").modules, "torch", mock.MagicMock())
+        monkeypatch.setattr("core.config.settings.WHISPER_BATCHING_ENABLED", True)
+        monkeypatch.setattr("core.config.settings.WHISPER_BATCH_MAX_CLIP_SECONDS", 30)
+        scheduler = transcription_service.batch_scheduler
+        monkeypatch.setattr(scheduler, "batch_size", 2)
+        monkeypatch.setattr(scheduler, "max_wait", 5)
+        monkeypatch.setattr(scheduler, "_features", lambda window: len(window))
+        infer = mock.MagicMock(side_effect=lambda features: [
+            ("en", [{"start": 0.0, "end": 1.0, "text": " hi"}]) for _ in features
+        ])
+        monkeypatch.setattr(scheduler, "_infer", infer)
+
+        diarization = mock.MagicMock()
+        diarization.itertracks.return_value = []
+        registry = mock.MagicMock()
+        registry.get_diarization_pipeline.return_value = lambda audio: diarization
+        transcription_service.registry = registry
+
+        monkeypatch.setattr("services.transcription_service.os.path.exists", lambda p: True)
+        monkeypatch.setattr(
+            "services.transcription_service.pcm_cache.load",
+            lambda audio_id, path: np.zeros(16000, dtype=np.float32),
+        )
+        monkeypatch.setattr(
+            "services.transcription_service.pipeline_input", lambda pcm: pcm
+        )
+        for name in (
+            "start_transcription",
+            "update_transcription_status",
+            "update_transcription_content",
+            "append_transcription_segments",
+        ):
+            monkeypatch.setattr(
+                f"services.transcription_service.TranscriptionCRUD.{name}",
+                mock.MagicMock(),
+            )
+
+        outcomes = {}
+
+        def run(transcription_id):
+            outcomes[transcription_id] = transcription_service.process_transcription(
+                mock.MagicMock(spec=Session), transcription_id, "/path/to/a.mp3"
+            )
+
+        jobs = [threading.Thread(target=run, args=(tid,)) for tid in (1, 2)]
+        for job in jobs:
+            job.start()
+        for job in jobs:
+            job.join(10)
+
+        assert outcomes == {1: (True, None), 2: (True, None)}
+        assert infer.call_count == 1
+        assert len(infer.call_args.args[0]) == 2
+
+    def test_job_start_drops_an_earlier_attempts_segments(
+        self, mock_db, mock_transcription, monkeypatch
+    ):
+        """A redelivered job does not show the dead attempt's segments."""
+        from db.crud.transcription import TranscriptionCRUD
+
+        mock_transcription.status = TranscriptionStatus.IN_PROGRESS
+        mock_transcription.progress = 60.0
+        mock_transcription.processed_seconds = 300.0
+        monkeypatch.setattr(
+            "db.crud.transcription.TranscriptionCRUD.get_transcription",
+            lambda db, tid: mock_transcription,
+        )
+        replace_segments = mock.MagicMock()
+        monkeypatch.setattr(
+            "db.crud.transcription.replace_transcript_segments", replace_segments
+        )
+
+        TranscriptionCRUD.start_transcription(mock_db, 1)
+
+        replace_segments.assert_called_once_with(mock_db, 1, None)
+        assert mock_transcription.status == TranscriptionStatus.IN_PROGRESS
+        assert mock_transcription.progress == 0.0
+        assert mock_transcription.processed_seconds is None
+        mock_db.commit.assert_called_once()
+
+    def test_partial_segments_are_persisted_incrementally(
+        self, transcription_service, mock_db, monkeypatch
+    ):
+        """Queued chunk output is flushed as speaker-less segments with progress."""
+        import queue
+
+        append_segments = mock.MagicMock()
+        monkeypatch.setattr(
+            "services.transcription_service.TranscriptionCRUD.append_transcription_segments",
+            append_segments,
+        )
+        produced = queue.Queue()
+        produced.put(([{"start": 0.0, "end": 2.0, "text": " first"}], 60.0))
+        produced.put(([{"start": 60.0, "end": 61.0, "text": " second"}], 120.0))
+
+        transcription_service._persist_partial_segments(mock_db, 1, produced, 240.0)
+
+        append_segments.assert_called_once_with(
+            mock_db,
+            1,
+            [
+                {"speaker": None, "start_time": 0.0, "end_time": 2.0, "text": "first"},
+                {"speaker": None, "start_time": 60.0, "end_time": 61.0, "text": "second"},
+            ],
+            processed_seconds=120.0,
+            total_seconds=240.0,
+        )
+
+    def test_reuse_completed_transcription(
+        self, transcription_service, mock_db, mock_transcription, mock_audio, monkeypatch
+    ):
+        """A finished transcription of identical bytes is copied, not recomputed."""
+        mock_audio.content_hash = "ab" * 32
+        mock_audio.user_id = 7
+        lookups = []
+        source = mock.MagicMock(spec=Transcription)
+        source.id = 99
+        source.content = [{"speaker": "SPEAKER_00", "text": "hi"}]
+        monkeypatch.setattr(
+            "services.transcription_service.TranscriptionCRUD.get_completed_transcription_by_hash",
+            lambda db, content_hash, user_id: lookups.append(user_id) or source,
+        )
+        update_content = mock.MagicMock()
+        monkeypatch.setattr(
+            "services.transcription_service.TranscriptionCRUD.update_transcription_content",
+            update_content,
+        )
+
+        assert transcription_service.reuse_completed_transcription(
+            mock_db, mock_transcription, mock_audio
+        ) is True
+        assert update_content.call_args.kwargs["content"] == source.content
+        # Only the owner's own transcripts are candidates
+        assert lookups == [7]
+
+        # Nothing to reuse for content that has never been transcribed
+        monkeypatch.setattr(
+            "services.transcription_service.TranscriptionCRUD.get_completed_transcription_by_hash",
+            lambda db, content_hash, user_id: None,
+        )
+        assert transcription_service.reuse_completed_transcription(
+            mock_db, mock_transcription, mock_audio
+        ) is False
@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 from unittest import mock
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
@@ -80,6 +81,18 @@ def setup_auth_mocks(monkeypatch, mock_user):
         lambda db, email: mock_user if email == mock_user.email else None,
     )
 
+    monkeypatch.setattr(
+        "core.auth.get_user_by_email",
+        lambda db, email: mock_user if email == mock_user.email else None,
+    )
+
+    async def mock_get_user_by_email_async(db, email):
+        return mock_user if email == mock_user.email else None
+
+    monkeypatch.setattr(
+        "core.auth.get_user_by_email_async", mock_get_user_by_email_async
+    )
+
     # Override the dependency
     async def override_get_current_user():
         return mock_user
@@ -121,7 +134,14 @@ def test_create_transcription(
     )
 
     monkeypatch.setattr(
-        "fastapi.BackgroundTasks.add_task", lambda self, func, *args, **kwargs: None
+        "services.transcription_service.TranscriptionService.reuse_completed_transcription",
+        lambda *args, **kwargs: False,
+    )
+
+    enqueued = []
+    monkeypatch.setattr(
+        "api.v1.endpoints.transcription.process_transcription_task.delay",
+        lambda *args, **kwargs: enqueued.append(args),
     )
 
     # Make request
@@ -134,6 +154,7 @@ def test_create_transcription(
     data = response.json()
     assert data["transcription_id"] == 1
     assert data["status"] == "pending"
+    assert enqueued == [(1, mock_audio.file_path)]
 
 
 def test_get_transcription_completed(
@@ -143,16 +164,23 @@ def test_get_transcription_completed(
     # Set up authentication mocks
     setup_auth_mocks(monkeypatch, mock_user)
 
-    # Mock transcription retrieval
+    # Mock the status lookup: the transcription and its owner's id
+    async def mock_get_transcription_status(*args, **kwargs):
+        return mock_completed_transcription, mock_user.id
+
     monkeypatch.setattr(
-        "db.crud.transcription.TranscriptionCRUD.get_transcription",
-        lambda *args, **kwargs: mock_completed_transcription,
+        "db.crud.transcription.TranscriptionCRUD.get_transcription_status_async",
+        mock_get_transcription_status,
     )
 
-    # Mock access permission
+    loaded = []
+
+    async def mock_load_content(db, transcription):
+        loaded.append(transcription.id)
+
     monkeypatch.setattr(
-        "services.transcription_service.TranscriptionService.has_access_to_transcription",
-        lambda *args, **kwargs: True,
+        "db.crud.transcription.TranscriptionCRUD.load_content_async",
+        mock_load_content,
     )
 
     # Make request with headers
@@ -169,6 +197,117 @@ def test_get_transcription_completed(
     assert data["content"]["text"] == "This is a test transcription."
     assert data["word_count"] == 5
     assert data["confidence_score"] == 0.95
+    assert loaded == [mock_completed_transcription.id]
+
+
+def test_get_transcription_pending_skips_content(
+    client, monkeypatch, mock_user, mock_transcription, auth_headers
+):
+    """Polling a pending transcription never loads its content."""
+    setup_auth_mocks(monkeypatch, mock_user)
+
+    async def mock_get_transcription_status(*args, **kwargs):
+        return mock_transcription, mock_user.id
+
+    monkeypatch.setattr(
+        "db.crud.transcription.TranscriptionCRUD.get_transcription_status_async",
+        mock_get_transcription_status,
+    )
+
+    async def mock_load_content(db, transcription):
+        raise AssertionError("content loaded for a pending transcription")
+
+    monkeypatch.setattr(
+        "db.crud.transcription.TranscriptionCRUD.load_content_async",
+        mock_load_content,
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/transcriptions/transcription/1", headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "pending"
+    assert "content" not in data
+
+
+def test_get_transcription_in_progress_reads_flushed_segments(
+    client, monkeypatch, mock_user, mock_transcription, auth_headers
+):
+    """A running job's segments come from the segment rows, not the document."""
+    setup_auth_mocks(monkeypatch, mock_user)
+    mock_transcription.status = TranscriptionStatus.IN_PROGRESS
+    mock_transcription.progress = 40.0
+    mock_transcription.processed_seconds = 120.0
+
+    async def mock_get_transcription_status(*args, **kwargs):
+        return mock_transcription, mock_user.id
+
+    rows = [
+        SimpleNamespace(
+            position=n, speaker=None, start_time=2.0 * n, end_time=2.0 * n + 2,
+            text="so far",
+        )
+        for n in range(3)
+    ]
+
+    async def mock_list_segments(db, transcription_id, limit, **filters):
+        return rows[:limit]
+
+    async def mock_load_content(db, transcription):
+        raise AssertionError("content loaded for a running transcription")
+
+    monkeypatch.setattr(
+        "db.crud.transcription.TranscriptionCRUD.get_transcription_status_async",
+        mock_get_transcription_status,
+    )
+    monkeypatch.setattr(
+        "api.v1.endpoints.transcription.list_transcript_segments_async",
+        mock_list_segments,
+    )
+    monkeypatch.setattr(
+        "db.crud.transcription.TranscriptionCRUD.load_content_async",
+        mock_load_content,
+    )
+    monkeypatch.setattr(
+        "api.v1.endpoints.transcription.STATUS_SEGMENTS_LIMIT", 2
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/transcriptions/transcription/1", headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["progress"] == 40.0
+    # Capped; the rest is paged from /segments
+    assert data["segments"] == [
+        {"speaker": None, "start_time": 0.0, "end_time": 2.0, "text": "so far"},
+        {"speaker": None, "start_time": 2.0, "end_time": 4.0, "text": "so far"},
+    ]
+    assert data["segments_next_cursor"]
+
+
+def test_get_transcription_other_users(
+    client, monkeypatch, mock_user, mock_transcription, auth_headers
+):
+    """A transcription of someone else's audio is forbidden."""
+    setup_auth_mocks(monkeypatch, mock_user)
+
+    async def mock_get_transcription_status(*args, **kwargs):
+        return mock_transcription, mock_user.id + 1
+
+    monkeypatch.setattr(
+        "db.crud.transcription.TranscriptionCRUD.get_transcription_status_async",
+        mock_get_transcription_status,
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/transcriptions/transcription/1", headers=auth_headers
+    )
+
+    assert response.status_code == 403
 
 
 def test_update_transcription(
@@ -221,15 +360,77 @@ def test_update_transcription(
     assert data["status"] == "completed"
 
 
+def test_get_transcription_segments(
+    client, monkeypatch, mock_user, mock_completed_transcription, auth_headers
+):
+    """Segments come from the segment table, filtered and paged."""
+    setup_auth_mocks(monkeypatch, mock_user)
+
+    async def mock_get_transcription_status(*args, **kwargs):
+        return mock_completed_transcription, mock_user.id
+
+    monkeypatch.setattr(
+        "db.crud.transcription.TranscriptionCRUD.get_transcription_status_async",
+        mock_get_transcription_status,
+    )
+
+    segments = [
+        SimpleNamespace(
+            position=i, speaker="SPEAKER_00", start_time=i * 10.0,
+            end_time=i * 10.0 + 10, text=f"segment {i}",
+        )
+        for i in range(3)
+    ]
+    calls = []
+
+    async def mock_list_segments(db, transcription_id, limit, **filters):
+        calls.append((transcription_id, limit, filters))
+        return segments[:limit]
+
+    monkeypatch.setattr(
+        "api.v1.endpoints.transcription.list_transcript_segments_async",
+        mock_list_segments,
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/transcriptions/transcription/2/segments"
+        "?start=5&end=25&speaker=SPEAKER_00&limit=2",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["position"] for item in data["items"]] == [0, 1]
+    assert data["items"][0] == {
+        "position": 0, "speaker": "SPEAKER_00", "start_time": 0.0,
+        "end_time": 10.0, "text": "segment 0",
+    }
+    assert data["next_cursor"]
+    assert calls[0] == (2, 3, {
+        "start": 5.0, "end": 25.0, "speaker": "SPEAKER_00", "after_position": None,
+    })
+
+    # The cursor resumes after the last segment of the first page
+    client.get(
+        f"{settings.API_V1_STR}/transcriptions/transcription/2/segments"
+        f"?limit=2&cursor={data['next_cursor']}",
+        headers=auth_headers,
+    )
+    assert calls[1][2]["after_position"] == 1
+
+
 def test_get_transcription_not_found(client, monkeypatch, mock_user, auth_headers):
     """Test getting a non-existent transcription."""
     # Set up authentication mocks
     setup_auth_mocks(monkeypatch, mock_user)
 
     # Mock transcription retrieval to return None
+    async def mock_get_transcription_status(*args, **kwargs):
+        return None
+
     monkeypatch.setattr(
-        "db.crud.transcription.TranscriptionCRUD.get_transcription",
-        lambda *args, **kwargs: None,
+        "db.crud.transcription.TranscriptionCRUD.get_transcription_status_async",
+        mock_get_transcription_status,
     )
 
     # Make request with headers
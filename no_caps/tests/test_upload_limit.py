@@ -0,0 +1,59 @@
+# tests/test_upload_limit.py
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from middleware.upload_limit import MULTIPART_OVERHEAD_BYTES, UploadLimitMiddleware
+
+LIMIT = 1024
+
+
+@pytest.fixture
+def limited_client():
+    app = FastAPI()
+    received = []
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            received.append(len(chunk))
+        return {"size": size}
+
+    app.add_middleware(UploadLimitMiddleware, max_bytes=LIMIT)
+    client = TestClient(app)
+    client.received = received
+    return client
+
+
+def chunks(count, size):
+    for _ in range(count):
+        yield b"x" * size
+
+
+def test_body_within_limit_passes(limited_client):
+    response = limited_client.post("/echo", content=b"x" * LIMIT)
+
+    assert response.status_code == 200
+    assert response.json() == {"size": LIMIT}
+
+
+def test_declared_length_over_limit_is_rejected_unread(limited_client):
+    body = b"x" * (LIMIT + MULTIPART_OVERHEAD_BYTES + 1)
+
+    response = limited_client.post("/echo", content=body)
+
+    assert response.status_code == 413
+    assert limited_client.received == []
+
+
+def test_chunked_body_is_cut_off_at_the_limit(limited_client):
+    """Without a Content-Length the body is counted as it streams in."""
+    chunk = 16 * 1024
+    total = LIMIT + MULTIPART_OVERHEAD_BYTES
+
+    response = limited_client.post("/echo", content=chunks(10, chunk))
+
+    assert response.status_code == 413
+    assert sum(limited_client.received) <= total
@@ -0,0 +1,158 @@
+# tests/test_upload_service.py
+import hashlib
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from fastapi import HTTPException
+
+from services import upload_service
+
+WAV = b"RIFF\x24\x00\x00\x00WAVEfmt " + bytes(range(88))
+
+
+@pytest.fixture(autouse=True)
+def incoming_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_service, "INCOMING_DIR", tmp_path)
+    monkeypatch.setattr(upload_service, "ensure_upload_dir", lambda: None)
+    monkeypatch.setattr(
+        upload_service.upload_crud,
+        "advance_upload_offset",
+        mock.MagicMock(side_effect=lambda db, upload_id, old, new: _advance(new)),
+    )
+    return tmp_path
+
+
+_sessions = {}
+
+
+def _advance(new_offset):
+    _sessions["current"].received_bytes = new_offset
+    return True
+
+
+def make_upload(tmp_path, data):
+    path = tmp_path / "u1.part.wav"
+    upload_service._preallocate(path, len(data))
+    upload = SimpleNamespace(
+        id="u1",
+        filename="call.wav",
+        total_bytes=len(data),
+        received_bytes=0,
+        tmp_path=str(path),
+    )
+    _sessions["current"] = upload
+    return upload
+
+
+async def stream(*pieces):
+    for piece in pieces:
+        yield piece
+
+
+async def test_chunks_are_written_in_place(incoming_dir):
+    upload = make_upload(incoming_dir, WAV)
+    db = mock.MagicMock()
+
+    await upload_service.write_chunk(db, upload, 0, stream(WAV[:40], WAV[40:64]))
+    await upload_service.write_chunk(db, upload, 64, stream(WAV[64:]))
+
+    assert upload.received_bytes == len(WAV)
+    assert open(upload.tmp_path, "rb").read() == WAV
+
+
+async def test_chunk_at_wrong_offset_conflicts(incoming_dir):
+    upload = make_upload(incoming_dir, WAV)
+
+    with pytest.raises(HTTPException) as exc:
+        await upload_service.write_chunk(mock.MagicMock(), upload, 10, stream(WAV[10:]))
+
+    assert exc.value.status_code == 409
+
+
+async def test_first_chunk_must_look_like_audio(incoming_dir):
+    upload = make_upload(incoming_dir, WAV)
+
+    with pytest.raises(HTTPException) as exc:
+        await upload_service.write_chunk(
+            mock.MagicMock(), upload, 0, stream(b"<html>" + bytes(94))
+        )
+
+    assert exc.value.status_code == 400
+    assert upload.received_bytes == 0
+
+
+async def test_content_check_waits_for_enough_leading_bytes(incoming_dir):
+    """A first chunk shorter than the sniff window is checked once it fills."""
+    upload = make_upload(incoming_dir, WAV)
+    db = mock.MagicMock()
+
+    await upload_service.write_chunk(db, upload, 0, stream(WAV[:3], WAV[3:5]))
+    await upload_service.write_chunk(db, upload, 5, stream(WAV[5:]))
+
+    assert upload.received_bytes == len(WAV)
+
+
+async def test_short_leading_chunk_of_non_audio_is_rejected(incoming_dir):
+    html = b"<html><body>" + bytes(88)
+    upload = make_upload(incoming_dir, html)
+    db = mock.MagicMock()
+    await upload_service.write_chunk(db, upload, 0, stream(html[:4]))
+
+    with pytest.raises(HTTPException) as exc:
+        await upload_service.write_chunk(db, upload, 4, stream(html[4:]))
+
+    assert exc.value.status_code == 400
+    assert upload.received_bytes == 4
+
+
+def test_stale_uploads_are_expired_with_their_files(incoming_dir, monkeypatch):
+    upload = make_upload(incoming_dir, WAV)
+    monkeypatch.setattr(
+        upload_service.upload_crud, "list_stale_upload_sessions",
+        lambda db, before: [upload],
+    )
+    delete = mock.MagicMock()
+    monkeypatch.setattr(upload_service.upload_crud, "delete_upload_session", delete)
+
+    assert upload_service.expire_stale_uploads(mock.MagicMock()) == 1
+
+    delete.assert_called_once()
+    assert not (incoming_dir / "u1.part.wav").exists()
+
+
+async def test_finalize_moves_file_and_creates_audio(incoming_dir, monkeypatch):
+    upload = make_upload(incoming_dir, WAV)
+    await upload_service.write_chunk(mock.MagicMock(), upload, 0, stream(WAV))
+    committed = {}
+
+    def fake_commit(tmp_path, content_hash, extension):
+        committed["args"] = (tmp_path, content_hash, extension)
+        return incoming_dir / f"{content_hash}{extension}"
+
+    monkeypatch.setattr(upload_service, "commit_blob", fake_commit)
+    register = mock.AsyncMock(return_value=SimpleNamespace(id=7))
+    monkeypatch.setattr(upload_service, "register_stored_audio", register)
+    monkeypatch.setattr(upload_service.upload_crud, "delete_upload_session", mock.MagicMock())
+
+    audio = await upload_service.finalize_upload(
+        mock.MagicMock(), upload, SimpleNamespace(id=3)
+    )
+
+    digest = hashlib.sha256(WAV).hexdigest()
+    assert audio.id == 7
+    assert committed["args"][1:] == (digest, ".wav")
+    stored = register.call_args.args[2]
+    assert stored.content_hash == digest
+    assert stored.size == len(WAV)
+
+
+async def test_finalize_refuses_incomplete_upload(incoming_dir):
+    upload = make_upload(incoming_dir, WAV)
+
+    with pytest.raises(HTTPException) as exc:
+        await upload_service.finalize_upload(
+            mock.MagicMock(), upload, SimpleNamespace(id=3)
+        )
+
+    assert exc.value.status_code == 409
@@ -12,7 +12,9 @@ def test_create_user(client):
     logger.debug("\n=== Starting test_create_user ===")
 
     # Verify routes are registered
-    routes = [f"{route.methods} {route.path}" for route in client.app.routes]
+    routes = [
+        f"{getattr(route, 'methods', 'WS')} {route.path}" for route in client.app.routes
+    ]
     logger.debug(f"Available routes: {json.dumps(routes, indent=2)}")
 
     test_user = {"email": "test@example.com", "password": "password123"}
@@ -0,0 +1,98 @@
+# tests/test_whisper_batching.py
+import threading
+from unittest import mock
+
+import numpy as np
+
+from services.pcm_cache import SAMPLE_RATE
+from services.whisper_batching import (
+    WhisperBatchScheduler,
+    _segments_from_tokens,
+)
+
+
+def make_scheduler(monkeypatch, batch_size=4, max_wait_ms=1000):
+    scheduler = WhisperBatchScheduler(
+        mock.MagicMock(), batch_size=batch_size, max_wait_ms=max_wait_ms
+    )
+    monkeypatch.setattr(scheduler, "_features", lambda window: len(window))
+    monkeypatch.setitem(__import__("sys").modules, "torch", mock.MagicMock())
+    return scheduler
+
+
+def test_windows_from_concurrent_jobs_share_a_batch(monkeypatch):
+    """Clips submitted together are decoded in one pass and routed back."""
+    scheduler = make_scheduler(monkeypatch, batch_size=3)
+    infer = mock.MagicMock(side_effect=lambda features: [
+        ("en", [{"start": 0.0, "end": 1.0, "text": f" clip of {n} samples"}])
+        for n in features
+    ])
+    monkeypatch.setattr(scheduler, "_infer", infer)
+
+    clips = [np.zeros(n * SAMPLE_RATE, dtype=np.float32) for n in (1, 2, 3)]
+    futures = [scheduler.submit(clip) for clip in clips]
+    results = [future.result(timeout=5) for future in futures]
+
+    assert infer.call_count == 1
+    assert [r["text"] for r in results] == [
+        f" clip of {n * SAMPLE_RATE} samples" for n in (1, 2, 3)
+    ]
+    assert scheduler.audio_seconds == 6
+    assert scheduler.throughput > 0
+
+
+def test_multi_window_job_is_reassembled_in_order(monkeypatch):
+    """A clip longer than 30 s is split and its windows are offset in time."""
+    scheduler = make_scheduler(monkeypatch, batch_size=1, max_wait_ms=1)
+    monkeypatch.setattr(scheduler, "_infer", lambda features: [
+        ("en", [{"start": 1.0, "end": 2.0, "text": " w"}]) for _ in features
+    ])
+
+    result = scheduler.transcribe(np.zeros(45 * SAMPLE_RATE, dtype=np.float32))
+
+    assert [(s["start"], s["end"]) for s in result["segments"]] == [
+        (1.0, 2.0),
+        (31.0, 32.0),
+    ]
+
+
+def test_inference_error_fails_every_job_in_the_batch(monkeypatch):
+    scheduler = make_scheduler(monkeypatch, batch_size=2)
+    monkeypatch.setattr(
+        scheduler, "_infer", mock.MagicMock(side_effect=RuntimeError("oom"))
+    )
+
+    futures = [scheduler.submit(np.zeros(SAMPLE_RATE, dtype=np.float32)) for _ in range(2)]
+
+    for future in futures:
+        assert isinstance(future.exception(timeout=5), RuntimeError)
+
+
+def test_bad_output_fails_its_jobs_and_the_batcher_keeps_running(monkeypatch):
+    scheduler = make_scheduler(monkeypatch, batch_size=1, max_wait_ms=1)
+    outputs = iter([
+        [("en", [{"text": " no timestamps"}])],
+        [("en", [{"start": 0.0, "end": 1.0, "text": " fine"}])],
+    ])
+    monkeypatch.setattr(scheduler, "_infer", lambda features: next(outputs))
+
+    failed = scheduler.submit(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    assert isinstance(failed.exception(timeout=5), KeyError)
+
+    later = scheduler.submit(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    assert later.result(timeout=5)["text"] == " fine"
+
+
+def test_segments_from_timestamp_tokens():
+    """<|t0|> text <|t1|><|t1|> text <|t2|> becomes two timed segments."""
+    tokenizer = mock.MagicMock()
+    tokenizer.timestamp_begin = 1000
+    tokenizer.eot = 999
+    tokenizer.decode = lambda tokens: " " + " ".join(str(t) for t in tokens)
+
+    segments = _segments_from_tokens([1000, 1, 2, 1100, 1100, 3, 1150], tokenizer)
+
+    assert segments == [
+        {"start": 0.0, "end": 2.0, "text": " 1 2"},
+        {"start": 2.0, "end": 3.0, "text": " 3"},
+    ]
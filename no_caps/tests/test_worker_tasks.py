@@ -0,0 +1,116 @@
+# tests/test_worker_tasks.py
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from services.ingest_service import IngestedAudio
+from workers import tasks
+
+
+@pytest.fixture(autouse=True)
+def no_transcription_row(monkeypatch):
+    monkeypatch.setattr(
+        "workers.tasks.TranscriptionCRUD.get_transcription", lambda db, tid: None
+    )
+
+
+def test_task_uses_its_own_session(monkeypatch):
+    """Each job opens a fresh session and closes it when done."""
+    session = mock.MagicMock()
+    monkeypatch.setattr("workers.tasks.SessionLocal", lambda: session)
+
+    process = mock.MagicMock(return_value=(True, None))
+    monkeypatch.setattr(tasks.transcription_service, "process_transcription", process)
+
+    result = tasks.process_transcription_task.run(7, "/uploads/a.mp3")
+
+    assert result is True
+    process.assert_called_once_with(session, 7, "/uploads/a.mp3")
+    session.close.assert_called_once()
+
+
+def test_task_closes_session_on_failure(monkeypatch):
+    """The session is released even if the job blows up."""
+    session = mock.MagicMock()
+    monkeypatch.setattr("workers.tasks.SessionLocal", lambda: session)
+    monkeypatch.setattr(
+        tasks.transcription_service,
+        "process_transcription",
+        mock.MagicMock(side_effect=RuntimeError("boom")),
+    )
+
+    with pytest.raises(RuntimeError):
+        tasks.process_transcription_task.run(7, "/uploads/a.mp3")
+
+    session.close.assert_called_once()
+
+
+def test_task_reads_the_current_stored_file(monkeypatch):
+    """A job enqueued before ingest finished reads the ingested file."""
+    session = mock.MagicMock()
+    monkeypatch.setattr("workers.tasks.SessionLocal", lambda: session)
+    monkeypatch.setattr(
+        "workers.tasks.TranscriptionCRUD.get_transcription",
+        lambda db, tid: SimpleNamespace(
+            audio_file=SimpleNamespace(file_path="/uploads/a.opus")
+        ),
+    )
+    process = mock.MagicMock(return_value=(True, None))
+    monkeypatch.setattr(tasks.transcription_service, "process_transcription", process)
+
+    tasks.process_transcription_task.run(7, "/uploads/a.wav")
+
+    process.assert_called_once_with(session, 7, "/uploads/a.opus")
+
+
+def test_transcode_swaps_rows_before_dropping_original(monkeypatch, tmp_path):
+    original = tmp_path / "a.wav"
+    original.write_bytes(b"wav")
+    canonical = tmp_path / "a.opus"
+    events = []
+    monkeypatch.setattr("workers.tasks.SessionLocal", mock.MagicMock)
+    monkeypatch.setattr(
+        "workers.tasks.audio_crud.get_audio",
+        lambda db, audio_id: SimpleNamespace(
+            file_path=str(original), content_hash="ab" * 32
+        ),
+    )
+    monkeypatch.setattr(
+        "workers.tasks.ingest_upload",
+        lambda path, content_hash: IngestedAudio(
+            file_path=str(canonical), stored_size_bytes=1, original_size_bytes=3
+        ),
+    )
+
+    def replace_stored_file(db, old, new, **kwargs):
+        events.append(("replace", old, new, original.exists()))
+
+    monkeypatch.setattr("workers.tasks.audio_crud.replace_stored_file", replace_stored_file)
+    store_task = mock.MagicMock()
+    peaks_task = mock.MagicMock()
+    monkeypatch.setattr("workers.tasks.store_audio_task", store_task)
+    monkeypatch.setattr("workers.tasks.compute_peaks_task", peaks_task)
+
+    tasks.transcode_audio_task.run(5)
+
+    assert events == [("replace", str(original), str(canonical), True)]
+    assert not original.exists()
+    store_task.delay.assert_called_once_with(str(canonical))
+    peaks_task.delay.assert_called_once_with(5, str(canonical))
+
+
+def test_turnless_rendition_is_rebuilt_after_transcription(monkeypatch):
+    monkeypatch.setattr("workers.tasks.SessionLocal", mock.MagicMock)
+    monkeypatch.setattr("workers.tasks.settings.HLS_PREBUILD", False)
+    monkeypatch.setattr(
+        tasks.transcription_service, "process_transcription",
+        mock.MagicMock(return_value=(True, None)),
+    )
+    monkeypatch.setattr("workers.tasks.current_rendition", lambda path: "built")
+    build_task = mock.MagicMock()
+    monkeypatch.setattr("workers.tasks.build_rendition_task", build_task)
+
+    tasks.process_transcription_task.run(7, "/uploads/a.mp3")
+
+    build_task.delay.assert_called_once_with(7)
@@ -0,0 +1,87 @@
+# app/utils/alignment.py
+from typing import Any, Dict, Iterable, List, Tuple
+
+# (start, end, speaker) as produced by pyannote's itertracks
+SpeakerTurn = Tuple[float, float, str]
+
+# Words can carry identical start/end stamps; give them a sliver of width
+# so they still overlap the turn they fall in
+MIN_ITEM_DURATION = 1e-3
+
+
+def merge_speaker_turns(
+    turns: Iterable[SpeakerTurn], items: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Attribute timed text to diarization turns with a sweep over both lists.
+
+    Every item (a Whisper segment, or a word when word timestamps are
+    available) goes to the single turn it overlaps the most, so text is
+    never duplicated across neighbouring turns. After sorting, each list is
+    walked once; the only extra work is comparing an item against the
+    turns it actually overlaps.
+
+    Args:
+        turns: Diarization turns as (start, end, speaker)
+        items: Dicts with "start", "end" and "text" keys
+
+    Returns:
+        List[Dict]: One entry per turn, in time order, with speaker,
+        start_time, end_time and the joined text
+    """
+    turns = sorted(turns, key=lambda turn: (turn[0], turn[1]))
+    items = sorted(items, key=lambda item: item["start"])
+    pieces: List[List[str]] = [[] for _ in turns]
+
+    first_live = 0
+    for item in items:
+        start = item["start"]
+        end = max(item["end"], start + MIN_ITEM_DURATION)
+
+        # Turns ending before this item can't overlap it or any later item
+        while first_live < len(turns) and turns[first_live][1] <= start:
+            first_live += 1
+
+        best_turn, best_overlap = -1, 0.0
+        index = first_live
+        while index < len(turns) and turns[index][0] < end:
+            overlap = min(end, turns[index][1]) - max(start, turns[index][0])
+            if overlap > best_overlap:
+                best_turn, best_overlap = index, overlap
+            index += 1
+
+        if best_turn >= 0:
+            text = item["text"].strip()
+            if text:
+                pieces[best_turn].append(text)
+
+    return [
+        {
+            "speaker": speaker,
+            "start_time": start_time,
+            "end_time": end_time,
+            "text": " ".join(turn_pieces),
+        }
+        for (start_time, end_time, speaker), turn_pieces in zip(turns, pieces)
+    ]
+
+
+def timed_items(transcription_result: dict) -> List[Dict[str, Any]]:
+    """
+    Flatten a Whisper result into the finest timed units it contains.
+
+    Words are used when Whisper was run with word_timestamps=True, so
+    speaker changes inside a segment land on the right turn; otherwise
+    whole segments are used.
+    """
+    items = []
+    for segment in transcription_result.get("segments", []):
+        words = segment.get("words")
+        if words:
+            items.extend(
+                {"start": w["start"], "end": w["end"], "text": w["word"]}
+                for w in words
+            )
+        else:
+            items.append(segment)
+    return items
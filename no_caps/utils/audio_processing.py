@@ -1,16 +1,282 @@
-from mutagen.mp3 import MP3
-from mutagen.wave import WAVE
+import os
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, Optional
 
+# Headers are parsed from at most this much of either end of the file
+PROBE_BYTES = 64 * 1024
+DURATION_CACHE_SIZE = 4096
 
-def get_audio_duration(file_path: str) -> float:
-    """Get the duration of an audio file in seconds."""
+_duration_cache: "OrderedDict[str, float]" = OrderedDict()
+_duration_cache_lock = threading.Lock()
+
+
+def get_audio_duration(file_path: str, content_hash: Optional[str] = None) -> float:
+    """
+    Get the duration of an audio file in seconds.
+
+    Only container headers are read (or a bounded prefix and suffix of the
+    file), never the audio itself; formats the parsers cannot handle fall
+    back to a single ffprobe call. With a content hash, results are cached
+    so the same bytes are never probed twice.
+
+    Raises:
+        ValueError: If the duration cannot be determined
+    """
+    if content_hash:
+        with _duration_cache_lock:
+            if content_hash in _duration_cache:
+                _duration_cache.move_to_end(content_hash)
+                return _duration_cache[content_hash]
+
+    duration = _probe_duration(file_path)
+
+    if content_hash:
+        with _duration_cache_lock:
+            _duration_cache[content_hash] = duration
+            while len(_duration_cache) > DURATION_CACHE_SIZE:
+                _duration_cache.popitem(last=False)
+    return duration
+
+
+def _probe_duration(file_path: str) -> float:
     try:
-        if file_path.lower().endswith('.mp3'):
-            audio = MP3(file_path)
-        elif file_path.lower().endswith('.wav'):
-            audio = WAVE(file_path)
-        else:
-            raise ValueError("Unsupported audio format")
-        return audio.info.length
+        with open(file_path, "rb") as f:
+            audio_format = sniff_audio_format(f.read(12))
+            if audio_format is None:
+                audio_format = os.path.splitext(file_path)[1].lower()
+            parser = _HEADER_PARSERS.get(audio_format)
+            if parser is not None:
+                f.seek(0)
+                duration = parser(f, os.fstat(f.fileno()).st_size)
+                if duration is not None:
+                    return duration
+    except OSError as e:
+        raise ValueError(f"Error processing audio file: {str(e)}")
+    except (struct.error, IndexError, ValueError, ZeroDivisionError):
+        pass  # malformed header; let ffprobe have a go
+    return _ffprobe_duration(file_path)
+
+
+def _ffprobe_duration(file_path: str) -> float:
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                file_path,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        return float(result.stdout.strip())
     except Exception as e:
-        raise ValueError(f"Error processing audio file: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Error processing audio file: {str(e)}")
+
+
+def _wav_duration(f: BinaryIO, size: int) -> Optional[float]:
+    """Walk RIFF chunks for fmt's byte rate and the data chunk's size."""
+    f.seek(12)
+    byte_rate = None
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+        if chunk_id == b"fmt ":
+            fmt = f.read(16)
+            byte_rate = struct.unpack("<I", fmt[8:12])[0]
+            f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # Streaming writers leave the size unset; trust the file instead
+            data_size = min(chunk_size, size - f.tell())
+            return data_size / byte_rate
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def _flac_duration(f: BinaryIO, size: int) -> Optional[float]:
+    """STREAMINFO is always the first metadata block after fLaC."""
+    data = f.read(4 + 4 + 34)
+    info = data[8:]
+    sample_rate = int.from_bytes(info[10:13], "big") >> 4
+    total_samples = int.from_bytes(info[13:18], "big") & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+def _ogg_duration(f: BinaryIO, size: int) -> Optional[float]:
+    """Last page's granule position over the codec's sample rate."""
+    head = f.read(PROBE_BYTES)
+    opus = head.find(b"OpusHead")
+    vorbis = head.find(b"\x01vorbis")
+    if opus >= 0:
+        pre_skip = struct.unpack("<H", head[opus + 10:opus + 12])[0]
+        sample_rate = 48000  # Opus granules always count 48 kHz samples
+    elif vorbis >= 0:
+        pre_skip = 0
+        sample_rate = struct.unpack("<I", head[vorbis + 12:vorbis + 16])[0]
+    else:
+        return None
+
+    f.seek(max(0, size - PROBE_BYTES))
+    tail = f.read(PROBE_BYTES)
+    page = tail.rfind(b"OggS")
+    if page < 0 or not sample_rate:
+        return None
+    granule = struct.unpack("<q", tail[page + 6:page + 14])[0]
+    if granule < 0:
+        return None
+    return max(0, granule - pre_skip) / sample_rate
+
+
+def _m4a_duration(f: BinaryIO, size: int) -> Optional[float]:
+    """Seek through top-level atoms to moov/mvhd; mdat is skipped, not read."""
+    position = 0
+    while position + 8 <= size:
+        f.seek(position)
+        atom_size, atom_type = struct.unpack(">I4s", f.read(8))
+        header_size = 8
+        if atom_size == 1:
+            atom_size = struct.unpack(">Q", f.read(8))[0]
+            header_size = 16
+        elif atom_size == 0:
+            atom_size = size - position
+        if atom_size < header_size:
+            return None
+        if atom_type == b"moov":
+            return _mvhd_duration(f.read(min(atom_size - header_size, PROBE_BYTES)))
+        position += atom_size
+    return None
+
+
+def _mvhd_duration(moov: bytes) -> Optional[float]:
+    index = moov.find(b"mvhd")
+    if index < 0:
+        return None
+    body = moov[index + 4:]
+    if body[0] == 1:
+        timescale, duration = struct.unpack(">IQ", body[20:32])
+    else:
+        timescale, duration = struct.unpack(">II", body[12:20])
+    return duration / timescale if timescale else None
+
+
+_MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 25: [11025, 12000, 8000]}
+
+
+def _mp3_frame_header(data: bytes, offset: int) -> Optional[Dict]:
+    if offset + 4 > len(data):
+        return None
+    header = struct.unpack(">I", data[offset:offset + 4])[0]
+    if header >> 21 != 0x7FF:
+        return None
+    version = {3: 1, 2: 2, 0: 25}.get((header >> 19) & 3)
+    layer = {3: 1, 2: 2, 1: 3}.get((header >> 17) & 3)
+    bitrate_index = (header >> 12) & 0xF
+    rate_index = (header >> 10) & 3
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    samples = 384 if layer == 1 else 1152 if layer == 2 or version == 1 else 576
+    return {
+        "version": version,
+        "bitrate": _MP3_BITRATES[(min(version, 2), layer)][bitrate_index] * 1000,
+        "sample_rate": _MP3_SAMPLE_RATES[version][rate_index],
+        "samples_per_frame": samples,
+        "mono": (header >> 6) & 3 == 3,
+    }
+
+
+def _mp3_duration(f: BinaryIO, size: int) -> Optional[float]:
+    """
+    Frame count from a Xing/Info or VBRI header if there is one, otherwise
+    a constant-bitrate estimate from the first frame; never a frame scan.
+    """
+    head = f.read(10)
+    start = 0
+    if head[:3] == b"ID3":
+        tag_size = 0
+        for byte in head[6:10]:
+            tag_size = (tag_size << 7) | (byte & 0x7F)
+        start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+
+    f.seek(start)
+    data = f.read(PROBE_BYTES)
+    offset = next(
+        (i for i in range(len(data) - 3)
+         if data[i] == 0xFF and _mp3_frame_header(data, i)),
+        None,
+    )
+    if offset is None:
+        return None
+    frame = _mp3_frame_header(data, offset)
+
+    side_info = (32 if not frame["mono"] else 17) if frame["version"] == 1 else (17 if not frame["mono"] else 9)
+    xing = offset + 4 + side_info
+    frames = None
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 1:
+            frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+    elif data[offset + 36:offset + 40] == b"VBRI":
+        frames = struct.unpack(">I", data[offset + 50:offset + 54])[0]
+    if frames:
+        return frames * frame["samples_per_frame"] / frame["sample_rate"]
+
+    audio_bytes = size - start - offset
+    f.seek(max(0, size - 128))
+    if f.read(3) == b"TAG":
+        audio_bytes -= 128
+    return audio_bytes * 8 / frame["bitrate"]
+
+
+_HEADER_PARSERS: Dict[str, Callable[[BinaryIO, int], Optional[float]]] = {
+    ".wav": _wav_duration,
+    ".flac": _flac_duration,
+    ".ogg": _ogg_duration,
+    ".m4a": _m4a_duration,
+    ".mp3": _mp3_duration,
+}
+
+
+# Enough of a file's head for sniff_audio_format to tell every format apart
+SNIFF_BYTES = 12
+
+
+def sniff_audio_format(header: bytes) -> Optional[str]:
+    """
+    Identify an audio container from its first bytes.
+
+    Args:
+        header (bytes): At least the first SNIFF_BYTES bytes of the file
+
+    Returns:
+        Optional[str]: The matching extension, or None if not audio
+    """
+    if header[:3] == b"ID3":
+        return ".mp3"
+    if len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0:
+        return ".mp3"  # bare MPEG audio frame sync
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return ".wav"
+    if header[:4] == b"fLaC":
+        return ".flac"
+    if header[:4] == b"OggS":
+        return ".ogg"
+    if header[4:8] == b"ftyp":
+        return ".m4a"
+    return None
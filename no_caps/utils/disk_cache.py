@@ -0,0 +1,89 @@
+# app/utils/disk_cache.py
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List, Optional
+from core.logging import logger
+
+
+class KeyedLocks:
+    """One lock per cache key, for fill-once-per-process misses.
+
+    A key's lock exists only while some thread holds or waits on it, so
+    the table stays as small as the number of fills in flight.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        # key -> [lock, threads holding or waiting on it]
+        self._locks: Dict[Hashable, List] = {}
+
+    @contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+    def __len__(self) -> int:
+        with self._guard:
+            return len(self._locks)
+
+
+def touch(path: Path) -> None:
+    """Mark a cache entry as recently used."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def prune_lru(
+    directory: Path, max_bytes: int, pattern: str = "*", keep: Optional[Path] = None
+) -> int:
+    """
+    Delete least recently used files in a cache directory until it fits.
+
+    Recency is the file's mtime, which readers bump with touch() on a hit.
+
+    Args:
+        directory (Path): Cache directory to prune
+        max_bytes (int): Size budget for files matching pattern
+        pattern (str): Glob selecting the cache entries
+        keep (Path): Entry that must survive (e.g. the one just written)
+
+    Returns:
+        int: Number of bytes freed
+    """
+    entries = []
+    total = 0
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    freed = 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total - freed <= max_bytes:
+            break
+        if keep is not None and path == keep:
+            continue
+        try:
+            path.unlink()
+            freed += size
+        except FileNotFoundError:
+            continue
+    if freed:
+        logger.info(f"Pruned {freed} bytes from cache {directory}")
+    return freed
@@ -1,34 +1,81 @@
 # app/utils/file_handling.py
+import hashlib
 import os
-import shutil
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
 from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
+from core.config import settings
 from core.logging import logger
+from utils.audio_processing import sniff_audio_format
 
 UPLOAD_DIR = Path("/no_caps/uploads")
+BLOB_DIR = UPLOAD_DIR / "blobs"
+INCOMING_DIR = UPLOAD_DIR / "incoming"
 ALLOWED_AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".flac", ".ogg"}
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class StoredUpload:
+    """Where an upload ended up, and what its bytes hash to."""
+    file_path: str
+    content_hash: str
+    size: int
 
 
 def ensure_upload_dir():
     """Ensure the upload directory exists."""
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    BLOB_DIR.mkdir(parents=True, exist_ok=True)
+    INCOMING_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def blob_path(content_hash: str, extension: str) -> Path:
+    """Content-addressed location for a blob: blobs/ab/abcdef....ext"""
+    return BLOB_DIR / content_hash[:2] / f"{content_hash}{extension}"
 
 
-async def save_upload_file(file: UploadFile) -> str:
+def commit_blob(tmp_path: Path, content_hash: str, extension: str) -> Path:
     """
-    Save an uploaded file to the uploads directory with a unique filename.
+    Move a fully written temp file into the blob store.
+
+    If the same content is already stored, the temp file is dropped and the
+    existing blob is reused.
+    """
+    final_path = blob_path(content_hash, extension)
+    if final_path.exists():
+        tmp_path.unlink()
+        logger.info(f"Upload matches existing blob {final_path}")
+    else:
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, final_path)
+    return final_path
+
+
+async def save_upload_file(file: UploadFile) -> StoredUpload:
+    """
+    Save an uploaded file into the content-addressed blob store.
+
+    The upload is streamed in fixed-size chunks without blocking the event
+    loop: reads and writes are offloaded to the threadpool. The SHA-256,
+    the size limit and the audio magic-byte check all happen in that same
+    single pass, so an oversized or non-audio upload is rejected as soon as
+    it is detected instead of after it has been written out in full.
+    Identical content is stored only once.
 
     Args:
         file (UploadFile): The uploaded file
 
     Returns:
-        str: Path to the saved file
+        StoredUpload: Blob path, content hash and size of the upload
 
     Raises:
-        HTTPException: If file extension is not allowed or save fails
+        HTTPException: If the extension or content is not audio, the file
+        is too large, or the save fails
     """
-    ensure_upload_dir()
+    await run_in_threadpool(ensure_upload_dir)
 
     file_extension = Path(file.filename).suffix.lower()
     if file_extension not in ALLOWED_AUDIO_EXTENSIONS:
@@ -37,21 +84,52 @@ async def save_upload_file(file: UploadFile) -> str:
             detail=f"File extension {file_extension} not allowed. Allowed extensions: {ALLOWED_AUDIO_EXTENSIONS}",
         )
 
-    # Generate unique filename
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = UPLOAD_DIR / unique_filename
+    tmp_path = INCOMING_DIR / f"{uuid.uuid4()}{file_extension}"
+    digest = hashlib.sha256()
+    size = 0
+    buffer = await run_in_threadpool(tmp_path.open, "wb")
 
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if size == 0 and sniff_audio_format(chunk) is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="File content is not a recognised audio format",
+                )
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File exceeds the {settings.MAX_UPLOAD_BYTES} byte limit",
+                )
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+        await run_in_threadpool(buffer.close)
+        content_hash = digest.hexdigest()
+        file_path = await run_in_threadpool(
+            commit_blob, tmp_path, content_hash, file_extension
+        )
+    except HTTPException:
+        await run_in_threadpool(_discard, buffer, tmp_path)
+        raise
     except Exception as e:
         logger.error(f"Failed to save file {file.filename}: {str(e)}")
+        await run_in_threadpool(_discard, buffer, tmp_path)
         raise HTTPException(status_code=500, detail="Failed to save file")
-    # In save_upload_file function
     logger.info(f"In save_upload_file: saved file to: {file_path}")
-    print(f"print save_upload_file: saved file to: {file_path}")
 
-    return str(file_path)
+    return StoredUpload(
+        file_path=str(file_path), content_hash=content_hash, size=size
+    )
+
+
+def _discard(buffer, tmp_path: Path) -> None:
+    """Close and remove a partially written upload."""
+    buffer.close()
+    if tmp_path.exists():
+        tmp_path.unlink()
 
 
 def delete_file(file_path: str) -> bool:
@@ -0,0 +1,136 @@
+# app/utils/range_response.py
+import os
+from typing import Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+# ASGI extension that lets the server sendfile() the body itself
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+def parse_range(header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header into an inclusive (start, end).
+
+    Returns None when the whole file should be sent: no header, a unit
+    other than bytes, or a multi-range request (which servers may ignore).
+
+    Raises:
+        HTTPException: 416 if the range lies outside the file
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec:
+        return None
+
+    first, _, last = spec.partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            start, end = max(0, file_size - length), file_size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else file_size - 1
+            end = min(end, file_size - 1)
+    except ValueError:
+        return None
+
+    if start >= file_size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"},
+        )
+    return start, end
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison; weak validators match too (RFC 9110)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+class RangeFileResponse(Response):
+    """Send a byte range of a file without loading it into memory.
+
+    When the server offers the zero-copy ASGI extension the file
+    descriptor is handed over and the kernel copies straight to the
+    socket; otherwise the range is read in fixed-size chunks off the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        file_size: int,
+        byte_range: Optional[Tuple[int, int]] = None,
+        media_type: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        chunk_size: int = 256 * 1024,
+    ):
+        self.path = path
+        self.chunk_size = chunk_size
+        if byte_range is None:
+            self.start, self.end = 0, file_size - 1
+            status_code = 200
+        else:
+            self.start, self.end = byte_range
+            status_code = 206
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["content-length"] = str(self.end - self.start + 1)
+        if byte_range is not None:
+            self.headers["content-range"] = f"bytes {self.start}-{self.end}/{file_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        count = self.end - self.start + 1
+        if scope.get("method") == "HEAD" or count <= 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        f = await run_in_threadpool(open, self.path, "rb")
+        try:
+            if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": f,
+                    "offset": self.start,
+                    "count": count,
+                })
+                return
+            position = self.start
+            while count > 0:
+                chunk = await run_in_threadpool(
+                    os.pread, f.fileno(), min(self.chunk_size, count), position
+                )
+                if not chunk:
+                    break  # file shrank underneath us
+                position += len(chunk)
+                count -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": count > 0,
+                })
+            if count > 0:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            await run_in_threadpool(f.close)
@@ -0,0 +1,47 @@
+# app/workers/celery_app.py
+import os
+from celery import Celery
+from core.config import settings
+
+celery_app = Celery(
+    "no_caps",
+    broker=settings.CELERY_BROKER_URL,
+    include=["workers.tasks"],
+)
+
+celery_app.conf.update(
+    # Job state lives on the Transcription row, not in a result backend
+    task_ignore_result=True,
+    # A job is only acked once it finished, so a crashed worker hands it back
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Jobs are long and CPU bound; never let one process hoard the queue
+    worker_prefetch_multiplier=1,
+    worker_concurrency=settings.TRANSCRIPTION_WORKER_CONCURRENCY,
+    # Chunks of long recordings go to their own worker (see ChunkedTranscriber)
+    task_routes={"transcription.chunk": {"queue": settings.LONG_AUDIO_QUEUE}},
+    # Run by celery beat (or a worker started with --beat)
+    beat_schedule={
+        "expire-uploads": {
+            "task": "uploads.expire",
+            "schedule": settings.CLEANUP_INTERVAL_SECONDS,
+        },
+        "expire-event-logs": {
+            "task": "events.expire",
+            "schedule": settings.CLEANUP_INTERVAL_SECONDS,
+        },
+    },
+)
+
+if settings.CELERY_BROKER_URL.startswith("filesystem://"):
+    # Local stand-in broker: API and workers share a queue directory
+    queue_dir = os.path.join(settings.CELERY_BROKER_DIR, "queue")
+    processed_dir = os.path.join(settings.CELERY_BROKER_DIR, "processed")
+    os.makedirs(queue_dir, exist_ok=True)
+    os.makedirs(processed_dir, exist_ok=True)
+    celery_app.conf.broker_transport_options = {
+        "data_folder_in": queue_dir,
+        "data_folder_out": queue_dir,
+        "processed_folder": processed_dir,
+        "store_processed": False,
+    }
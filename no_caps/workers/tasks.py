@@ -0,0 +1,176 @@
+# app/workers/tasks.py
+import logging
+import os
+from celery.signals import worker_process_init
+from core.config import settings
+from db.crud import audio as audio_crud
+from db.crud.transcription import TranscriptionCRUD
+from db.session import SessionLocal
+from services.chunked_transcription import Chunk, transcribe_chunk
+from services.event_bus import expire_event_logs
+from services.ingest_service import ingest_upload
+from services.model_registry import model_registry
+from services.peaks import ensure_peaks, peaks_path_for
+from services.renditions import current_rendition, ensure_rendition
+from services.storage_service import get_storage
+from services.transcription_service import TranscriptionService
+from workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+# A job may be picked up before its upload reached the storage backend
+STORAGE_FETCH_RETRIES = 5
+STORAGE_FETCH_RETRY_SECONDS = 10
+
+transcription_service = TranscriptionService()
+
+
+def _retry_while_storing(task, error: RuntimeError) -> None:
+    """Retry a task whose upload may not have reached the backend yet."""
+    if not task.request.called_directly and task.request.retries < STORAGE_FETCH_RETRIES:
+        # store_audio_task for this upload may still be running
+        raise task.retry(exc=error, countdown=STORAGE_FETCH_RETRY_SECONDS)
+
+
+@worker_process_init.connect
+def warmup_models(**kwargs):
+    """Load and warm the models once per worker process, before any job."""
+    if settings.MODEL_WARMUP_ON_START:
+        model_registry.warmup()
+
+
+@celery_app.task(name="transcription.process")
+def process_transcription_task(transcription_id: int, audio_path: str) -> bool:
+    """Run a transcription job inside a worker process.
+
+    The request that enqueued the job has long since closed its session, so
+    every job opens (and closes) a session of its own.
+    """
+    logger.info(f"Worker picked up transcription {transcription_id}")
+    db = SessionLocal()
+    try:
+        transcription = TranscriptionCRUD.get_transcription(db, transcription_id)
+        if transcription is not None and transcription.audio_file is not None:
+            # Ingest may have replaced the upload since the job was enqueued
+            audio_path = transcription.audio_file.file_path
+        stored_path = audio_path
+        try:
+            # On hosts without the uploads volume this downloads (once, cached)
+            audio_path = str(get_storage().local_path(audio_path))
+        except RuntimeError as e:
+            _retry_while_storing(process_transcription_task, e)
+            # The job fails on the missing file and records why
+            logger.error(str(e))
+        success, _ = transcription_service.process_transcription(
+            db, transcription_id, audio_path
+        )
+        # A rendition played before the transcript existed was cut without
+        # speaker turns; rebuild it on them
+        if success and (
+            settings.HLS_PREBUILD or current_rendition(stored_path) is not None
+        ):
+            build_rendition_task.delay(transcription_id)
+        return success
+    finally:
+        db.close()
+
+
+@celery_app.task(name="transcription.chunk")
+def transcribe_chunk_task(
+    pcm_path: str, chunk: dict, word_timestamps: bool, result_path: str
+) -> None:
+    """Transcribe one chunk of a long recording (LONG_AUDIO_QUEUE workers)."""
+    transcribe_chunk(pcm_path, Chunk(**chunk), word_timestamps, result_path)
+
+
+@celery_app.task(name="audio.transcode")
+def transcode_audio_task(audio_id: int) -> None:
+    """Re-encode a new upload to the canonical format (TRANSCODE_ON_INGEST).
+
+    Rows keep pointing at the upload as received until the canonical blob
+    is recorded, and only then is the original dropped, so playback and
+    jobs never see a missing file. The canonical blob is then pushed to
+    the storage backend and its peaks computed.
+    """
+    db = SessionLocal()
+    try:
+        audio = audio_crud.get_audio(db, audio_id)
+        if audio is None:
+            return
+        source_path = audio.file_path
+        ingested = ingest_upload(source_path, audio.content_hash)
+        if ingested.file_path != source_path:
+            audio_crud.replace_stored_file(
+                db,
+                source_path,
+                ingested.file_path,
+                stored_size_bytes=ingested.stored_size_bytes,
+                original_file_path=ingested.original_file_path,
+            )
+            # Peaks are keyed by path; the original's would be orphaned
+            dropped = [peaks_path_for(source_path)]
+            if ingested.original_file_path is None:
+                dropped.append(source_path)
+            for path in dropped:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+    finally:
+        db.close()
+    store_audio_task.delay(ingested.file_path)
+    compute_peaks_task.delay(audio_id, ingested.file_path)
+
+
+@celery_app.task(name="audio.store")
+def store_audio_task(file_path: str) -> None:
+    """Push a new upload to the storage backend, off the request path.
+
+    Reads the file from the uploads volume, so it must run on a worker
+    that mounts it (every worker, with the filesystem broker).
+    """
+    get_storage().store(file_path)
+
+
+@celery_app.task(name="audio.peaks")
+def compute_peaks_task(audio_id: int, file_path: str) -> str:
+    """Precompute waveform peaks after an upload so the first view is instant."""
+    try:
+        get_storage().local_path(file_path)
+    except RuntimeError as e:
+        _retry_while_storing(compute_peaks_task, e)
+        raise
+    return str(ensure_peaks(audio_id, file_path))
+
+
+@celery_app.task(name="audio.rendition")
+def build_rendition_task(transcription_id: int) -> None:
+    """Build the HLS rendition, or redo one cut before speaker turns were known."""
+    db = SessionLocal()
+    try:
+        transcription = TranscriptionCRUD.get_transcription(db, transcription_id)
+        if transcription is None:
+            return
+        audio = transcription.audio_file
+        ensure_rendition(audio.id, audio.file_path, transcription.content)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="uploads.expire")
+def expire_uploads_task() -> int:
+    """Drop abandoned resumable uploads and their partial files."""
+    # upload_service imports this module (via audio_service)
+    from services.upload_service import expire_stale_uploads
+
+    db = SessionLocal()
+    try:
+        return expire_stale_uploads(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="events.expire")
+def expire_event_logs_task() -> int:
+    """Delete the event logs of jobs finished a while ago."""
+    return expire_event_logs()
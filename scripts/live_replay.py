@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Replay a WAV file into the live transcription WebSocket at real-time speed
+and report how long each segment took to come back.
+
+Latency for a message is measured from the moment the audio it covers
+finished being sent (stream start + segment end) to its arrival.
+
+Usage:
+    python scripts/live_replay.py recording.wav --token $TOKEN \
+        [--url ws://localhost:8000/api/v1/live/ws] [--frame-ms 20]
+
+Non-16 kHz/mono/16-bit input is converted with ffmpeg first.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import time
+import wave
+
+import websockets
+
+SAMPLE_RATE = 16000
+
+
+def load_pcm16(path: str) -> bytes:
+    with wave.open(path, "rb") as wav:
+        if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (SAMPLE_RATE, 1, 2):
+            return wav.readframes(wav.getnframes())
+    return subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        check=True, capture_output=True,
+    ).stdout
+
+
+async def replay(args):
+    pcm = load_pcm16(args.wav)
+    frame_bytes = SAMPLE_RATE * 2 * args.frame_ms // 1000
+    url = f"{args.url}?token={args.token}&format=pcm16"
+    partial_latency, final_latency = [], []
+
+    async with websockets.connect(url, max_size=None) as ws:
+        started = time.monotonic()
+
+        async def send():
+            for i, offset in enumerate(range(0, len(pcm), frame_bytes)):
+                # Pace frames against the wall clock, not by sleeping a fixed step
+                due = started + i * args.frame_ms / 1000
+                await asyncio.sleep(max(0.0, due - time.monotonic()))
+                await ws.send(pcm[offset:offset + frame_bytes])
+            await ws.send("stop")
+
+        sender = asyncio.create_task(send())
+        async for raw in ws:
+            now = time.monotonic() - started
+            message = json.loads(raw)
+            if message["type"] == "partial":
+                partial_latency.append(now - message["end"])
+                print(f"[{now:7.2f}s] partial: {message['text']}")
+            elif message["type"] == "final":
+                segment = message["segment"]
+                if not sender.done():
+                    final_latency.append(now - segment["end_time"])
+                print(f"[{now:7.2f}s] final:   {segment['text']}")
+            elif message["type"] == "saved":
+                print(f"saved audio {message['audio_id']} "
+                      f"transcription {message['transcription_id']}")
+        await sender
+
+    for label, values in (("partial", partial_latency), ("final", final_latency)):
+        if values:
+            values.sort()
+            print(f"{label:>7} latency: median {statistics.median(values):.2f}s "
+                  f"p95 {values[int(0.95 * (len(values) - 1))]:.2f}s "
+                  f"(n={len(values)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("wav")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--url", default="ws://localhost:8000/api/v1/live/ws")
+    parser.add_argument("--frame-ms", type=int, default=20)
+    asyncio.run(replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()